@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+"""
+Benchmark of wrapping JSON payloads into attribute-access dictionaries.
+
+Loads response bodies of all recorded cassettes in ``tests/fixtures`` and
+compares :class:`yagocd.util.AttrDict` with ``EasyDict``, which was used
+before: time to wrap payloads (optionally touching every nested value)
+and memory retained by the wrapped objects after the raw JSON is parsed.
+
+Usage::
+
+    python benchmarks/attr_dict.py --repeat 20
+"""
+import argparse
+import gzip
+import io
+import json
+import os
+import time
+import tracemalloc
+
+import yaml
+from easydict import EasyDict
+
+from yagocd.util import AttrDict
+
+FIXTURES = os.path.join(os.path.dirname(__file__), os.pardir, 'tests', 'fixtures', 'cassettes')
+
+
+def load_bodies(root):
+    bodies = list()
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            with open(os.path.join(dirpath, filename)) as f:
+                cassette = yaml.safe_load(f)
+
+            for interaction in cassette['interactions']:
+                response = interaction['response']
+                body = response['body']['string']
+                if 'gzip' in response['headers'].get('Content-Encoding', []):
+                    body = gzip.GzipFile(fileobj=io.BytesIO(body)).read()
+                if isinstance(body, bytes):
+                    body = body.decode('utf-8', 'replace')
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    continue
+                if isinstance(payload, (dict, list)):
+                    bodies.append(body)
+    return bodies
+
+
+def wrap(factory, body):
+    payload = json.loads(body)
+    # list responses (e.g. history) are turned into one entity per item
+    if isinstance(payload, list):
+        return [factory(item) for item in payload if isinstance(item, dict)]
+    return [factory(payload)]
+
+
+def touch(value):
+    if isinstance(value, dict):
+        for key in list(value.keys()):
+            touch(value[key])
+    elif isinstance(value, list):
+        for item in value:
+            touch(item)
+
+
+def measure_time(factory, bodies, repeat, walk):
+    started = time.time()
+    for _ in range(repeat):
+        for body in bodies:
+            for item in wrap(factory, body):
+                if walk:
+                    touch(item)
+    return time.time() - started
+
+
+def measure_memory(factory, bodies, walk):
+    tracemalloc.start()
+    try:
+        retained = list()
+        for body in bodies:
+            items = wrap(factory, body)
+            if walk:
+                for item in items:
+                    touch(item)
+            retained.append(items)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current, peak
+
+
+def run(repeat):
+    bodies = load_bodies(FIXTURES)
+    print('{} JSON bodies, {:.1f} MiB of text'.format(  # noqa
+        len(bodies), sum(len(b) for b in bodies) / 2.0 ** 20))
+
+    for walk in (False, True):
+        baseline = measure_time(dict, bodies, repeat, walk)
+        print('\n{}:'.format('wrap and access every value' if walk else 'wrap only'))  # noqa
+        for name, factory in (('EasyDict', EasyDict), ('AttrDict', AttrDict)):
+            elapsed = measure_time(factory, bodies, repeat, walk) - baseline
+            current, peak = measure_memory(factory, bodies, walk)
+            print('  {name:<8} {elapsed:8.3f}s over dict, retained {current:7.2f} MiB, peak {peak:7.2f} MiB'.format(  # noqa
+                name=name, elapsed=elapsed, current=current / 2.0 ** 20, peak=peak / 2.0 ** 20))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    run(repeat=args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+"""
+Benchmark of pipeline graph construction.
+
+Builds synthetic pipeline graphs and links them with
+:meth:`yagocd.util.YagocdUtil.build_graph`. For comparison the previous
+pairwise implementation is executed on the smaller graphs, because it
+grows quadratically with the number of pipelines.
+
+Usage::
+
+    python benchmarks/build_graph.py --sizes 10000 50000 --legacy-sizes 1000 2000
+"""
+import argparse
+import copy
+import random
+import time
+
+from yagocd.client import Yagocd
+from yagocd.resources.pipeline import PipelineEntity
+from yagocd.session import Session
+from yagocd.util import YagocdUtil
+
+
+def legacy_build_graph(nodes, dependencies, compare):
+    for child in nodes:
+        parents = list()
+
+        for parent in nodes:
+            children = list()
+
+            for child_candidate in dependencies(parent):
+                if compare(child_candidate, child):
+                    parents.append(parent)
+                    children.append(child)
+            parent.predecessors.extend(children)
+        child.descendants = parents
+    return nodes
+
+
+def make_pipelines(session, size, max_parents, seed):
+    rnd = random.Random(seed)
+    pipelines = list()
+    for index in range(size):
+        materials = [{'description': 'git@example.com:repo-{}.git'.format(index), 'type': 'Git'}]
+        for parent in rnd.sample(range(index), min(index, rnd.randint(0, max_parents))):
+            materials.append({'description': 'pipeline-{}'.format(parent), 'type': 'Pipeline'})
+
+        pipelines.append(PipelineEntity(
+            session=session,
+            data={'name': 'pipeline-{}'.format(index), 'materials': materials},
+            group='group-{}'.format(index % 100)
+        ))
+    rnd.shuffle(pipelines)
+    return pipelines
+
+
+def measure(function, **kwargs):
+    started = time.time()
+    function(**kwargs)
+    return time.time() - started
+
+
+def run(sizes, legacy_sizes, max_parents, seed):
+    options = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
+    session = Session(auth=None, options=options)
+
+    for size in sorted(set(sizes) | set(legacy_sizes)):
+        indexed = measure(
+            YagocdUtil.build_graph,
+            nodes=make_pipelines(session, size, max_parents, seed),
+            dependencies=lambda parent: [material for material in parent.data.materials],
+            node_key=lambda child: child.data.name,
+            dependency_key=lambda material: material.description
+        )
+        line = '{size:>7} nodes: indexed {indexed:8.3f}s'.format(size=size, indexed=indexed)
+
+        if size in legacy_sizes:
+            pairwise = measure(
+                legacy_build_graph,
+                nodes=make_pipelines(session, size, max_parents, seed),
+                dependencies=lambda parent: [material for material in parent.data.materials],
+                compare=lambda candidate, child: candidate.description == child.data.name
+            )
+            line += ', pairwise {pairwise:8.3f}s, speedup x{ratio:.0f}'.format(
+                pairwise=pairwise, ratio=pairwise / max(indexed, 1e-9)
+            )
+
+        print(line)  # noqa
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000])
+    parser.add_argument('--legacy-sizes', type=int, nargs='*', default=[1000, 2000])
+    parser.add_argument('--max-parents', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    run(sizes=args.sizes, legacy_sizes=args.legacy_sizes, max_parents=args.max_parents, seed=args.seed)
+
+
+if __name__ == '__main__':
+    main()
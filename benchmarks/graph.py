@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+"""
+Benchmark of transitive dependency queries.
+
+Asks transitive predecessors and descendants of every pipeline of a
+synthetic graph, the way impact analysis does, once by walking the graph
+on every call and once through :class:`yagocd.graph.DependencyGraph`.
+Also times "does A depend on B" checks for random pairs of pipelines,
+which the index answers with a single bit test.
+
+Usage::
+
+    python benchmarks/graph.py --sizes 1000 5000
+"""
+import argparse
+import copy
+import random
+import time
+
+from yagocd.client import Yagocd
+from yagocd.graph import DependencyGraph
+from yagocd.resources.pipeline import PipelineEntity
+from yagocd.session import Session
+from yagocd.util import YagocdUtil
+
+
+def make_pipelines(session, size, max_parents, window, seed):
+    rnd = random.Random(seed)
+    pipelines = list()
+    for index in range(size):
+        # pipelines depend on the recent ones, which makes long dependency chains
+        candidates = range(max(0, index - window), index)
+        materials = [
+            {'description': 'pipeline-{}'.format(parent), 'type': 'Pipeline'}
+            for parent in rnd.sample(candidates, min(len(candidates), rnd.randint(0, max_parents)))
+        ]
+        pipelines.append(PipelineEntity(
+            session=session,
+            data={'name': 'pipeline-{}'.format(index), 'materials': materials}
+        ))
+
+    return YagocdUtil.build_graph(
+        nodes=pipelines,
+        dependencies=lambda parent: parent.data.materials,
+        node_key=lambda child: child.data.name,
+        dependency_key=lambda material: material.description
+    )
+
+
+def impact(nodes):
+    total = 0
+    for node in nodes:
+        total += len(node.get_predecessors(transitive=True)) + len(node.get_descendants(transitive=True))
+    return total
+
+
+def run(sizes, max_parents, window, seed):
+    session = Session(auth=None, options=copy.deepcopy(Yagocd.DEFAULT_OPTIONS))
+
+    for size in sizes:
+        nodes = make_pipelines(session, size, max_parents, window, seed)
+
+        started = time.time()
+        expected = impact(nodes)
+        walk = time.time() - started
+
+        rnd = random.Random(seed)
+        pairs = [(rnd.choice(nodes), rnd.choice(nodes)) for _ in range(100000)]
+        started = time.time()
+        walked = [b in set(a.get_predecessors(transitive=True)) for a, b in pairs[:size]]
+        walk_check = (time.time() - started) / len(walked)
+
+        started = time.time()
+        graph = DependencyGraph(nodes)
+        graph.nodes
+        build = time.time() - started
+
+        started = time.time()
+        checked = [graph.is_predecessor(a, b) for a, b in pairs]
+        index_check = (time.time() - started) / len(checked)
+        assert checked[:size] == walked
+
+        started = time.time()
+        actual = impact(nodes)
+        query = time.time() - started
+        assert actual == expected
+
+        print('{size:>6} nodes: walk {walk:8.3f}s, index build {build:6.3f}s + queries {query:6.3f}s, '  # noqa
+              'speedup x{ratio:.0f}'.format(
+                  size=size, walk=walk, build=build, query=query, ratio=walk / max(build + query, 1e-9)))
+        print('{pad:>6}        dependency check: walk {walk:8.1f}us, index {index:6.2f}us'.format(  # noqa
+            pad='', walk=walk_check * 1e6, index=index_check * 1e6))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--max-parents', type=int, default=3)
+    parser.add_argument('--window', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    run(sizes=args.sizes, max_parents=args.max_parents, window=args.window, seed=args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+"""
+Benchmark of request throughput of a session shared between threads.
+
+Starts a local HTTP/1.1 server in a separate process, which answers
+after a small delay, and issues requests from a pool of threads sharing
+one client, with different connection pool settings. Reports requests
+per second and number of TCP connections the server accepted. Without
+TLS connection setup is cheap, so the difference against a real HTTPS
+server would be larger.
+
+Usage::
+
+    python benchmarks/session_pool.py --threads 1 4 16 32 --requests 4000 --latency 0.005
+"""
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from six.moves import BaseHTTPServer, socketserver
+
+from yagocd.client import Yagocd
+
+BODY = json.dumps({'version': '17.3.0', 'build_number': '4704'}).encode('utf-8')
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # send headers and body in one segment, otherwise delayed ACKs stall keep-alive connections
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):  # noqa
+        if self.path.endswith('/connections'):
+            body = str(self.server.connections).encode('utf-8')
+        else:
+            time.sleep(self.server.latency)
+            body = BODY
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, latency):
+        BaseHTTPServer.HTTPServer.__init__(self, ('127.0.0.1', 0), Handler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.latency = latency
+
+
+def serve(latency):
+    server = Server(latency)
+    print(server.server_address[1])  # noqa
+    sys.stdout.flush()
+    server.serve_forever()
+
+
+def connections(url):
+    # every call opens one connection of its own
+    return int(Yagocd(server=url)._session.get('connections').text)
+
+
+def measure(url, threads, requests, options):
+    client = Yagocd(server=url, options=dict(options))
+    session = client._session
+    before = connections(url)
+
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in executor.map(lambda _: session.get('go/api/version'), range(requests)):
+            pass
+    elapsed = time.time() - started
+
+    session.close()
+    return requests / elapsed, connections(url) - before - 1
+
+
+def run(thread_counts, requests, latency):
+    server = subprocess.Popen(
+        [sys.executable, __file__, '--serve', '--latency', str(latency)],
+        stdout=subprocess.PIPE
+    )
+    url = 'http://127.0.0.1:{}'.format(int(server.stdout.readline()))
+
+    try:
+        for threads in thread_counts:
+            configurations = [
+                ('no keep-alive', dict(keep_alive=False)),
+                ('default pool', dict()),
+                ('pool_maxsize={}'.format(threads), dict(pool_maxsize=threads)),
+                ('pool_maxsize={}, block'.format(threads), dict(pool_maxsize=threads, pool_block=True)),
+            ]
+            for name, options in configurations:
+                rate, opened = measure(url, threads, requests, options)
+                print('{threads:>3} threads, {name:<26} {rate:8.0f} req/s, {opened:5} connections'.format(  # noqa
+                    threads=threads, name=name, rate=rate, opened=opened))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 16, 32])
+    parser.add_argument('--requests', type=int, default=4000)
+    parser.add_argument('--latency', type=float, default=0.005, help='server response delay in seconds')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(latency=args.latency)
+    else:
+        run(thread_counts=args.threads, requests=args.requests, latency=args.latency)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+"""
+Benchmark of entity construction with shared managers.
+
+Builds pipeline entities, their history instances and stage instances the
+same way listing and history calls do, once with managers shared through
+:meth:`yagocd.resources.BaseManager.shared` and once with a new manager
+constructed for every entity, as it was done before.
+
+Usage::
+
+    python benchmarks/shared_managers.py --pipelines 6000 --history 50
+"""
+import argparse
+import copy
+import gc
+import time
+import tracemalloc
+
+from yagocd.client import Yagocd
+from yagocd.resources import BaseManager
+from yagocd.resources.pipeline import PipelineEntity, PipelineInstance
+from yagocd.session import Session
+
+
+def per_entity(cls, session):
+    return cls(session=session)
+
+
+def build(session, pipelines, history, stages):
+    entities = list()
+    for index in range(pipelines):
+        name = 'pipeline-{}'.format(index)
+        entities.append(PipelineEntity(session=session, data={'name': name, 'materials': []}))
+
+        for counter in range(1, history + 1):
+            instance = PipelineInstance(session=session, data={
+                'name': name,
+                'counter': counter,
+                'stages': [{'name': 'stage-{}'.format(s), 'counter': '1', 'jobs': []} for s in range(stages)]
+            })
+            entities.append(instance)
+            entities.extend(instance.stages())
+    return entities
+
+
+def measure(session, pipelines, history, stages):
+    gc.collect()
+    started = time.time()
+    build(session, pipelines, history, stages)
+    elapsed = time.time() - started
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        entities = build(session, pipelines, history, stages)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return len(entities), elapsed, current
+
+
+def run(pipelines, history, stages):
+    options = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
+    shared = BaseManager.__dict__['shared']
+
+    for name, factory in (('per entity', classmethod(per_entity)), ('shared', shared)):
+        BaseManager.shared = factory
+        try:
+            count, elapsed, memory = measure(Session(auth=None, options=options), pipelines, history, stages)
+        finally:
+            BaseManager.shared = shared
+
+        print('{name:<10} {count} entities: {elapsed:7.3f}s, {memory:8.2f} MiB'.format(  # noqa
+            name=name, count=count, elapsed=elapsed, memory=memory / 2.0 ** 20))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pipelines', type=int, default=1000)
+    parser.add_argument('--history', type=int, default=50)
+    parser.add_argument('--stages', type=int, default=2)
+    args = parser.parse_args()
+
+    run(pipelines=args.pipelines, history=args.history, stages=args.stages)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+"""
+Memory benchmark of slotted entity classes.
+
+Keeps a history of pipeline instances (with their stage instances) in
+memory and reports resident set size growth. Every measurement runs in a
+separate process. The former ``__dict__`` based layout is emulated with
+subclasses, that don't declare ``__slots__`` and keep the same attributes
+in the instance dictionary.
+
+Linux only, because RSS is read from ``/proc/self/statm``.
+
+Usage::
+
+    python benchmarks/slots.py --entities 100000
+"""
+import argparse
+import copy
+import gc
+import os
+import resource
+import subprocess
+import sys
+
+from yagocd.client import Yagocd
+from yagocd.resources.pipeline import PipelineInstance
+from yagocd.resources.stage import StageInstance
+from yagocd.session import Session
+
+
+class DictPipelineInstance(PipelineInstance):
+    def __init__(self, session, data):
+        super(DictPipelineInstance, self).__init__(session, data)
+        self.__dict__.update(_session=self._session, _data=self._data, _etag=self._etag, _manager=self._manager,
+                             _predecessors=self._predecessors, _descendants=self._descendants)
+
+
+class DictStageInstance(StageInstance):
+    def __init__(self, session, data, pipeline):
+        super(DictStageInstance, self).__init__(session, data, pipeline)
+        self.__dict__.update(_session=self._session, _data=self._data, _etag=self._etag, _manager=self._manager,
+                             _pipeline=self._pipeline)
+
+
+def rss():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * resource.getpagesize()
+
+
+def build(layout, entities, stages):
+    pipeline_cls, stage_cls = {
+        'dict': (DictPipelineInstance, DictStageInstance),
+        'slots': (PipelineInstance, StageInstance),
+    }[layout]
+
+    session = Session(auth=None, options=copy.deepcopy(Yagocd.DEFAULT_OPTIONS))
+    history = list()
+    for counter in range(entities):
+        instance = pipeline_cls(session=session, data={'name': 'pipeline', 'counter': counter, 'stages': []})
+        history.append(instance)
+        for index in range(stages):
+            history.append(stage_cls(session=session, data={'name': 'stage'}, pipeline=instance))
+    return history
+
+
+def child(layout, entities, stages):
+    gc.collect()
+    before = rss()
+    history = build(layout, entities, stages)
+    gc.collect()
+    print(rss() - before, len(history))  # noqa
+
+
+def run(entities, stages):
+    results = dict()
+    for layout in ('dict', 'slots'):
+        output = subprocess.check_output([
+            sys.executable, os.path.abspath(__file__),
+            '--child', layout, '--entities', str(entities), '--stages', str(stages)
+        ])
+        growth, count = map(int, output.split())
+        results[layout] = growth
+        print('{layout:<6} {count} entities: RSS +{growth:7.1f} MiB, {per:5.0f} bytes per entity'.format(  # noqa
+            layout=layout, count=count, growth=growth / 2.0 ** 20, per=float(growth) / count))
+
+    print('saved {:.1f}%'.format(100.0 * (results['dict'] - results['slots']) / results['dict']))  # noqa
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entities', type=int, default=100000, help='number of pipeline instances')
+    parser.add_argument('--stages', type=int, default=0, help='number of stage instances per pipeline instance')
+    parser.add_argument('--child', choices=['dict', 'slots'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(layout=args.child, entities=args.entities, stages=args.stages)
+    else:
+        run(entities=args.entities, stages=args.stages)
+
+
+if __name__ == '__main__':
+    main()
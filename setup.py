@@ -17,8 +17,7 @@ with open('HISTORY.rst') as history_file:
 requirements = [
     'six',
     'requests',
-    'easydict'
-
+    'futures; python_version < "3.0"',
 ]
 
 test_requirements = [
@@ -68,6 +68,7 @@ def mock_session():
     session = mock.patch('yagocd.session.Session').start()
     session.server_url = 'http://example.com'
     session.server_version = '999.999.999'
+    session._shared_managers = dict()
     return session
 
 
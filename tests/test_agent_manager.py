@@ -260,6 +260,16 @@ class TestJobHistory(BaseTestAgentManager, ReturnValueMixin):
         return check_value
 
 
+class TestFullJobHistory(object):
+    @mock.patch('yagocd.resources.agent.AgentManager.job_history')
+    def test_job_history_is_called(self, job_history_mock, mock_session):
+        job_history_mock.side_effect = [['foo', 'bar', 'baz'], []]
+
+        manager = agent.AgentManager(session=mock_session)
+        assert list(manager.full_job_history('uuid', look_ahead=2)) == ['foo', 'bar', 'baz']
+        job_history_mock.assert_any_call('uuid', 0)
+
+
 class TestMagicMethods(object):
     @mock.patch('yagocd.resources.agent.AgentManager.get')
     def test_indexed_based_access(self, get_mock, manager):
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+import json
+import threading
+import time
+
+import pytest
+from six.moves import BaseHTTPServer, socketserver
+
+from yagocd.resources import pipeline
+from yagocd.util import Since
+
+asyncio = pytest.importorskip('asyncio')
+aio = pytest.importorskip('yagocd.aio')
+
+
+class StubHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    DELAY = 0.2
+    PAGE_SIZE = 10
+    TOTAL = 25
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # noqa: N802
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            parts = self.path.strip('/').split('/')
+            if parts[-1] == 'status':
+                time.sleep(self.DELAY)
+                self._send_json({'paused': False, 'name': parts[-2]})
+            elif parts[-2] == 'history':
+                offset = int(parts[-1])
+                counters = range(self.TOTAL - offset, max(self.TOTAL - offset - self.PAGE_SIZE, 0), -1)
+                self._send_json({'pipelines': [{'name': parts[-3], 'counter': c} for c in counters]})
+            else:
+                self.send_error(404)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+class StubServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        BaseHTTPServer.HTTPServer.__init__(self, ('127.0.0.1', 0), StubHandler)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+@pytest.fixture()
+def stub_server():
+    server = StubServer()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    yield 'http://127.0.0.1:{}'.format(server.server_address[1]), server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def disable_since():
+    _original = Since.ENABLED
+    Since.ENABLED = False
+
+    yield
+    Since.ENABLED = _original
+
+
+@pytest.fixture()
+def loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    asyncio.set_event_loop(None)
+    loop.close()
+
+
+class TestAsyncYagocd(object):
+    def test_properties_are_mirrored(self, stub_server):
+        url, _ = stub_server
+        go = aio.AsyncYagocd(server=url)
+        try:
+            assert go.server_url == url
+            assert isinstance(go.pipelines, aio.AsyncManager)
+            assert go.pipelines is go.pipelines
+            assert go.pipelines.manager is go.client.pipelines
+        finally:
+            go.close()
+
+    def test_concurrent_requests(self, stub_server, loop):
+        url, server = stub_server
+        names = ['pipeline-{}'.format(i) for i in range(20)]
+        go = aio.AsyncYagocd(server=url, concurrency=20)
+
+        started = time.time()
+        try:
+            result = loop.run_until_complete(asyncio.gather(*[go.pipelines.status(name) for name in names]))
+        finally:
+            go.close()
+
+        assert [status.name for status in result] == names
+        assert time.time() - started < StubHandler.DELAY * len(names) / 2
+        assert server.max_in_flight > 1
+
+    def test_concurrency_is_bounded(self, stub_server, loop):
+        url, server = stub_server
+        go = aio.AsyncYagocd(server=url, concurrency=3)
+        try:
+            loop.run_until_complete(asyncio.gather(*[go.pipelines.status(str(i)) for i in range(9)]))
+        finally:
+            go.close()
+
+        assert server.max_in_flight <= 3
+
+    def test_generator_method(self, stub_server, loop):
+        url, _ = stub_server
+        go = aio.AsyncYagocd(server=url)
+
+        async_iterator = go.pipelines.full_history('foo')
+        counters = list()
+        try:
+            while True:
+                try:
+                    instance = loop.run_until_complete(async_iterator.__anext__())
+                except StopAsyncIteration:
+                    break
+                counters.append(instance.data.counter)
+        finally:
+            go.close()
+
+        assert counters == list(range(StubHandler.TOTAL, 0, -1))
+
+    def test_returns_entities(self, stub_server, loop):
+        url, _ = stub_server
+        go = aio.AsyncYagocd(server=url)
+        try:
+            history = loop.run_until_complete(go.pipelines.history('foo'))
+        finally:
+            go.close()
+
+        assert len(history) == StubHandler.PAGE_SIZE
+        assert all(isinstance(i, pipeline.PipelineInstance) for i in history)
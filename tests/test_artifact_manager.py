@@ -26,15 +26,22 @@
 #
 ###############################################################################
 
+import hashlib
 import json
 import os
+import threading
+import time
+import types
 import zipfile
 
 import mock
 import pytest
+import requests
 from six import binary_type, BytesIO, string_types
 
 from tests import AbstractTestManager, ReturnValueMixin
+from yagocd.download import Downloader
+from yagocd.exception import YagocdException
 from yagocd.resources import artifact
 from yagocd.util import Since
 
@@ -312,10 +319,6 @@ class TestWalk(BaseTestArtifactManager):
             next(walk_iter)
 
 
-class TestJsonWalk(BaseTestArtifactManager):
-    pass
-
-
 class TestGetChildren(BaseTestArtifactManager):
     @pytest.mark.parametrize('top, expected', [
         (None, [
@@ -357,8 +360,8 @@ class TestGetChildren(BaseTestArtifactManager):
             ]
         ),
     ])
-    def test_parametrized(self, manager, artifact_all, top, expected):
-        result = manager._get_children(artifact_all, top)
+    def test_parametrized(self, artifact_all, top, expected):
+        result = artifact.ArtifactListing(artifact_all).children(top)
         if not expected:
             assert result == expected
         else:
@@ -371,9 +374,233 @@ class TestGetChildren(BaseTestArtifactManager):
         '//dummy.txt',
         '/dummy',
     ])
-    def test_non_existing_path(self, manager, artifact_all, top):
+    def test_non_existing_path(self, artifact_all, top):
         with pytest.raises(ValueError):
-            manager._get_children(artifact_all, top)
+            artifact.ArtifactListing(artifact_all).children(top)
+
+    def test_nested_path(self, artifact_all):
+        result = artifact.ArtifactListing(artifact_all).children('/yet-another-directory/sub-dir-1/sub-dir-3/')
+        assert [r.path for r in result] == [
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-1.txt',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-3.txt',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-5.txt',
+        ]
+
+
+@mock.patch('yagocd.resources.artifact.ArtifactManager.list')
+class TestListing(BaseTestArtifactManager):
+
+    @pytest.yield_fixture(autouse=True)
+    def disable_since(self):
+        _original = Since.ENABLED
+        Since.ENABLED = False
+
+        yield
+        Since.ENABLED = _original
+
+    def test_index(self, list_mock, manager, artifact_all):
+        list_mock.return_value = artifact_all
+
+        listing = manager.listing()
+
+        assert len(listing) == 24
+        assert listing.artifacts == artifact_all
+        assert listing.get('/cruise-output/sub-directory-1/file-1.txt').data.name == 'file-1.txt'
+        assert listing.get('/yet-another-directory/sub-dir-2/').path == '/yet-another-directory/sub-dir-2/'
+        assert listing.get('/unknown') is None
+        assert '/dummy.txt' in listing
+        assert len(set(a.path for a in listing)) == 24
+
+    def test_listing_is_requested_once(self, list_mock, manager, artifact_all):
+        list_mock.return_value = artifact_all
+
+        list(manager.walk())
+        list(manager.walk(top='/yet-another-directory', refresh=False))
+        list(manager.walk(top='/cruise-output/sub-directory-1', refresh=False))
+        manager.listing().get('/dummy.txt')
+
+        assert list_mock.call_count == 1
+
+    def test_walk_is_fresh_by_default(self, list_mock, manager, artifact_all):
+        list_mock.return_value = artifact_all
+
+        list(manager.walk())
+        list(manager.walk())
+        list(manager.glob('*.txt'))
+
+        assert list_mock.call_count == 2
+
+    def test_refresh(self, list_mock, manager, artifact_all):
+        list_mock.return_value = artifact_all
+
+        first = manager.listing()
+        second = manager.listing(refresh=True)
+
+        assert first is not second
+        assert list_mock.call_count == 2
+
+    def test_search_refresh(self, list_mock, manager, artifact_all):
+        list_mock.return_value = artifact_all
+
+        list(manager.walk(refresh=False))
+        list(manager.walk(refresh=True))
+        list(manager.find(lambda a: True, refresh=True))
+        list(manager.glob('*.txt', refresh=True))
+        list(manager.glob('*.txt'))
+
+        assert list_mock.call_count == 4
+
+    def test_listing_per_job(self, list_mock, manager, artifact_all):
+        list_mock.return_value = artifact_all
+
+        manager.listing()
+        manager.listing(job_name='another')
+        manager.listing()
+
+        assert list_mock.call_count == 2
+
+    def test_oldest_listing_is_forgotten(self, list_mock, manager, artifact_all):
+        list_mock.return_value = artifact_all
+
+        for counter in range(artifact.ArtifactManager.LISTING_CACHE_SIZE + 1):
+            manager.listing(pipeline_counter=counter)
+        manager.listing(pipeline_counter=0)
+
+        assert list_mock.call_count == artifact.ArtifactManager.LISTING_CACHE_SIZE + 2
+
+    def test_upload_forgets_listing(self, list_mock, manager, artifact_all, tmpdir):
+        list_mock.return_value = artifact_all
+        filename = tmpdir.join('file.txt')
+        filename.write('data')
+
+        manager.listing()
+        with mock.patch.object(manager._session, 'post'):
+            manager.create(path='file.txt', filename=str(filename))
+        manager.listing()
+
+        assert list_mock.call_count == 2
+
+    def test_nested_artifact_walks_listing(self, list_mock, manager, artifact_all):
+        list_mock.return_value = artifact_all
+        nested = manager.listing().get('/yet-another-directory/sub-dir-1/')
+
+        result = [(top, [f.path for f in files]) for top, folders, files in nested.walk()]
+
+        assert result == [
+            ('/yet-another-directory/sub-dir-1/', []),
+            ('/yet-another-directory/sub-dir-1/sub-dir-3', [
+                '/yet-another-directory/sub-dir-1/sub-dir-3/hello-1.txt',
+                '/yet-another-directory/sub-dir-1/sub-dir-3/hello-3.txt',
+                '/yet-another-directory/sub-dir-1/sub-dir-3/hello-5.txt',
+            ]),
+        ]
+        assert list_mock.call_count == 1
+
+    def test_folder_without_children_requests_listing(self, list_mock, session_fixture, artifact_all):
+        list_mock.return_value = artifact_all
+        data = dict(artifact_all[3].data)
+        del data['files']
+
+        result = next(artifact.Artifact(session_fixture, data).walk())
+
+        assert [f.path for f in result[2]] == ['/yet-another-directory/some-file.txt']
+        assert list_mock.call_count == 1
+
+    def test_file_walks_own_listing(self, list_mock, session_fixture, artifact_all):
+        list_mock.return_value = artifact_all
+        data = next(a.data for a in artifact_all if a.data.type == 'file')
+
+        file_artifact = artifact.Artifact(session_fixture, data)
+        result = list(file_artifact.walk())
+
+        assert file_artifact._listing.get(file_artifact.path) is file_artifact
+        assert result == []
+        assert list_mock.call_count == 0
+
+
+class TestSearch(BaseTestArtifactManager):
+
+    @pytest.yield_fixture(autouse=True)
+    def disable_since(self):
+        _original = Since.ENABLED
+        Since.ENABLED = False
+
+        yield
+        Since.ENABLED = _original
+
+    @pytest.fixture()
+    def listing(self, artifact_all):
+        return artifact.ArtifactListing(artifact_all)
+
+    @pytest.mark.parametrize('pattern, expected', [
+        ('dummy.txt', ['/dummy.txt']),
+        ('/*.txt', ['/dummy.txt']),
+        ('*', ['/another-directory/', '/cruise-output/', '/dummy.txt', '/yet-another-directory/']),
+        ('yet-another-directory/*/sub-dir-?', ['/yet-another-directory/sub-dir-1/sub-dir-3/']),
+        ('yet-another-directory/**/*.txt', [
+            '/yet-another-directory/some-file.txt',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-1.txt',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-3.txt',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-5.txt',
+        ]),
+        ('**/hello-[13].txt', [
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-1.txt',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-3.txt',
+        ]),
+        ('yet-another-directory/**/**/sub-dir-3/**', [
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-1.txt',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-3.txt',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-5.txt',
+        ]),
+        ('**/sub-dir-*/**/hello-1.txt', ['/yet-another-directory/sub-dir-1/sub-dir-3/hello-1.txt']),
+        ('*.xml', []),
+        ('dummy.txt/*', []),
+        ('', []),
+    ])
+    def test_glob(self, listing, pattern, expected):
+        assert sorted(a.path for a in listing.glob(pattern)) == expected
+
+    def test_glob_everything(self, listing):
+        assert sorted(a.path for a in listing.glob('**')) == sorted(a.path for a in listing)
+
+    def test_glob_is_lazy(self, listing):
+        result = listing.glob('**')
+        assert isinstance(result, types.GeneratorType)
+        assert next(result).path == '/another-directory/'
+
+    def test_find(self, listing):
+        result = listing.find(lambda a: a.data.type == 'file', top='/yet-another-directory/sub-dir-1')
+
+        assert [a.path for a in result] == [
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-1.txt',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-3.txt',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-5.txt',
+        ]
+
+    def test_find_in_tree_order(self, listing):
+        result = [a.path for a in listing.find(lambda a: a.path.startswith('/yet-another-directory'))]
+
+        assert result == [
+            '/yet-another-directory/',
+            '/yet-another-directory/sub-dir-1/',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-1.txt',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-3.txt',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-5.txt',
+            '/yet-another-directory/sub-dir-2/',
+            '/yet-another-directory/some-file.txt',
+        ]
+
+    @mock.patch('yagocd.resources.artifact.ArtifactManager.list')
+    def test_manager_uses_listing(self, list_mock, manager, artifact_all):
+        list_mock.return_value = artifact_all
+
+        logs = list(manager.glob('**/*.log'))
+        files = list(manager.find(lambda a: a.data.type == 'file', top='/cruise-output'))
+
+        assert [a.path for a in logs] == ['/cruise-output/console.log']
+        assert '/cruise-output/console.log' in [a.path for a in files]
+        assert list_mock.call_count == 1
 
 
 class TestFile(BaseTestArtifactManager):
@@ -506,6 +733,277 @@ class TestDirectoryReadyWait(TestDirectoryNotReadyWait):
         return 200
 
 
+class TestDownload(BaseTestArtifactManager):
+    DIRECTORY_PATH = 'path/to/the/.zip'
+
+    @pytest.fixture(autouse=True)
+    def server_version(self, manager, my_vcr):
+        with my_vcr.use_cassette("server_version_cache/server_version_cache"):
+            return manager._session.server_version
+
+    def test_download_to_path(self, manager, my_vcr, tmpdir):
+        destination = str(tmpdir.join('directory.zip'))
+        progress = mock.MagicMock()
+
+        with my_vcr.use_cassette("artifact/artifact_directory_ready"):
+            result = manager.download(path=self.DIRECTORY_PATH, destination=destination, progress=progress)
+
+        with open(destination, 'rb') as f:
+            content = f.read()
+        assert zipfile.ZipFile(BytesIO(content)).testzip() is None
+        assert result.size == len(content)
+        assert result.checksum == hashlib.sha256(content).hexdigest()
+        assert progress.call_args[0][0] == len(content)
+
+    def test_download_to_file_object(self, manager, my_vcr):
+        output = BytesIO()
+
+        with my_vcr.use_cassette("artifact/artifact_directory_ready"):
+            result = manager.download(path=self.DIRECTORY_PATH, destination=output, algorithm=None)
+
+        assert result.size == len(output.getvalue())
+        assert result.checksum is None
+
+    def test_resumed_download(self, manager, my_vcr, tmpdir):
+        destination = tmpdir.join('directory.zip')
+
+        with my_vcr.use_cassette("artifact/artifact_directory_ready"):
+            result = manager.download(path=self.DIRECTORY_PATH, destination=str(destination), resume=True)
+
+        assert result.size == destination.size()
+        assert not tmpdir.join('directory.zip.part').exists()
+
+    def test_segmented_download_takes_pool(self, manager, tmpdir):
+        destination = str(tmpdir.join('directory.zip'))
+        pool = manager._session.pool
+        adapter = manager._session._session.adapters['http://']
+
+        with mock.patch.object(Downloader, 'segmented') as segmented_mock:
+            with mock.patch.object(manager._session, 'pooled', wraps=manager._session.pooled) as pooled_mock:
+                manager.download(path=self.DIRECTORY_PATH, destination=destination, segments=32)
+
+        pooled_mock.assert_called_once_with(32)
+        assert segmented_mock.call_args[0][1] == destination
+        assert segmented_mock.call_args[1] == dict(segments=32)
+        assert manager._session.pool == pool
+        assert manager._session._session.adapters['http://'] is adapter
+
+    def test_segmented_download_is_not_resumed(self, manager, tmpdir):
+        with pytest.raises(ValueError):
+            manager.download(path=self.DIRECTORY_PATH, destination=str(tmpdir), resume=True, segments=4)
+
+    def test_directory_not_ready(self, manager, my_vcr, tmpdir):
+        destination = tmpdir.join('directory.zip')
+
+        with my_vcr.use_cassette("artifact/artifact_directory_not_ready"):
+            result = manager.download(path=self.DIRECTORY_PATH, destination=str(destination))
+
+        assert result is None
+        assert not destination.exists()
+
+
+class TestDirectoryExtract(BaseTestArtifactManager):
+    DIRECTORY_PATH = 'path/to/.zip'
+
+    @pytest.fixture(autouse=True)
+    def server_version(self, manager, my_vcr):
+        with my_vcr.use_cassette("server_version_cache/server_version_cache"):
+            return manager._session.server_version
+
+    @mock.patch('yagocd.resources.artifact.time.sleep')
+    def test_directory_is_extracted_when_ready(self, sleep_mock, manager, my_vcr, tmpdir):
+        with my_vcr.use_cassette("artifact/artifact_directory_not_ready_wait") as cass:
+            result = manager.directory_extract(path=self.DIRECTORY_PATH, local_dir=str(tmpdir), spool_size=1024)
+
+        assert cass.play_count == 2
+        sleep_mock.assert_called_once_with(0.4)
+        assert result
+        assert all(path.startswith(str(tmpdir)) and os.path.exists(path) for path in result)
+
+    def test_timeout(self, manager, tmpdir):
+        with mock.patch.object(manager, '_get_streamed', return_value=None) as get_mock:
+            result = manager.directory_extract(
+                path=self.DIRECTORY_PATH, local_dir=str(tmpdir), timeout=0.05, backoff=0.01
+            )
+
+        assert result is None
+        assert get_mock.called
+        assert tmpdir.listdir() == []
+
+
+class TestDirectoriesWait(BaseTestArtifactManager):
+    # number of `202 Accepted` responses before the zip is ready
+    READY_AFTER = {'slow': 2, 'fast': 0, 'medium': 1}
+
+    @pytest.fixture(autouse=True)
+    def server_version(self, manager, my_vcr):
+        with my_vcr.use_cassette("server_version_cache/server_version_cache"):
+            return manager._session.server_version
+
+    @pytest.fixture()
+    def directory_mock(self, manager):
+        calls = []
+        lock = threading.Lock()
+
+        def directory(path, **kwargs):
+            with lock:
+                calls.append((path, kwargs['job_name']))
+                polls = calls.count((path, kwargs['job_name']))
+            if polls <= self.READY_AFTER.get(path, 100):
+                return None
+            return path.encode('utf-8')
+
+        with mock.patch.object(manager, 'directory', side_effect=directory) as directory_mock:
+            directory_mock.calls = calls
+            yield directory_mock
+
+    def test_directories_are_yielded_when_ready(self, manager, directory_mock):
+        result = list(manager.directories_wait(['slow', 'fast', 'medium'], backoff=0.01))
+
+        assert result == [('fast', b'fast'), ('medium', b'medium'), ('slow', b'slow')]
+        assert directory_mock.call_count == 6
+
+    def test_directories_are_polled_concurrently(self, manager, directory_mock):
+        directories = [dict(path='slow', job_name=name) for name in ('unit', 'integration', 'lint')]
+
+        started = time.time()
+        result = list(manager.directories_wait(directories, backoff=0.2, workers=1))
+
+        # all of them are ready after 0.6 seconds of backoffs, instead of 1.8 one by one
+        assert time.time() - started < 1.2
+        assert len(result) == 3
+        assert directory_mock.call_count == 9
+
+    def test_timeout(self, manager, directory_mock):
+        result = list(manager.directories_wait(['fast', 'never'], timeout=0.1, backoff=0.02))
+
+        assert result == [('fast', b'fast'), ('never', None)]
+        assert 2 <= len([call for call in directory_mock.calls if call[0] == 'never']) < 6
+
+    def test_job_parameters(self, manager, directory_mock):
+        directories = [dict(path='fast', job_name='unit'), dict(path='medium', job_name='integration')]
+
+        result = list(manager.directories_wait(directories, backoff=0.01))
+
+        assert [directory for directory, _ in result] == directories
+        assert ('fast', 'unit') in directory_mock.calls
+        assert ('medium', 'integration') in directory_mock.calls
+
+    def test_errors_are_raised(self, manager):
+        with mock.patch.object(manager, 'directory', side_effect=YagocdException('not found')):
+            with pytest.raises(YagocdException):
+                list(manager.directories_wait(['fast']))
+
+    def test_no_directories(self, manager):
+        assert list(manager.directories_wait([])) == []
+
+
+class TestMirror(BaseTestArtifactManager):
+    BASE_URL = 'http://localhost:8153/go/files/Shared_Services/7/Commit/1/build'
+    BODIES = {
+        'dist/a.txt': b'first file',
+        'dist/lib/b.txt': b'second file',
+        'readme.txt': b'read me',
+        'cruise-output/console.log': b'build log',
+    }
+
+    @pytest.fixture(autouse=True)
+    def server_version(self, manager, my_vcr):
+        with my_vcr.use_cassette("server_version_cache/server_version_cache"):
+            return manager._session.server_version
+
+    def node(self, path, children=None):
+        data = dict(name=path.rsplit('/', 1)[-1], url=self.BASE_URL + '/' + path)
+        if children is None:
+            data.update(type='file')
+        else:
+            data.update(type='folder', files=children)
+        return data
+
+    @pytest.fixture()
+    def bodies(self):
+        bodies = dict(self.BODIES)
+        bodies['cruise-output/md5.checksum'] = '# checksums\n'.encode('utf-8') + b''.join(
+            '{}={}\n'.format(path, hashlib.md5(body).hexdigest()).encode('utf-8')
+            for path, body in self.BODIES.items() if not path.startswith('cruise-output')
+        )
+        return bodies
+
+    @pytest.fixture()
+    def server(self, manager, bodies):
+        listing = [
+            self.node('cruise-output', [
+                self.node('cruise-output/console.log'), self.node('cruise-output/md5.checksum')
+            ]),
+            self.node('dist', [self.node('dist/a.txt'), self.node('dist/lib', [self.node('dist/lib/b.txt')])]),
+            self.node('empty', []),
+            self.node('readme.txt'),
+        ]
+
+        def get(url, headers=None, stream=False):
+            response = requests.Response()
+            response.status_code = 200
+            response.raw = BytesIO(bodies[url[len(self.BASE_URL) + 1:]])
+            requested.append(url[len(self.BASE_URL):])
+            return response
+
+        requested = list()
+        artifacts = [artifact.Artifact(session=manager._session, data=data) for data in listing]
+        with mock.patch.object(manager, 'list', return_value=artifacts):
+            with mock.patch.object(manager._session, 'get', side_effect=get):
+                yield requested
+
+    def test_whole_tree_is_mirrored(self, manager, server, tmpdir):
+        result = manager.mirror(str(tmpdir))
+
+        for path, body in self.BODIES.items():
+            assert tmpdir.join(path).read_binary() == body
+        assert tmpdir.join('empty').isdir()
+        assert sorted(result['downloaded']) == [
+            '/cruise-output/console.log', '/cruise-output/md5.checksum', '/dist/a.txt', '/dist/lib/b.txt', '/readme.txt'
+        ]
+        assert result['skipped'] == []
+
+    def test_matching_files_are_skipped(self, manager, server, tmpdir):
+        manager.mirror(str(tmpdir))
+        tmpdir.join('dist', 'a.txt').write_binary(b'changed')
+        del server[:]
+
+        result = manager.mirror(str(tmpdir))
+
+        assert sorted(result['skipped']) == ['/dist/lib/b.txt', '/readme.txt']
+        assert sorted(result['downloaded']) == [
+            '/cruise-output/console.log', '/cruise-output/md5.checksum', '/dist/a.txt'
+        ]
+        assert tmpdir.join('dist', 'a.txt').read_binary() == self.BODIES['dist/a.txt']
+        assert sorted(server) == [
+            '/cruise-output/console.log', '/cruise-output/md5.checksum', '/cruise-output/md5.checksum', '/dist/a.txt'
+        ]
+
+    def test_sub_tree_is_mirrored(self, manager, server, tmpdir):
+        manager.mirror(str(tmpdir), top='/dist', workers=2)
+
+        assert tmpdir.join('a.txt').read_binary() == self.BODIES['dist/a.txt']
+        assert tmpdir.join('lib', 'b.txt').read_binary() == self.BODIES['dist/lib/b.txt']
+        assert not tmpdir.join('readme.txt').exists()
+
+    def test_checksum_mismatch(self, manager, server, bodies, tmpdir):
+        bodies['readme.txt'] = b'corrupted'
+
+        with pytest.raises(YagocdException):
+            manager.mirror(str(tmpdir))
+
+        assert not tmpdir.join('readme.txt').exists()
+
+    @pytest.mark.parametrize('content, expected', [
+        (b'', {}),
+        (b'#comment\n!comment\n\na.txt=123\n', {'a.txt': '123'}),
+        (b'dir/with\\ space\\=.txt = abc\r\nb:def\n', {'dir/with space=.txt': 'abc', 'b': 'def'}),
+    ])
+    def test_parse_checksums(self, content, expected):
+        assert artifact.ArtifactManager._parse_checksums(content) == expected
+
+
 class TestCreate(AbstractTestManager, BaseTestArtifactManager):
     PATH_TO_FILE = 'path/to/the/file.txt'
     FILE_CONTENT = 'Sample test data.\nFoo and Bar.'
@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+import copy
+import json
+
+import mock
+import pytest
+import requests
+
+from yagocd import Yagocd
+from yagocd.cache import DiskStorage, InstanceCache, MemoryStorage, ResponseCache
+from yagocd.resources import pipeline, stage
+from yagocd.session import Session
+from yagocd.util import Since
+
+
+def make_response(status_code, body=b'', headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = requests.status_codes._codes[status_code][0].upper()
+    response.headers.update(headers or {})
+    response._content = body
+    response.url = 'http://example.com/go/api/admin/templates'
+    return response
+
+
+class TestResponseCache(object):
+    BODY = json.dumps({'name': 'template'}).encode('utf-8')
+
+    @pytest.fixture()
+    def session(self):
+        options = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
+        options['server'] = 'http://example.com'
+        options['cache'] = True
+        return Session(auth=None, options=options)
+
+    @pytest.fixture()
+    def request_mock(self, session):
+        with mock.patch.object(session._session, 'request') as request_mock:
+            yield request_mock
+
+    def test_disabled_by_default(self):
+        assert Yagocd().cache is None
+
+    def test_enabled_with_instance(self):
+        cache = ResponseCache(max_entries=5)
+        assert Yagocd(options={'cache': cache}).cache is cache
+
+    def test_first_request_is_miss(self, session, request_mock):
+        request_mock.return_value = make_response(200, self.BODY, {'ETag': '"abc"'})
+
+        response = session.get('go/api/admin/templates')
+
+        assert response.json() == {'name': 'template'}
+        assert 'If-None-Match' not in request_mock.call_args[1]['headers']
+        assert session.cache.stats == dict(hits=0, misses=1, revalidations=0, bytes_saved=0, entries=1)
+
+    def test_not_modified_is_served_from_cache(self, session, request_mock):
+        request_mock.return_value = make_response(200, self.BODY, {'ETag': '"abc"'})
+        session.get('go/api/admin/templates')
+
+        request_mock.return_value = make_response(304, headers={'ETag': '"abc"', 'X-Fresh': 'yes'})
+        response = session.get('go/api/admin/templates')
+
+        assert request_mock.call_args[1]['headers']['If-None-Match'] == '"abc"'
+        assert response.status_code == 200
+        assert response.json() == {'name': 'template'}
+        assert response.headers['ETag'] == '"abc"'
+        assert response.headers['X-Fresh'] == 'yes'
+        assert session.cache.hits == 1
+        assert session.cache.revalidations == 1
+        assert session.cache.bytes_saved == len(self.BODY)
+
+    def test_modified_response_replaces_entry(self, session, request_mock):
+        request_mock.return_value = make_response(200, self.BODY, {'ETag': '"abc"'})
+        session.get('go/api/admin/templates')
+
+        request_mock.return_value = make_response(200, b'{"name": "new"}', {'ETag': '"def"'})
+        assert session.get('go/api/admin/templates').json() == {'name': 'new'}
+
+        session.get('go/api/admin/templates')
+        assert request_mock.call_args[1]['headers']['If-None-Match'] == '"def"'
+        assert session.cache.misses == 3
+
+    def test_last_modified_validator(self, session, request_mock):
+        last_modified = 'Wed, 21 Oct 2015 07:28:00 GMT'
+        request_mock.return_value = make_response(200, self.BODY, {'Last-Modified': last_modified})
+        session.get('go/api/admin/templates')
+        session.get('go/api/admin/templates')
+
+        assert request_mock.call_args[1]['headers']['If-Modified-Since'] == last_modified
+
+    def test_response_without_validators_is_not_stored(self, session, request_mock):
+        request_mock.return_value = make_response(200, self.BODY)
+        session.get('go/api/admin/templates')
+        session.get('go/api/admin/templates')
+
+        assert 'If-None-Match' not in request_mock.call_args[1]['headers']
+        assert len(session.cache) == 0
+
+    def test_accept_header_is_part_of_key(self, session, request_mock):
+        request_mock.return_value = make_response(200, self.BODY, {'ETag': '"abc"'})
+        session.get('go/api/admin/templates', headers={'Accept': 'application/vnd.go.cd.v1+json'})
+        session.get('go/api/admin/templates', headers={'Accept': 'application/vnd.go.cd.v2+json'})
+
+        assert 'If-None-Match' not in request_mock.call_args[1]['headers']
+        assert len(session.cache) == 2
+
+    def test_unsafe_request_invalidates(self, session, request_mock):
+        request_mock.return_value = make_response(200, self.BODY, {'ETag': '"abc"'})
+        session.get('go/api/admin/templates')
+        session.put('go/api/admin/templates', data='{}')
+        session.get('go/api/admin/templates')
+
+        assert 'If-None-Match' not in request_mock.call_args[1]['headers']
+
+    def test_least_recently_used_is_evicted(self, request_mock, session):
+        session._cache = ResponseCache(max_entries=2)
+        request_mock.return_value = make_response(200, self.BODY, {'ETag': '"abc"'})
+
+        for name in ['a', 'b', 'c']:
+            session.get('go/api/admin/templates/{}'.format(name))
+
+        assert len(session.cache) == 2
+        session.get('go/api/admin/templates/a')
+        assert 'If-None-Match' not in request_mock.call_args[1]['headers']
+
+    def test_entry_evicted_during_revalidation(self, request_mock, session):
+        session._cache = ResponseCache(max_entries=1)
+        request_mock.return_value = make_response(200, self.BODY, {'ETag': '"abc"'})
+        session.get('go/api/admin/templates/a')
+
+        def evict(*args, **kwargs):
+            session._cache.process(
+                session._cache.key('http://example.com/go/api/admin/templates/b', None, {}),
+                'GET',
+                make_response(200, b'{}', {'ETag': '"def"'})
+            )
+            return make_response(304, headers={'ETag': '"abc"'})
+
+        request_mock.side_effect = evict
+        response = session.get('go/api/admin/templates/a')
+
+        assert request_mock.call_args[1]['headers']['If-None-Match'] == '"abc"'
+        assert response.status_code == 200
+        assert response.json() == {'name': 'template'}
+        assert session.cache.hits == 1
+        assert len(session.cache) == 1
+
+    def test_entry_evicted_between_calls(self):
+        cache = ResponseCache(max_entries=1)
+        key = cache.key('http://example.com/go/api/admin/templates', None, {})
+        cache.process(key, 'GET', make_response(200, self.BODY, {'ETag': '"abc"'}))
+
+        entry = cache.revalidate(key)
+        cache.clear()
+        response = cache.process(key, 'GET', make_response(304, headers={'ETag': '"abc"'}), entry)
+
+        assert response.status_code == 200
+        assert response.content == self.BODY
+
+
+class TestMemoryStorage(object):
+    def test_get_set_delete(self):
+        storage = MemoryStorage()
+        storage.set('foo', {'bar': 1})
+        assert storage.get('foo') == {'bar': 1}
+
+        storage.delete('foo')
+        assert storage.get('foo') is None
+
+    def test_least_recently_used_is_evicted(self):
+        storage = MemoryStorage(max_entries=2)
+        storage.set('a', 1)
+        storage.set('b', 2)
+        storage.get('a')
+        storage.set('c', 3)
+
+        assert len(storage) == 2
+        assert storage.get('b') is None
+        assert storage.get('a') == 1
+
+
+class TestDiskStorage(object):
+    def test_get_set_delete(self, tmpdir):
+        storage = DiskStorage(str(tmpdir.join('cache')))
+        storage.set('pipeline/foo/1', {'bar': [1, 2]})
+
+        assert DiskStorage(str(tmpdir.join('cache'))).get('pipeline/foo/1') == {'bar': [1, 2]}
+        assert len(storage) == 1
+
+        storage.delete('pipeline/foo/1')
+        assert storage.get('pipeline/foo/1') is None
+
+    def test_clear(self, tmpdir):
+        storage = DiskStorage(str(tmpdir))
+        storage.set('a', 1)
+        storage.set('b', 2)
+        storage.clear()
+
+        assert len(storage) == 0
+
+
+class TestInstanceCache(object):
+    def test_completed_is_kept_forever(self):
+        cache = InstanceCache(ttl=10)
+        with mock.patch('time.time', return_value=1000):
+            cache.set('key', {'foo': 'bar'}, completed=True)
+        with mock.patch('time.time', return_value=10 ** 10):
+            assert cache.get('key') == {'foo': 'bar'}
+
+    def test_running_expires(self):
+        cache = InstanceCache(ttl=10)
+        with mock.patch('time.time', return_value=1000):
+            cache.set('key', {'foo': 'bar'}, completed=False)
+        with mock.patch('time.time', return_value=1005):
+            assert cache.get('key') == {'foo': 'bar'}
+        with mock.patch('time.time', return_value=1011):
+            assert cache.get('key') is None
+
+        assert cache.stats == dict(hits=1, misses=1)
+
+
+class TestInstanceCaching(object):
+    @pytest.fixture(autouse=True)
+    def disable_since(self):
+        _original = Since.ENABLED
+        Since.ENABLED = False
+
+        yield
+        Since.ENABLED = _original
+
+    @pytest.fixture()
+    def session(self):
+        options = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
+        options['server'] = 'http://example.com'
+        options['instance_cache'] = True
+        return Session(auth=None, options=options)
+
+    @pytest.fixture()
+    def request_mock(self, session):
+        with mock.patch.object(session._session, 'request') as request_mock:
+            yield request_mock
+
+    @pytest.mark.parametrize('result, expected_requests', [
+        (stage.StageResult.Passed, 1),
+        (stage.StageResult.Unknown, 2),
+    ])
+    def test_pipeline_instance(self, session, request_mock, result, expected_requests):
+        data = {'name': 'foo', 'counter': 1, 'stages': [{'name': 'bar', 'result': result}]}
+        request_mock.return_value = make_response(200, json.dumps(data).encode('utf-8'))
+        manager = pipeline.PipelineManager(session=session)
+
+        with mock.patch('time.time', return_value=1000):
+            first = manager.get('foo', 1)
+        with mock.patch('time.time', return_value=1000 + InstanceCache.DEFAULT_TTL + 1):
+            second = manager.get('foo', 1)
+
+        assert first.data == second.data
+        assert request_mock.call_count == expected_requests
+
+    def test_stage_instance(self, session, request_mock):
+        data = {'name': 'bar', 'counter': '1', 'result': stage.StageResult.Failed, 'jobs': []}
+        request_mock.return_value = make_response(200, json.dumps(data).encode('utf-8'))
+        manager = stage.StageManager(session=session)
+
+        for _ in range(3):
+            instance = manager.get('foo', 1, 'bar', 1)
+
+        assert instance.data.result == stage.StageResult.Failed
+        assert request_mock.call_count == 1
+        assert session.instance_cache.hits == 2
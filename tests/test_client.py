@@ -77,6 +77,14 @@ class TestInit(object):
         go = Yagocd(options=dict(headers=dict(Accept='foo/bar')))
         assert go._session._options['headers']['Accept'] == 'foo/bar'
 
+    def test_set_pool(self):
+        go = Yagocd(options=dict(pool_connections=2, pool_maxsize=32, pool_block=True))
+        assert go._session.pool == dict(pool_connections=2, pool_maxsize=32, pool_block=True)
+
+    def test_set_keep_alive(self):
+        go = Yagocd(options=dict(keep_alive=False))
+        assert go._session._session.headers['Connection'] == 'close'
+
 
 class TestServerUrl(object):
     def test_default(self):
@@ -0,0 +1,460 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+import hashlib
+import io
+import os
+import threading
+import zipfile
+
+import mock
+import pytest
+import requests
+
+from yagocd.download import Downloader, DownloadResult
+from yagocd.exception import RequestError, YagocdException
+from yagocd.resources import artifact
+
+
+def make_response(body, headers=None):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(body)
+    return response
+
+
+class FailingStream(io.BytesIO):
+    def read(self, *args, **kwargs):
+        if self.tell() > 0:
+            raise requests.ConnectionError('reset')
+        return io.BytesIO.read(self, *args, **kwargs)
+
+
+class TestDownloader(object):
+    BODY = b'0123456789' * 1000
+
+    def test_save_to_path(self, tmpdir):
+        destination = tmpdir.join('artifact.bin')
+
+        result = Downloader(chunk_size=1024).save(make_response(self.BODY), str(destination))
+
+        assert destination.read_binary() == self.BODY
+        assert result == DownloadResult(
+            size=len(self.BODY), checksum=hashlib.sha256(self.BODY).hexdigest(), algorithm='sha256'
+        )
+
+    def test_save_to_file_object(self):
+        output = io.BytesIO()
+
+        result = Downloader(algorithm='md5').save(make_response(self.BODY), output)
+
+        assert output.getvalue() == self.BODY
+        assert not output.closed
+        assert result.checksum == hashlib.md5(self.BODY).hexdigest()
+
+    def test_without_checksum(self):
+        result = Downloader(algorithm=None).save(make_response(self.BODY), io.BytesIO())
+        assert result.size == len(self.BODY)
+        assert result.checksum is None
+
+    def test_progress_is_reported_per_chunk(self):
+        progress = mock.MagicMock()
+
+        Downloader(chunk_size=3000, progress=progress).save(
+            make_response(self.BODY, {'Content-Length': str(len(self.BODY))}), io.BytesIO()
+        )
+
+        assert progress.call_args_list == [
+            mock.call(3000, 10000), mock.call(6000, 10000), mock.call(9000, 10000), mock.call(10000, 10000)
+        ]
+
+    @pytest.mark.parametrize('headers, expected', [
+        ({}, None),
+        ({'Content-Length': '42'}, 42),
+        ({'Content-Length': '42', 'Content-Encoding': 'gzip'}, None),
+        ({'Content-Length': 'garbage'}, None),
+    ])
+    def test_expected_size(self, headers, expected):
+        assert Downloader.expected_size(make_response(b'', headers)) == expected
+
+    def test_failed_range_request_is_retried(self, tmpdir):
+        destination = tmpdir.join('artifact.bin')
+        server = RangeServer(self.BODY)
+        refused = []
+
+        def request(headers):
+            if headers['Range'] != 'bytes=0-0' and not refused:
+                refused.append(headers['Range'])
+                raise requests.ConnectionError('refused')
+            return server(headers)
+
+        Downloader(chunk_size=1000).segmented(request, str(destination), segments=2, min_segment_size=1000)
+
+        assert destination.read_binary() == self.BODY
+        assert refused[0] in server.requested
+
+    def test_failed_download_removes_file(self, tmpdir):
+        destination = tmpdir.join('artifact.bin')
+        response = make_response(b'')
+        response.raw = FailingStream(self.BODY)
+
+        with pytest.raises(requests.ConnectionError):
+            Downloader(chunk_size=1024).save(response, str(destination))
+
+        assert not destination.exists()
+
+    def test_response_is_closed(self):
+        response = make_response(self.BODY)
+        with mock.patch.object(response, 'close') as close_mock:
+            Downloader().save(response, io.BytesIO())
+        close_mock.assert_called_once_with()
+
+
+class TestArtifactDownload(object):
+    URL = 'http://localhost:8153/go/files/Shared_Services/7/Commit/1/build/dummy.txt'
+
+    @pytest.fixture()
+    def make_artifact(self, session_fixture):
+        def make(artifact_type):
+            return artifact.Artifact(session_fixture, {'name': 'dummy.txt', 'type': artifact_type, 'url': self.URL})
+
+        return make
+
+    def test_file_is_streamed(self, make_artifact, session_fixture):
+        output = io.BytesIO()
+        with mock.patch.object(session_fixture, 'get', return_value=make_response(b'dummy')) as get_mock:
+            result = make_artifact('file').download(output)
+
+        get_mock.assert_called_once_with(self.URL, stream=True)
+        assert output.getvalue() == b'dummy'
+        assert result.size == 5
+
+    def test_folder_is_not_downloaded(self, make_artifact):
+        with pytest.raises(YagocdException):
+            make_artifact('folder').download(io.BytesIO())
+
+    def test_resume_checks_size_from_listing(self, session_fixture, tmpdir):
+        item = artifact.Artifact(session_fixture, {'name': 'dummy.txt', 'type': 'file', 'url': self.URL, 'size': 4})
+        destination = tmpdir.join('dummy.txt')
+
+        with mock.patch.object(session_fixture, 'get', return_value=make_response(b'dummy')) as get_mock:
+            with pytest.raises(YagocdException):
+                item.download(str(destination), resume=True)
+
+        get_mock.assert_called_once_with(self.URL, headers={'Accept-Encoding': 'identity'}, stream=True)
+        assert not destination.exists()
+
+
+def make_partial_response(body, start, total):
+    response = make_response(body[start:], {
+        'Content-Range': 'bytes {}-{}/{}'.format(start, total - 1, total),
+        'Content-Length': str(total - start)
+    })
+    response.status_code = 206
+    return response
+
+
+class TestResume(object):
+    BODY = b'0123456789' * 1000
+
+    @pytest.fixture()
+    def destination(self, tmpdir):
+        return tmpdir.join('artifact.bin')
+
+    @pytest.fixture()
+    def partial(self, tmpdir):
+        return tmpdir.join('artifact.bin' + Downloader.PARTIAL_SUFFIX)
+
+    def test_download_from_start(self, destination, partial):
+        request = mock.MagicMock(return_value=make_response(self.BODY, {'Content-Length': str(len(self.BODY))}))
+
+        result = Downloader().resume(request, str(destination))
+
+        request.assert_called_once_with({'Accept-Encoding': 'identity'})
+        assert destination.read_binary() == self.BODY
+        assert not partial.exists()
+        assert result.checksum == hashlib.sha256(self.BODY).hexdigest()
+
+    def test_continue_partial_file(self, destination, partial):
+        partial.write_binary(self.BODY[:4000])
+        request = mock.MagicMock(return_value=make_partial_response(self.BODY, 4000, len(self.BODY)))
+        progress = mock.MagicMock()
+
+        result = Downloader(progress=progress).resume(request, str(destination))
+
+        request.assert_called_once_with({'Accept-Encoding': 'identity', 'Range': 'bytes=4000-'})
+        assert destination.read_binary() == self.BODY
+        assert result == DownloadResult(
+            size=len(self.BODY), checksum=hashlib.sha256(self.BODY).hexdigest(), algorithm='sha256'
+        )
+        assert progress.call_args == mock.call(len(self.BODY), len(self.BODY))
+
+    def test_range_is_ignored(self, destination, partial):
+        partial.write_binary(b'garbage')
+        request = mock.MagicMock(return_value=make_response(self.BODY, {'Content-Length': str(len(self.BODY))}))
+
+        result = Downloader().resume(request, str(destination))
+
+        assert destination.read_binary() == self.BODY
+        assert result.size == len(self.BODY)
+
+    def test_interrupted_download_is_continued(self, destination, partial):
+        interrupted = make_response(b'', {'Content-Length': str(len(self.BODY))})
+        interrupted.raw = FailingStream(self.BODY)
+        request = mock.MagicMock(side_effect=[interrupted, make_partial_response(self.BODY, 1024, len(self.BODY))])
+
+        result = Downloader(chunk_size=1024).resume(request, str(destination))
+
+        assert request.call_args_list[1] == mock.call({'Accept-Encoding': 'identity', 'Range': 'bytes=1024-'})
+        assert destination.read_binary() == self.BODY
+        assert result.checksum == hashlib.sha256(self.BODY).hexdigest()
+
+    def test_truncated_body_is_continued(self, destination):
+        truncated = make_response(self.BODY[:3000], {'Content-Length': str(len(self.BODY))})
+        request = mock.MagicMock(side_effect=[truncated, make_partial_response(self.BODY, 3000, len(self.BODY))])
+
+        Downloader().resume(request, str(destination))
+
+        assert destination.read_binary() == self.BODY
+
+    def test_partial_file_is_kept_after_failure(self, destination, partial):
+        def request(headers):
+            start = int(headers.get('Range', 'bytes=0-')[6:-1])
+            response = make_partial_response(self.BODY, start, len(self.BODY))
+            response.raw = FailingStream(self.BODY[start:])
+            return response
+
+        with pytest.raises(requests.ConnectionError):
+            Downloader(chunk_size=1024).resume(request, str(destination), attempts=2)
+
+        assert not destination.exists()
+        assert partial.read_binary() == self.BODY[:2048]
+
+    def test_range_not_satisfiable(self, destination, partial):
+        partial.write_binary(self.BODY + b'stale')
+        error = make_response(b'')
+        error.status_code = 416
+        request = mock.MagicMock(side_effect=[RequestError('416', error), make_response(self.BODY)])
+
+        Downloader().resume(request, str(destination))
+
+        assert request.call_args_list[1] == mock.call({'Accept-Encoding': 'identity'})
+        assert destination.read_binary() == self.BODY
+
+    def test_partial_file_is_complete(self, destination, partial):
+        partial.write_binary(self.BODY)
+        error = make_response(b'', {'Content-Range': 'bytes */{}'.format(len(self.BODY))})
+        error.status_code = 416
+        request = mock.MagicMock(side_effect=RequestError('416', error))
+
+        result = Downloader().resume(request, str(destination))
+
+        request.assert_called_once_with({'Accept-Encoding': 'identity', 'Range': 'bytes={}-'.format(len(self.BODY))})
+        assert destination.read_binary() == self.BODY
+        assert not partial.exists()
+        assert result == DownloadResult(
+            size=len(self.BODY), checksum=hashlib.sha256(self.BODY).hexdigest(), algorithm='sha256'
+        )
+
+    def test_size_mismatch(self, destination, partial):
+        request = mock.MagicMock(return_value=make_response(self.BODY))
+
+        with pytest.raises(YagocdException):
+            Downloader().resume(request, str(destination), expected_size=len(self.BODY) - 1)
+
+        assert not destination.exists()
+        assert not partial.exists()
+
+    def test_body_is_not_ready(self, destination):
+        assert Downloader().resume(mock.MagicMock(return_value=None), str(destination)) is None
+        assert not destination.exists()
+
+
+class RangeServer(object):
+    """
+    Imitates server, which sends requested ranges of the body.
+    """
+
+    def __init__(self, body, ranges=True, failures=0):
+        self.body = body
+        self.ranges = ranges
+        self.failures = failures
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def __call__(self, headers):
+        header = headers.get('Range')
+        with self._lock:
+            self.requested.append(header)
+            fail = header != 'bytes=0-0' and self.failures > 0
+            if fail:
+                self.failures -= 1
+
+        if not self.ranges or header is None:
+            return make_response(self.body, {'Content-Length': str(len(self.body))})
+
+        first, last = header[len('bytes='):].split('-')
+        first, last = int(first), int(last) if last else len(self.body) - 1
+        response = make_partial_response(self.body[:last + 1], first, len(self.body))
+        if fail:
+            response.raw = FailingStream(self.body[first:last + 1])
+        return response
+
+
+class TestSegmented(object):
+    BODY = bytes(bytearray(range(256))) * 400
+
+    def test_ranges_are_written_in_place(self, tmpdir):
+        destination = tmpdir.join('artifact.bin')
+        server = RangeServer(self.BODY)
+
+        result = Downloader(chunk_size=1000).segmented(server, str(destination), segments=4, min_segment_size=1000)
+
+        assert destination.read_binary() == self.BODY
+        assert result == DownloadResult(
+            size=len(self.BODY), checksum=hashlib.sha256(self.BODY).hexdigest(), algorithm='sha256'
+        )
+        assert sorted(server.requested) == sorted([
+            'bytes=0-0', 'bytes=0-25599', 'bytes=25600-51199', 'bytes=51200-76799', 'bytes=76800-102399'
+        ])
+
+    def test_small_file_is_not_split(self, tmpdir):
+        server = RangeServer(self.BODY)
+
+        Downloader().segmented(server, str(tmpdir.join('artifact.bin')), segments=4)
+
+        assert server.requested == ['bytes=0-0', 'bytes=0-102399']
+
+    def test_ranges_are_not_supported(self, tmpdir):
+        destination = tmpdir.join('artifact.bin')
+        server = RangeServer(self.BODY, ranges=False)
+
+        result = Downloader().segmented(server, str(destination), segments=4, min_segment_size=1000)
+
+        assert server.requested == ['bytes=0-0']
+        assert destination.read_binary() == self.BODY
+        assert result.size == len(self.BODY)
+
+    def test_empty_file(self, tmpdir):
+        destination = tmpdir.join('artifact.bin')
+        error = make_response(b'')
+        error.status_code = 416
+        request = mock.MagicMock(side_effect=[RequestError('416', error), make_response(b'')])
+
+        result = Downloader().segmented(request, str(destination), segments=4)
+
+        assert destination.read_binary() == b''
+        assert result.size == 0
+
+    def test_interrupted_range_is_continued(self, tmpdir):
+        destination = tmpdir.join('artifact.bin')
+        server = RangeServer(self.BODY, failures=1)
+        progress = mock.MagicMock()
+
+        Downloader(chunk_size=1000, progress=progress).segmented(
+            server, str(destination), segments=2, min_segment_size=1000
+        )
+
+        assert destination.read_binary() == self.BODY
+        assert len(server.requested) == 4
+        assert progress.call_args == mock.call(len(self.BODY), len(self.BODY))
+
+    def test_failed_range_request_is_retried(self, tmpdir):
+        destination = tmpdir.join('artifact.bin')
+        server = RangeServer(self.BODY)
+        refused = []
+
+        def request(headers):
+            if headers['Range'] != 'bytes=0-0' and not refused:
+                refused.append(headers['Range'])
+                raise requests.ConnectionError('refused')
+            return server(headers)
+
+        Downloader(chunk_size=1000).segmented(request, str(destination), segments=2, min_segment_size=1000)
+
+        assert destination.read_binary() == self.BODY
+        assert refused[0] in server.requested
+
+    def test_failed_download_removes_file(self, tmpdir):
+        destination = tmpdir.join('artifact.bin')
+        server = RangeServer(self.BODY, failures=100)
+
+        with pytest.raises(requests.ConnectionError):
+            Downloader(chunk_size=1000).segmented(server, str(destination), segments=2, min_segment_size=1000)
+
+        assert not destination.exists()
+
+    def test_body_is_not_ready(self, tmpdir):
+        result = Downloader().segmented(mock.MagicMock(return_value=None), str(tmpdir.join('a.zip')), segments=2)
+        assert result is None
+
+
+class TestExtract(object):
+    FILES = {
+        'report.xml': b'<testsuite tests="1"/>' * 1000,
+        'lib/app.jar': bytes(bytearray(range(256))) * 400,
+    }
+
+    @pytest.fixture()
+    def archive(self):
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for name, content in sorted(self.FILES.items()):
+                archive.writestr(name, content)
+        return output.getvalue()
+
+    @pytest.mark.parametrize('spool_size', [Downloader.DEFAULT_SPOOL_SIZE, 1024])
+    def test_entries_are_extracted(self, tmpdir, archive, spool_size):
+        response = make_response(archive)
+        with mock.patch.object(response, 'close') as close_mock:
+            result = Downloader(chunk_size=1000).extract(response, str(tmpdir), spool_size=spool_size)
+
+        assert sorted(result) == sorted(str(tmpdir.join(name)) for name in self.FILES)
+        for name, content in self.FILES.items():
+            assert tmpdir.join(name).read_binary() == content
+        close_mock.assert_called_once_with()
+
+    def test_spool_is_moved_to_disk(self, tmpdir, archive):
+        with mock.patch('tempfile.SpooledTemporaryFile.rollover', autospec=True) as rollover_mock:
+            Downloader(chunk_size=1000).extract(make_response(archive), str(tmpdir), spool_size=1024)
+
+        assert rollover_mock.called
+
+    def test_names_are_sanitized(self, tmpdir):
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, 'w') as archive:
+            archive.writestr('../../escaped.txt', b'data')
+
+        Downloader().extract(make_response(output.getvalue()), str(tmpdir.join('target')))
+
+        assert tmpdir.join('target', 'escaped.txt').read_binary() == b'data'
+        assert not os.path.exists(str(tmpdir.join('..', 'escaped.txt')))
+
+    def test_not_an_archive(self, tmpdir):
+        with pytest.raises(YagocdException):
+            Downloader().extract(make_response(b'<html/>'), str(tmpdir))
@@ -26,11 +26,15 @@
 #
 ###############################################################################
 
+import io
+
 import pytest
+import requests
 from six import string_types
 
 from tests import AbstractTestManager, ReturnValueMixin
 from yagocd.resources import feed
+from yagocd.session import Session
 
 
 class BaseTestConfigurationManager(AbstractTestManager, ReturnValueMixin):
@@ -150,3 +154,187 @@ class TestJobStageById(BaseTestConfigurationManager):
     @pytest.fixture()
     def expected_request_url(self):
         return '/go/api/jobs/{0}.xml'.format(self.JOB_ID)
+
+
+class TestStageEntries(object):
+    @pytest.fixture()
+    def manager(self, session_fixture):
+        return feed.FeedManager(session=session_fixture)
+
+    @pytest.fixture(autouse=True)
+    def server_version(self, manager, my_vcr):
+        with my_vcr.use_cassette("server_version_cache/server_version_cache"):
+            return manager._session.server_version
+
+    def test_entries(self, manager, my_vcr):
+        with my_vcr.use_cassette("feed/stages") as cass:
+            entries = list(manager.stage_entries('Shared_Services', follow=None))
+            assert cass.play_count == 1
+
+        assert entries
+        for entry in entries:
+            assert isinstance(entry, feed.FeedEntry)
+            assert entry.data.title.startswith('Shared_Services(')
+            assert entry.data.id.startswith('http://localhost:8153/go/pipelines/Shared_Services/')
+            assert entry.data.updated
+            assert 'stage' in entry.data.categories
+            assert entry.link(media_type='text/html') == entry.data.id
+
+    def test_pipeline_names(self, manager, my_vcr):
+        with my_vcr.use_cassette("feed/pipelines"):
+            names = list(manager.pipeline_names())
+
+        assert 'Shared_Services' in names
+        assert 'Consumer_Website' in names
+
+    def test_unknown_page_link(self, manager):
+        with pytest.raises(ValueError):
+            manager.stage_entries('Shared_Services', follow='last')
+
+
+class TestEntriesPaging(object):
+    PAGES = {
+        'http://example.com/stages.xml': (None, 'http://example.com/stages.xml?before=2', [4, 3]),
+        'http://example.com/stages.xml?before=2': (
+            'http://example.com/stages.xml', 'http://example.com/stages.xml?before=0', [2, 1]
+        ),
+        'http://example.com/stages.xml?before=0': ('http://example.com/stages.xml?before=2', None, []),
+    }
+
+    @pytest.fixture()
+    def manager(self, mock_session):
+        def get(path, headers=None, stream=False, params=None):
+            assert stream
+            previous, following, counters = self.PAGES[path]
+            body = ['<feed xmlns="http://www.w3.org/2005/Atom">', '<link rel="self" href="{}"/>'.format(path)]
+            if previous:
+                body.append('<link rel="previous" href="{}"/>'.format(previous))
+            if following:
+                body.append('<link rel="next" href="{}"/>'.format(following))
+            for counter in counters:
+                body.append(
+                    '<entry><title>Pipeline({0})</title><id>http://example.com/{0}</id>'
+                    '<author><name>Go</name></author><category term="passed"/></entry>'.format(counter)
+                )
+            body.append('</feed>')
+
+            response = requests.Response()
+            response.status_code = 200
+            response.raw = io.BytesIO(''.join(body).encode('utf-8'))
+            return response
+
+        mock_session.get.side_effect = get
+        return feed.FeedManager(session=mock_session)
+
+    def test_next_pages_are_requested_lazily(self, manager, mock_session):
+        entries = manager.entries('http://example.com/stages.xml')
+
+        assert [next(entries).data.title for _ in range(2)] == ['Pipeline(4)', 'Pipeline(3)']
+        assert mock_session.get.call_count == 1
+
+        assert [entry.data.title for entry in entries] == ['Pipeline(2)', 'Pipeline(1)']
+        assert mock_session.get.call_count == 3
+
+    def test_previous_pages(self, manager):
+        entries = manager.entries('http://example.com/stages.xml?before=0', follow='previous')
+        assert [entry.data.id for entry in entries] == ['http://example.com/2', 'http://example.com/1'] + [
+            'http://example.com/4', 'http://example.com/3'
+        ]
+
+    def test_single_page(self, manager, mock_session):
+        entries = list(manager.entries('http://example.com/stages.xml', follow=None))
+
+        assert len(entries) == 2
+        assert entries[0].data.authors == ['Go']
+        assert mock_session.get.call_count == 1
+
+    def test_page_loop(self, manager, mock_session):
+        self.PAGES = dict(self.PAGES)
+        self.PAGES['http://example.com/stages.xml?before=0'] = (None, 'http://example.com/stages.xml', [])
+
+        assert len(list(manager.entries('http://example.com/stages.xml'))) == 4
+        assert mock_session.get.call_count == 3
+
+
+class TestDocumentEntries(object):
+    STAGE = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<stage name="Commit" counter="1">'
+        '<link rel="self" href="http://example.com/go/api/stages/11.xml"/>'
+        '<id><![CDATA[urn:x-go.studios.thoughtworks.com:stage-id:Shared_Services:3:Commit:1]]></id>'
+        '<pipeline name="Shared_Services" counter="3" label="3" href="http://example.com/go/api/pipelines/S/5.xml"/>'
+        '<updated>2015-08-05T15:24:15Z</updated>'
+        '<result>Passed</result>'
+        '<state>Completed</state>'
+        '<jobs>'
+        '<job href="http://example.com/go/api/jobs/11.xml"/><job href="http://example.com/go/api/jobs/12.xml"/>'
+        '</jobs>'
+        '</stage>'
+    )
+
+    JOB = (
+        '<job name="build">'
+        '<link rel="self" href="http://example.com/go/api/jobs/1.xml"/>'
+        '<result>Passed</result>'
+        '<properties><property name="cruise_job_duration"><![CDATA[10]]></property></properties>'
+        '</job>'
+    )
+
+    @pytest.fixture()
+    def manager(self, mock_session):
+        def get(path, headers=None, stream=False):
+            assert headers == {'Accept': 'application/xml'}
+            body = self.JOB if '/jobs/' in path else self.STAGE
+
+            response = requests.Response()
+            response.status_code = 200
+            response.encoding = 'utf-8'
+            if stream:
+                response.raw = io.BytesIO(body.encode('utf-8'))
+            else:
+                response._content = body.encode('utf-8')
+            return response
+
+        mock_session.base_api.return_value = 'http://example.com/go/api'
+        mock_session.urljoin.side_effect = Session.urljoin
+        mock_session.get.side_effect = get
+        return feed.FeedManager(session=mock_session)
+
+    def test_raw_document_by_default(self, manager):
+        assert manager.stage_by_id(11) == self.STAGE
+
+    def test_stage_by_id(self, manager, mock_session):
+        entry = manager.stage_by_id(11, parse=True)
+
+        assert isinstance(entry, feed.FeedEntry)
+        assert mock_session.get.call_args[1]['path'] == 'http://example.com/go/api/stages/11.xml'
+        assert entry.data.name == 'Commit'
+        assert entry.data.counter == '1'
+        assert entry.data.id == 'urn:x-go.studios.thoughtworks.com:stage-id:Shared_Services:3:Commit:1'
+        assert entry.data.result == 'Passed'
+        assert entry.data.pipeline.counter == '3'
+        assert [job.href for job in entry.data.jobs.job] == [
+            'http://example.com/go/api/jobs/11.xml', 'http://example.com/go/api/jobs/12.xml'
+        ]
+        assert entry.link('self') == 'http://example.com/go/api/stages/11.xml'
+
+    def test_stage(self, manager, mock_session):
+        mock_session.base_api.return_value = 'http://example.com/go'
+        entry = manager.stage('Shared_Services', 3, 'Commit', 1, parse=True)
+
+        assert mock_session.get.call_args[1]['path'] == 'http://example.com/go/pipelines/Shared_Services/3/Commit/1.xml'
+        assert entry.data.state == 'Completed'
+
+    def test_pipeline_by_id(self, manager, mock_session):
+        manager.pipeline_by_id(5, parse=True)
+
+        assert mock_session.get.call_args[1]['path'] == (
+            'http://example.com/go/api/pipelines/THIS_PARAMETER_IS_USELESS/5.xml'
+        )
+
+    def test_job_by_id(self, manager):
+        entry = manager.job_by_id(1, parse=True)
+
+        assert entry.data.name == 'build'
+        assert entry.data.properties.property[0].name == 'cruise_job_duration'
+        assert entry.data.properties.property[0].text == '10'
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+import random
+
+import mock
+import pytest
+
+from yagocd.graph import DependencyGraph
+from yagocd.resources import pipeline
+from yagocd.util import YagocdUtil
+
+
+def make_pipelines(session, edges):
+    names = sorted(set(edges) | set(name for parents in edges.values() for name in parents))
+    nodes = [
+        pipeline.PipelineEntity(
+            session=session,
+            data={'name': name, 'materials': [{'description': parent} for parent in edges.get(name, [])]}
+        )
+        for name in names
+    ]
+    return YagocdUtil.build_graph(
+        nodes=nodes,
+        dependencies=lambda parent: parent.data.materials,
+        node_key=lambda child: child.data.name,
+        dependency_key=lambda material: material.description
+    )
+
+
+def names(nodes):
+    return sorted(node.data.name for node in nodes)
+
+
+class TestDependencyGraph(object):
+    @pytest.fixture()
+    def nodes(self, mock_session):
+        # a <- b <- c <- d, c <-> e (cycle), f is isolated
+        return make_pipelines(mock_session, {'b': ['a'], 'c': ['b', 'e'], 'd': ['c'], 'e': ['c'], 'f': []})
+
+    @pytest.fixture()
+    def graph(self, nodes):
+        return DependencyGraph(nodes)
+
+    @staticmethod
+    def by_name(graph, name):
+        return next(node for node in graph.nodes if node.data.name == name)
+
+    def test_nodes_are_attached(self, graph, nodes):
+        assert all(node.graph is graph for node in nodes)
+        assert len(graph) == len(nodes)
+
+    def test_transitive_predecessors(self, graph):
+        assert names(graph.predecessors(self.by_name(graph, 'd'), transitive=True)) == ['a', 'b', 'c', 'e']
+        assert names(graph.predecessors(self.by_name(graph, 'b'), transitive=True)) == ['a']
+        assert graph.predecessors(self.by_name(graph, 'f'), transitive=True) == []
+
+    def test_transitive_descendants(self, graph):
+        assert names(graph.descendants(self.by_name(graph, 'a'), transitive=True)) == ['b', 'c', 'd', 'e']
+
+    def test_cycle_includes_node_itself(self, graph):
+        assert names(self.by_name(graph, 'c').get_predecessors(transitive=True)) == ['a', 'b', 'c', 'e']
+        assert names(self.by_name(graph, 'e').get_descendants(transitive=True)) == ['c', 'd', 'e']
+
+    def test_direct_links(self, graph):
+        node = self.by_name(graph, 'c')
+        assert graph.predecessors(node) is node.predecessors
+        assert graph.descendants(node) is node.descendants
+
+    def test_is_predecessor(self, graph):
+        a, d, f = [self.by_name(graph, name) for name in 'adf']
+        assert graph.is_predecessor(d, a)
+        assert not graph.is_predecessor(a, d)
+        assert graph.is_descendant(a, d)
+        assert not graph.is_predecessor(d, f)
+
+    def test_result_is_a_copy(self, graph):
+        node = self.by_name(graph, 'd')
+        graph.predecessors(node, transitive=True).append('garbage')
+        assert 'garbage' not in graph.predecessors(node, transitive=True)
+
+    def test_relinking_invalidates(self, graph):
+        a, b, f = [self.by_name(graph, name) for name in 'abf']
+        assert names(a.get_descendants(transitive=True)) == ['b', 'c', 'd', 'e']
+
+        b.predecessors = [f]
+        a.descendants = []
+        f.descendants = [b]
+
+        assert a.get_descendants(transitive=True) == []
+        assert names(f.get_descendants(transitive=True)) == ['b', 'c', 'd', 'e']
+
+    def test_not_listed_nodes_are_added(self, nodes):
+        graph = DependencyGraph([node for node in nodes if node.data.name == 'd'])
+        assert names(graph.nodes) == ['a', 'b', 'c', 'd', 'e']
+        assert names(graph.predecessors(graph.nodes[0], transitive=True)) == ['a', 'b', 'c', 'e']
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_same_as_walk(self, mock_session, seed):
+        rnd = random.Random(seed)
+        edges = dict(
+            ('p{}'.format(i), ['p{}'.format(rnd.randrange(60)) for _ in range(rnd.randint(0, 3))])
+            for i in range(60)
+        )
+        nodes = make_pipelines(mock_session, edges)
+        expected = [
+            (names(YagocdUtil.graph_depth_walk(node.predecessors, lambda v: v.predecessors)),
+             names(YagocdUtil.graph_depth_walk(node.descendants, lambda v: v.descendants)))
+            for node in nodes
+        ]
+
+        DependencyGraph(nodes)
+        actual = [
+            (names(node.get_predecessors(transitive=True)), names(node.get_descendants(transitive=True)))
+            for node in nodes
+        ]
+        assert actual == expected
+
+
+class TestPipelineManagerGraph(object):
+    @mock.patch('yagocd.resources.pipeline.PipelineManager.list')
+    def test_graph_is_built_from_list(self, list_mock, mock_session):
+        list_mock.return_value = make_pipelines(mock_session, {'b': ['a']})
+        graph = pipeline.PipelineManager(session=mock_session).graph()
+
+        list_mock.assert_called_once_with()
+        assert isinstance(graph, DependencyGraph)
+        assert names(graph.nodes) == ['a', 'b']
@@ -25,10 +25,17 @@
 # THE SOFTWARE.
 #
 ###############################################################################
+import copy
+import io
 
+import mock
 import pytest
+import requests
 
+from yagocd.client import Yagocd
+from yagocd.exception import RequestError, YagocdException
 from yagocd.resources import artifact, job, pipeline, property as prop, stage
+from yagocd.session import Session
 
 
 class TestJobInstance(object):
@@ -131,6 +138,7 @@ class TestJobInstance(object):
         assert job_fixture.artifacts is not None, "Fixture: {}".format(job_fixture_func.__name__)
         assert isinstance(job_fixture.artifacts, artifact.ArtifactManager), "Fixture: {}".format(
             job_fixture_func.__name__)
+        assert job_fixture.artifacts is job_fixture.artifacts, "Fixture: {}".format(job_fixture_func.__name__)
 
     @pytest.mark.parametrize("job_fixture_func", [
         job_instance_from_pipeline,
@@ -141,3 +149,139 @@ class TestJobInstance(object):
         job_fixture = job_fixture_func(self, my_vcr, session_fixture)
         assert job_fixture.properties is not None, "Fixture: {}".format(job_fixture_func.__name__)
         assert isinstance(job_fixture.properties, prop.PropertyManager), "Fixture: {}".format(job_fixture_func.__name__)
+
+
+class LogServer(object):
+    """
+    Serves console log, which content changes on every request.
+    """
+
+    def __init__(self, steps, ranges=True):
+        self.steps = list(steps)
+        self.ranges = ranges
+        self.requested = []
+
+    def __call__(self, path, headers=None, stream=False, params=None):
+        assert path.endswith('/files/Shared_Services/7/Commit/1/build/cruise-output/console.log')
+        assert stream
+
+        self.requested.append(headers['Range'])
+        content = self.steps.pop(0) if len(self.steps) > 1 else self.steps[0]
+        start = int(headers['Range'][len('bytes='):-1])
+
+        response = requests.Response()
+        response.status_code = 200
+        if content is None:
+            response.status_code = 404
+            raise RequestError(summary='not found', response=response)
+
+        if self.ranges:
+            if start >= len(content):
+                response.status_code = 416
+                raise RequestError(summary='not satisfiable', response=response)
+            response.status_code = 206
+            response.headers['Content-Range'] = 'bytes {}-{}/{}'.format(start, len(content) - 1, len(content))
+            content = content[start:]
+
+        response.raw = io.BytesIO(content)
+        return response
+
+
+class TestConsole(object):
+    @pytest.fixture()
+    def instance(self):
+        options = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
+        options['server'] = 'http://localhost:8153/'
+        data = dict(name='build', state='Building', pipeline_name='Shared_Services', pipeline_counter=7,
+                    stage_name='Commit', stage_counter='1')
+        return job.JobInstance(session=Session(auth=None, options=options), data=data, stage=None)
+
+    @pytest.fixture()
+    def sleep_mock(self):
+        with mock.patch('yagocd.resources.job.time.sleep') as sleep_mock:
+            yield sleep_mock
+
+    def read(self, instance, server, states=(), **kwargs):
+        with mock.patch.object(instance._session, 'get', side_effect=server):
+            with mock.patch.object(job.ConsoleLog, '_is_finished', side_effect=list(states)) as finished_mock:
+                lines = list(instance.console(**kwargs))
+        return lines, finished_mock
+
+    def test_read_once(self, instance, sleep_mock):
+        server = LogServer([b'first\r\nsecond\n\xd0\xbfartial'])
+
+        lines, finished_mock = self.read(instance, server, follow=False)
+
+        assert lines == ['first', 'second', u'\u043fartial']
+        assert server.requested == ['bytes=0-']
+        assert not finished_mock.called
+        assert not sleep_mock.called
+
+    def test_follow_until_completed(self, instance, sleep_mock):
+        server = LogServer([b'one\ntw', b'one\ntwo\n', b'one\ntwo\n', b'one\ntwo\n', b'one\ntwo\nthree\n'])
+
+        lines, finished_mock = self.read(instance, server, states=[False, True], interval=1, max_interval=3)
+
+        assert lines == ['one', 'two', 'three']
+        assert server.requested == ['bytes=0-', 'bytes=6-', 'bytes=8-', 'bytes=8-', 'bytes=8-']
+        # polling backs off while the log doesn't change and the rest is read after completion
+        assert [c[0][0] for c in sleep_mock.call_args_list] == [1, 1, 2]
+        assert finished_mock.call_count == 2
+
+    def test_log_is_not_created_yet(self, instance, sleep_mock):
+        server = LogServer([None, b'started\n'])
+
+        lines, _ = self.read(instance, server, states=[False, True])
+
+        assert lines == ['started']
+
+    def test_range_is_ignored(self, instance, sleep_mock):
+        server = LogServer([b'one\n', b'one\ntwo\n'], ranges=False)
+
+        lines, _ = self.read(instance, server, states=[True])
+
+        assert lines == ['one', 'two']
+        assert server.requested == ['bytes=0-', 'bytes=4-', 'bytes=8-', 'bytes=8-']
+
+    def test_completed_job_is_read_once(self, instance, sleep_mock):
+        instance.data.state = 'Completed'
+        server = LogServer([b'done\n'])
+
+        lines, finished_mock = self.read(instance, server)
+
+        assert lines == ['done']
+        assert len(server.requested) == 1
+        assert not finished_mock.called
+
+    def test_continue_from_offset(self, instance, sleep_mock):
+        server = LogServer([b'one\ntwo\nthr'])
+        with mock.patch.object(instance._session, 'get', side_effect=server):
+            console = instance.console(follow=False)
+            assert next(iter(console)) == 'one'
+
+        lines, _ = self.read(instance, LogServer([b'one\ntwo\nthree\n']), follow=False, offset=console.offset)
+
+        assert console.offset == 4
+        assert lines == ['two', 'three']
+
+    def test_unexpected_range(self, instance, sleep_mock):
+        response = requests.Response()
+        response.status_code = 206
+        response.headers['Content-Range'] = 'bytes 0-3/4'
+        response.raw = io.BytesIO(b'one\n')
+
+        with mock.patch.object(instance._session, 'get', return_value=response):
+            with pytest.raises(YagocdException):
+                list(job.ConsoleLog(instance, offset=2, follow=False))
+
+    def test_job_state(self, instance):
+        stage_instance = mock.MagicMock()
+        completed = job.JobInstance(instance._session, dict(name='build', state='Completed'), None)
+        stage_instance.job.return_value = completed
+
+        with mock.patch('yagocd.resources.stage.StageManager.get', return_value=stage_instance) as get_mock:
+            assert job.ConsoleLog(instance)._is_finished()
+
+        get_mock.assert_called_once_with(
+            pipeline_name='Shared_Services', pipeline_counter=7, stage_name='Commit', stage_counter='1'
+        )
@@ -26,11 +26,23 @@
 #
 ###############################################################################
 
+import copy
+import io
+import re
+import threading
+import time
+
+import mock
 import pytest
+import requests
 from six import string_types
 
 from tests import AbstractTestManager, ReturnValueMixin
+from yagocd.client import Yagocd
+from yagocd.exception import RequestError
 from yagocd.resources import job
+from yagocd.session import Session
+from yagocd.util import Since
 
 
 class BaseTestJobManager(AbstractTestManager):
@@ -113,3 +125,148 @@ class TestHistory(BaseTestJobManager, ReturnValueMixin):
             assert all(isinstance(i, job.JobInstance) for i in result)
 
         return check_value
+
+
+class TestFullHistory(object):
+    @mock.patch('yagocd.resources.job.JobManager.history')
+    def test_history_is_called(self, history_mock, mock_session):
+        history_mock.side_effect = [['foo', 'bar', 'baz'], []]
+
+        manager = job.JobManager(session=mock_session)
+        assert list(manager.full_history('pipeline', 'stage', 'job')) == ['foo', 'bar', 'baz']
+
+        calls = [mock.call('pipeline', 'stage', 'job', 0), mock.call('pipeline', 'stage', 'job', 3)]
+        history_mock.assert_has_calls(calls)
+
+    @mock.patch('yagocd.resources.job.JobManager.history')
+    def test_look_ahead(self, history_mock, mock_session):
+        pages = {0: ['foo', 'bar'], 2: ['baz']}
+        history_mock.side_effect = lambda pipeline_name, stage_name, job_name, offset: pages.get(offset, [])
+
+        manager = job.JobManager(session=mock_session, pipeline_name='pipeline', stage_name='stage', job_name='job')
+        assert list(manager.full_history(look_ahead=2)) == ['foo', 'bar', 'baz']
+
+
+class TestSearchConsole(object):
+    LOGS = {
+        1: b'Compiling\nTests passed\n',
+        2: b'Compiling\njava.lang.OutOfMemoryError: Java heap space\nat Foo\njava.lang.OutOfMemoryError: again\n',
+        3: None,
+        4: b'java.lang.OutOfMemoryError: GC overhead limit exceeded',
+    }
+
+    @pytest.yield_fixture(autouse=True)
+    def disable_since(self):
+        _original = Since.ENABLED
+        Since.ENABLED = False
+
+        yield
+        Since.ENABLED = _original
+
+    @pytest.fixture()
+    def manager(self):
+        options = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
+        options['server'] = 'http://localhost:8153/'
+        return job.JobManager(session=Session(auth=None, options=options))
+
+    @staticmethod
+    def job(manager, counter):
+        return job.JobInstance(manager._session, dict(
+            name='build', state='Completed', pipeline_name='Shared_Services', pipeline_counter=counter,
+            stage_name='Commit', stage_counter='1'
+        ), stage=None)
+
+    @pytest.fixture()
+    def jobs(self, manager):
+        return [self.job(manager, counter) for counter in sorted(self.LOGS, reverse=True)]
+
+    @pytest.fixture()
+    def get_mock(self, manager):
+        requested = []
+        lock = threading.Lock()
+
+        def get(path, headers=None, stream=False, params=None):
+            counter = int(re.search(r'/Shared_Services/(\d+)/', path).group(1))
+            with lock:
+                requested.append(counter)
+
+            response = requests.Response()
+            response.status_code = 200
+            if self.LOGS[counter] is None:
+                response.status_code = 404
+                raise RequestError(summary='not found', response=response)
+            response.raw = io.BytesIO(self.LOGS[counter])
+            return response
+
+        with mock.patch.object(manager._session, 'get', side_effect=get) as get_mock:
+            get_mock.requested = requested
+            yield get_mock
+
+    def test_matches(self, manager, jobs, get_mock):
+        result = list(manager.search_console(jobs, 'OutOfMemoryError: (.*)', workers=2))
+
+        assert [(m.locator, m.line_number, m.match.group(1)) for m in result] == [
+            ('Shared_Services/4/Commit/1/build', 1, 'GC overhead limit exceeded'),
+            ('Shared_Services/2/Commit/1/build', 2, 'Java heap space'),
+            ('Shared_Services/2/Commit/1/build', 4, 'again'),
+        ]
+        assert result[0].job is jobs[0]
+        assert sorted(get_mock.requested) == [1, 2, 3, 4]
+
+    def test_first_match_only(self, manager, jobs, get_mock):
+        result = list(manager.search_console(jobs, re.compile('outofmemory', re.IGNORECASE), first=True))
+
+        assert [(m.job.pipeline_counter, m.line_number) for m in result] == [(4, 1), (2, 2)]
+
+    def test_flags(self, manager, jobs, get_mock):
+        result = manager.search_console(jobs, 'tests PASSED', flags=re.IGNORECASE)
+
+        assert [m.locator for m in result] == ['Shared_Services/1/Commit/1/build']
+
+    def test_jobs_are_consumed_lazily(self, manager, jobs, get_mock):
+        consumed = []
+
+        def history():
+            for instance in jobs * 10:
+                consumed.append(instance)
+                yield instance
+
+        result = manager.search_console(history(), 'OutOfMemoryError', workers=1)
+        next(result)
+        result.close()
+
+        assert len(consumed) <= 3
+
+    def test_matches_are_not_accumulated(self, manager, jobs, get_mock):
+        self.LOGS[5] = b'line\n' * 1000
+        created = []
+
+        class CountingMatch(job.ConsoleMatch):
+            def __init__(self, *args):
+                created.append(args[1])
+                super(CountingMatch, self).__init__(*args)
+
+        try:
+            with mock.patch.object(manager, 'SEARCH_QUEUE_SIZE', 5):
+                with mock.patch.object(job, 'ConsoleMatch', CountingMatch):
+                    result = manager.search_console([jobs[0], self.job(manager, 5)], '.*', workers=2)
+                    first = next(result)
+                    time.sleep(0.3)
+                    queued = len(created)
+                    rest = list(result)
+        finally:
+            del self.LOGS[5]
+
+        assert first.line_number == 1
+        # one taken by the consumer, a full queue and one waiting to be put for each log
+        assert queued <= 2 * (5 + 2)
+        assert len(rest) == 1000
+        assert [m.line_number for m in rest[1:4]] == [2, 3, 4]
+
+    def test_error_is_raised_after_matches(self, manager, jobs, get_mock):
+        # log of unknown job fails with KeyError
+        result = manager.search_console([jobs[2], self.job(manager, 99)], 'Java heap space')
+
+        assert next(result).line_number == 2
+        with pytest.raises(KeyError):
+            next(result)
@@ -36,7 +36,7 @@ from yagocd.resources.pipeline_config import PipelineConfigManager
 
 class TestPipelineEntity(object):
     def test_has_all_managers_methods(self):
-        excludes = ['list', 'find']
+        excludes = ['list', 'find', 'graph', 'shared']
 
         def get_public_methods(klass):
             methods = set()
@@ -71,9 +71,24 @@ class TestPipelineEntity(object):
     def test_entity_is_not_none(self, pipeline_entity):
         assert pipeline_entity is not None
 
+    def test_manager_is_shared(self, pipeline_entity, mock_session):
+        other = pipeline.PipelineEntity(session=mock_session, data={'name': 'pipeline_2'})
+        instance = pipeline.PipelineInstance(session=mock_session, data={'name': 'pipeline_2'})
+
+        assert other._pipeline is pipeline_entity._pipeline
+        assert instance._manager is pipeline_entity._pipeline
+        assert pipeline_entity._pipeline is pipeline.PipelineManager.shared(mock_session)
+
+    def test_manager_is_not_shared_between_sessions(self, pipeline_entity):
+        other = pipeline.PipelineEntity(session=mock.MagicMock(), data={'name': 'pipeline_2'})
+        assert other._pipeline is not pipeline_entity._pipeline
+
     def test_is_instance_of_base(self, pipeline_entity):
         assert isinstance(pipeline_entity, Base)
 
+    def test_has_no_instance_dict(self, pipeline_entity):
+        assert not hasattr(pipeline_entity, '__dict__')
+
     def test_reading_group(self, pipeline_entity):
         assert pipeline_entity.group == 'baz'
 
@@ -163,7 +178,7 @@ class TestPipelineEntity(object):
     def test_iterator_access(self, full_history_mock, pipeline_entity):
         for _ in pipeline_entity:
             pass
-        full_history_mock.assert_called_once_with(name=pipeline_entity.data.name)
+        full_history_mock.assert_called_once_with(name=pipeline_entity.data.name, look_ahead=0)
 
     def test_get_url(self, pipeline_entity):
         assert (
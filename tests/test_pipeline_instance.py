@@ -60,6 +60,9 @@ class TestPipelineEntity(object):
     def test_is_instance_of_base(self, pipeline_instance):
         assert isinstance(pipeline_instance, Base)
 
+    def test_has_no_instance_dict(self, pipeline_instance):
+        assert not hasattr(pipeline_instance, '__dict__')
+
     def test_getting_name(self, pipeline_instance):
         assert pipeline_instance.data.name == 'Shared_Services'
 
@@ -178,6 +178,15 @@ class TestFullHistory(BaseTestPipelineManager):
         calls = [mock.call(name, 0), mock.call(name, 3)]
         history_mock.assert_has_calls(calls)
 
+    @mock.patch('yagocd.resources.pipeline.PipelineManager.history')
+    def test_look_ahead(self, history_mock, mock_manager):
+        pages = {0: ['foo', 'bar'], 2: ['baz', 'qux'], 4: ['quux']}
+        history_mock.side_effect = lambda name, offset: pages.get(offset, [])
+
+        assert list(mock_manager.full_history("Consumer_Website", look_ahead=3)) == [
+            'foo', 'bar', 'baz', 'qux', 'quux'
+        ]
+
 
 class TestLast(BaseTestPipelineManager):
     @mock.patch('yagocd.resources.pipeline.PipelineManager.history')
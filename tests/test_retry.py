@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+import copy
+import time
+from email.utils import formatdate
+
+import mock
+import pytest
+import requests
+
+from yagocd import Yagocd
+from yagocd.exception import RequestError
+from yagocd.retry import RetryPolicy
+from yagocd.session import Session
+from yagocd.upload import MultipartStream
+
+
+def make_response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = requests.status_codes._codes[status_code][0].upper()
+    response.headers.update(headers or {})
+    response._content = b'{}'
+    response._content_consumed = True
+    response.url = 'http://example.com/go/api/pipelines/foo/history'
+    return response
+
+
+class TestRetryPolicy(object):
+    @pytest.mark.parametrize('method, status, expected', [
+        ('GET', 503, True),
+        ('get', 502, True),
+        ('PUT', 504, True),
+        ('DELETE', 429, True),
+        ('POST', 503, False),
+        ('PATCH', 503, False),
+        ('GET', 500, False),
+        ('GET', 404, False),
+    ])
+    def test_is_retryable_response(self, method, status, expected):
+        assert RetryPolicy().is_retryable(method, response=make_response(status)) is expected
+
+    @pytest.mark.parametrize('error, expected', [
+        (requests.ConnectionError(), True),
+        (requests.Timeout(), True),
+        (requests.TooManyRedirects(), False),
+    ])
+    def test_is_retryable_error(self, error, expected):
+        assert RetryPolicy().is_retryable('GET', error=error) is expected
+
+    def test_exponential_backoff(self):
+        policy = RetryPolicy(total=10, backoff_factor=0.5, max_backoff=3, jitter=False)
+        policy.start()
+        delays = [policy.backoff('GET', attempt, response=make_response(503)) for attempt in range(5)]
+        assert delays == [0.5, 1, 2, 3, 3]
+
+    def test_jitter(self):
+        policy = RetryPolicy(total=100, backoff_factor=1, min_budget=100)
+        delays = [policy.backoff('GET', 3, response=make_response(503)) for _ in range(50)]
+        assert all(0 <= delay <= 8 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_total(self):
+        policy = RetryPolicy(total=2)
+        policy.start()
+        assert policy.backoff('GET', 1, response=make_response(503)) is not None
+        assert policy.backoff('GET', 2, response=make_response(503)) is None
+        assert policy.stats['given_up'] == 1
+
+    @pytest.mark.parametrize('header, expected', [
+        ('7', 7.0),
+        (' 0 ', 0.0),
+        ('garbage', None),
+    ])
+    def test_retry_after(self, header, expected):
+        assert RetryPolicy.retry_after(make_response(503, {'Retry-After': header})) == expected
+
+    def test_retry_after_date(self):
+        header = formatdate(time.time() + 20, usegmt=True)
+        assert 15 < RetryPolicy.retry_after(make_response(503, {'Retry-After': header})) <= 20
+
+    def test_retry_after_is_respected(self):
+        policy = RetryPolicy(jitter=False)
+        assert policy.backoff('GET', 0, response=make_response(503, {'Retry-After': '4'})) == 4
+
+    def test_too_long_retry_after_is_not_waited(self):
+        policy = RetryPolicy(max_backoff=10)
+        assert policy.backoff('GET', 0, response=make_response(503, {'Retry-After': '60'})) is None
+
+    def test_budget(self):
+        policy = RetryPolicy(total=100, budget=0.5, min_budget=1)
+        for _ in range(4):
+            policy.start()
+
+        delays = [policy.backoff('GET', 0, response=make_response(503)) for _ in range(5)]
+        assert [delay is not None for delay in delays] == [True, True, True, False, False]
+        assert policy.stats['budget_exhausted'] == 2
+
+    def test_stats(self):
+        policy = RetryPolicy()
+        policy.start()
+        policy.backoff('GET', 0, response=make_response(503))
+        policy.backoff('GET', 1, error=requests.ConnectionError())
+        policy.finish(3, success=True)
+
+        stats = policy.stats
+        assert stats['requests'] == 1
+        assert stats['retries'] == 2
+        assert stats['recovered'] == 1
+        assert stats['reasons'] == {503: 1, 'ConnectionError': 1}
+        assert stats['retry_rate'] == 2.0
+
+
+class TestSessionRetry(object):
+    @pytest.fixture()
+    def session(self):
+        options = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
+        options['server'] = 'http://example.com'
+        options['retry'] = RetryPolicy(jitter=False)
+        return Session(auth=None, options=options)
+
+    @pytest.fixture()
+    def request_mock(self, session):
+        with mock.patch.object(session._session, 'request') as request_mock:
+            yield request_mock
+
+    @pytest.fixture()
+    def sleep_mock(self):
+        with mock.patch('yagocd.session.time.sleep') as sleep_mock:
+            yield sleep_mock
+
+    def test_disabled_by_default(self):
+        assert Yagocd().retry is None
+
+    def test_enabled(self):
+        assert isinstance(Yagocd(options={'retry': True}).retry, RetryPolicy)
+
+    def test_retries_until_success(self, session, request_mock, sleep_mock):
+        request_mock.side_effect = [make_response(503), make_response(502), make_response(200)]
+
+        response = session.get('go/api/pipelines/foo/history')
+
+        assert response.status_code == 200
+        assert request_mock.call_count == 3
+        assert sleep_mock.call_args_list == [mock.call(0.5), mock.call(1)]
+        assert session.retry.stats['recovered'] == 1
+
+    def test_connection_error(self, session, request_mock, sleep_mock):
+        request_mock.side_effect = [requests.ConnectionError('reset'), make_response(200)]
+        assert session.get('go/api/pipelines/foo/history').status_code == 200
+
+    def test_gives_up(self, session, request_mock, sleep_mock):
+        request_mock.side_effect = lambda **kwargs: make_response(503)
+
+        with pytest.raises(RequestError):
+            session.get('go/api/pipelines/foo/history')
+
+        assert request_mock.call_count == 4
+        assert session.retry.stats['given_up'] == 1
+
+    def test_connection_error_is_raised_after_retries(self, session, request_mock, sleep_mock):
+        request_mock.side_effect = requests.ConnectionError('reset')
+
+        with pytest.raises(requests.ConnectionError):
+            session.get('go/api/pipelines/foo/history')
+
+        assert request_mock.call_count == 4
+
+    def test_post_is_not_retried(self, session, request_mock, sleep_mock):
+        request_mock.return_value = make_response(503)
+
+        with pytest.raises(RequestError):
+            session.post('go/api/pipelines/foo/schedule')
+
+        assert request_mock.call_count == 1
+        assert not sleep_mock.called
+
+    def test_files_are_not_retried(self, session, request_mock, sleep_mock):
+        request_mock.return_value = make_response(503)
+
+        with pytest.raises(RequestError):
+            session.put('go/files/foo/1/bar/1/baz/file.txt', files={'file': object()})
+
+        assert request_mock.call_count == 1
+
+    def test_streamed_bodies_are_not_retried(self, session, request_mock, sleep_mock):
+        request_mock.return_value = make_response(503)
+
+        with pytest.raises(RequestError):
+            session.put('go/files/foo/1/bar/1/baz/file.txt', data=MultipartStream(iter([b'data'])))
+
+        assert request_mock.call_count == 1
+
+    def test_bytes_are_retried(self, session, request_mock, sleep_mock):
+        request_mock.side_effect = [make_response(503), make_response(200)]
+
+        session.put('go/files/foo/1/bar/1/baz/file.txt', data=b'data')
+
+        assert request_mock.call_count == 2
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import mock
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from yagocd.client import Yagocd
+from yagocd.session import Session
+
+
+class CustomAdapter(HTTPAdapter):
+    pass
+
+
+@pytest.fixture()
+def make_session():
+    def make(**kwargs):
+        options = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
+        options.update(kwargs)
+        return Session(auth=None, options=options)
+
+    return make
+
+
+class TestPool(object):
+    @pytest.mark.parametrize('prefix', ['http://', 'https://'])
+    def test_adapters_use_options(self, make_session, prefix):
+        session = make_session(pool_connections=3, pool_maxsize=25, pool_block=True)
+        adapter = session._session.adapters[prefix]
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 25
+        assert adapter._pool_block is True
+
+    def test_defaults(self, make_session):
+        session = make_session()
+        assert session.pool == dict(pool_connections=10, pool_maxsize=10, pool_block=False)
+        assert session._session.headers['Connection'] == 'keep-alive'
+
+    def test_missing_options(self):
+        session = Session(auth=None, options={'server': 'http://example.com'})
+        assert session.pool == dict(pool_connections=10, pool_maxsize=10, pool_block=False)
+
+    def test_configure_keeps_omitted_settings(self, make_session):
+        session = make_session(pool_connections=3, pool_block=True)
+        previous = session._session.adapters['http://']
+
+        with mock.patch.object(previous, 'close') as close_mock:
+            session.configure_pool(pool_maxsize=50)
+
+        close_mock.assert_called_once_with()
+        assert session.pool == dict(pool_connections=3, pool_maxsize=50, pool_block=True)
+        assert session._session.adapters['http://']._pool_maxsize == 50
+
+    def test_configure_keeps_custom_adapter(self, make_session):
+        session = make_session()
+        custom = CustomAdapter()
+        session.mount('https://', custom)
+
+        session.configure_pool(pool_maxsize=50)
+
+        assert session._session.adapters['https://'] is custom
+        assert session._session.adapters['http://']._pool_maxsize == 50
+
+    def test_keep_alive_disabled(self, make_session):
+        session = make_session(keep_alive=False)
+        assert session._session.headers['Connection'] == 'close'
+
+
+class TestOperationPool(object):
+    @pytest.fixture()
+    def transports(self, make_session):
+        session = make_session(server='http://example.com')
+        used = list()
+
+        def request(transport, **kwargs):
+            used.append(transport)
+            response = requests.Response()
+            response.status_code = 200
+            return response
+
+        with mock.patch('requests.Session.request', autospec=True, side_effect=request):
+            yield session, used
+
+    def test_small_operation_uses_session_pool(self, transports):
+        session, used = transports
+        func = mock.MagicMock()
+
+        with session.pooled(10) as pool:
+            assert pool.bind(func) is func
+
+    def test_large_operation_takes_separate_adapter(self, transports):
+        session, used = transports
+        adapters = dict(session._session.adapters)
+
+        with session.pooled(32) as pool:
+            fetch = pool.bind(lambda: session.get('go/api/agents'))
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda _: fetch(), range(4)))
+            session.get('go/api/agents')
+
+        transport = used[0]
+        assert used == [transport] * 4 + [session._session]
+        assert transport.adapters['http://']._pool_maxsize == 32
+        assert transport.adapters['http://']._pool_block == session.pool['pool_block']
+        assert session._session.adapters == adapters
+        assert session.pool['pool_maxsize'] == 10
+
+    def test_retries_of_adapter_are_kept(self, transports):
+        session, used = transports
+        session.mount('http://', HTTPAdapter(max_retries=3))
+
+        with session.pooled(32) as pool:
+            pool.bind(lambda: session.get('go/api/agents'))()
+
+        assert used[0].adapters['http://'].max_retries.total == 3
+        assert used[0].adapters['http://']._pool_maxsize == 32
+
+    @pytest.mark.parametrize('prefix', ['https://', 'https://go.example.com'])
+    def test_custom_adapter_is_not_bypassed(self, transports, prefix):
+        session, used = transports
+        session.mount(prefix, CustomAdapter())
+        func = mock.MagicMock()
+
+        with session.pooled(32) as pool:
+            assert pool.bind(func) is func
+
+    def test_adapter_is_closed_after_running_callables(self, transports):
+        session, used = transports
+        started = threading.Event()
+        release = threading.Event()
+
+        def fetch():
+            started.set()
+            release.wait(5)
+            return session.get('go/api/agents')
+
+        pool = session.pooled(32)
+        bound = pool.bind(fetch)
+        thread = threading.Thread(target=bound)
+        thread.start()
+        started.wait(5)
+
+        with mock.patch('requests.Session.close', autospec=True) as close_mock:
+            pool.close()
+            pool.close()
+            assert close_mock.call_count == 0
+
+            release.set()
+            thread.join(5)
+            close_mock.assert_called_once_with(used[0])
+
+        # callables, started after the pool is closed, use the session
+        bound()
+        assert used[1] is session._session
+
+
+class TestServerVersion(object):
+    def test_requested_once_from_many_threads(self, make_session):
+        session = make_session()
+        calls = list()
+
+        def version():
+            calls.append(threading.current_thread())
+            time.sleep(0.05)
+            return '17.3.0'
+
+        with mock.patch('yagocd.resources.info.InfoManager.version', new_callable=mock.PropertyMock) as version_mock:
+            version_mock.side_effect = version
+            results = list()
+            threads = [threading.Thread(target=lambda: results.append(session.server_version)) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert results == ['17.3.0'] * 8
+        assert len(calls) == 1
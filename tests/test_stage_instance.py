@@ -25,12 +25,16 @@
 # THE SOFTWARE.
 #
 ###############################################################################
+import copy
 import re
 
 import mock
 import pytest
 
-from yagocd.resources import job, pipeline, stage
+from yagocd.client import Yagocd
+from yagocd.resources import artifact, job, pipeline, stage
+from yagocd.session import Session
+from yagocd.util import Since
 
 
 class TestStageInstance(object):
@@ -118,3 +122,98 @@ class TestStageInstance(object):
 
         result = stage_instance_from_pipeline.job(name='baz')
         assert result == baz
+
+    def test_completed_from_stage(self, stage_instance_from_stage_history):
+        assert stage_instance_from_stage_history.completed is (
+            stage_instance_from_stage_history.data.result in stage.StageResult.FINAL
+        )
+
+    @pytest.mark.parametrize('result, expected', [
+        (stage.StageResult.Passed, True),
+        (stage.StageResult.Failed, True),
+        (stage.StageResult.Cancelled, True),
+        (stage.StageResult.Unknown, False),
+        (None, False),
+    ])
+    def test_completed(self, mock_session, result, expected):
+        instance = stage.StageInstance(session=mock_session, data={'result': result}, pipeline=None)
+        assert instance.completed is expected
+
+
+class TestArtifactSearch(object):
+    @pytest.yield_fixture(autouse=True)
+    def disable_since(self):
+        _original = Since.ENABLED
+        Since.ENABLED = False
+
+        yield
+        Since.ENABLED = _original
+
+    @pytest.fixture()
+    def instance(self):
+        options = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
+        options['server'] = 'http://localhost:8153/'
+        data = dict(name='Commit', counter='1', pipeline_name='Shared_Services', pipeline_counter=7,
+                    jobs=[dict(name='unit'), dict(name='integration'), dict(name='lint')])
+        return stage.StageInstance(session=Session(auth=None, options=options), data=data, pipeline=None)
+
+    @pytest.fixture()
+    def list_mock(self, instance):
+        def make(job_name, name):
+            return artifact.Artifact(instance._session, dict(
+                name='test-reports', type='folder', files=[dict(
+                    name=name, type='file',
+                    url='http://localhost:8153/go/files/Shared_Services/7/Commit/1/{}/test-reports/{}'.format(
+                        job_name, name)
+                )],
+                url='http://localhost:8153/go/files/Shared_Services/7/Commit/1/{}/test-reports'.format(job_name)
+            ))
+
+        def list_artifacts(**kwargs):
+            names = {'unit': 'unit.xml', 'integration': 'integration.xml', 'lint': 'lint.txt'}
+            return [make(kwargs['job_name'], names[kwargs['job_name']])]
+
+        with mock.patch('yagocd.resources.artifact.ArtifactManager.list', side_effect=list_artifacts) as list_mock:
+            yield list_mock
+
+    def test_glob_artifacts(self, instance, list_mock):
+        result = instance.glob_artifacts('test-reports/*.xml', workers=2)
+
+        assert [(a.job_name, a.path) for a in result] == [
+            ('unit', '/test-reports/unit.xml'), ('integration', '/test-reports/integration.xml')
+        ]
+        assert list_mock.call_count == 3
+
+    def test_find_artifacts(self, instance, list_mock):
+        result = list(instance.find_artifacts(lambda a: a.data.name.startswith('lint')))
+
+        assert [a.path for a in result] == ['/test-reports/lint.txt']
+
+    def test_listings_are_cached(self, instance, list_mock):
+        list(instance.glob_artifacts('**'))
+        list(instance.glob_artifacts('**'))
+
+        assert list_mock.call_count == 3
+
+    def test_listings_are_fetched_through_pool(self, instance, list_mock):
+        with mock.patch.object(instance._session, 'pooled', wraps=instance._session.pooled) as pooled_mock:
+            list(instance.glob_artifacts('**', workers=32))
+
+        pooled_mock.assert_called_once_with(32)
+        assert list_mock.call_count == 3
+
+    def test_listings_are_fetched_lazily(self, instance, list_mock):
+        instance.glob_artifacts('**')
+        assert list_mock.call_count == 0
+
+    def test_artifact_directories(self, instance):
+        def directory(path, job_name, **kwargs):
+            return None if job_name == 'unit' and not directory_mock.call_args_list[3:] else job_name.encode('utf-8')
+
+        with mock.patch('yagocd.resources.artifact.ArtifactManager.directory', side_effect=directory) as directory_mock:
+            result = list(instance.artifact_directories('test-reports', backoff=0.01, workers=1))
+
+        assert [(job.data.name, content) for job, content in result] == [
+            ('integration', b'integration'), ('lint', b'lint'), ('unit', b'unit')
+        ]
+        assert directory_mock.call_args[1]['pipeline_name'] == 'Shared_Services'
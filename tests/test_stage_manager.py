@@ -185,6 +185,14 @@ class TestFullHistory(BaseTestStageManager):
         calls = [mock.call(self.PIPELINE_NAME, self.STAGE_NAME, 0), mock.call(self.PIPELINE_NAME, self.STAGE_NAME, 3)]
         history_mock.assert_has_calls(calls)
 
+    @mock.patch('yagocd.resources.stage.StageManager.history')
+    def test_look_ahead(self, history_mock, mock_manager):
+        pages = {0: ['foo', 'bar'], 2: ['baz']}
+        history_mock.side_effect = lambda pipeline_name, stage_name, offset: pages.get(offset, [])
+
+        result = list(mock_manager.full_history(self.PIPELINE_NAME, self.STAGE_NAME, look_ahead=2))
+        assert result == ['foo', 'bar', 'baz']
+
 
 class TestLast(BaseTestStageManager):
     @mock.patch('yagocd.resources.stage.StageManager.history')
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+import mock
+import pytest
+
+from yagocd.resources import pipeline
+from yagocd.resources.stage import StageResult
+from yagocd.store import PipelineHistoryStore
+
+
+class FakeServer(object):
+    PAGE_SIZE = 3
+
+    def __init__(self, session):
+        self._session = session
+        self.instances = dict()
+        self.requested = list()
+
+    def add(self, counter, result=StageResult.Passed):
+        self.instances[counter] = {
+            'name': 'Shared_Services',
+            'counter': counter,
+            'stages': [{'name': 'Commit', 'result': result}],
+        }
+
+    def history(self, name, offset=0):
+        self.requested.append(offset)
+        counters = sorted(self.instances, reverse=True)[offset:offset + self.PAGE_SIZE]
+        return [pipeline.PipelineInstance(session=self._session, data=self.instances[c]) for c in counters]
+
+    def get(self, name, counter):
+        return pipeline.PipelineInstance(session=self._session, data=self.instances[counter])
+
+
+class TestPipelineHistoryStore(object):
+    NAME = 'Shared_Services'
+
+    @pytest.fixture()
+    def server(self, mock_session):
+        server = FakeServer(mock_session)
+        for counter in range(1, 11):
+            server.add(counter)
+        return server
+
+    @pytest.fixture()
+    def store(self, mock_session, server, tmpdir):
+        with mock.patch.object(pipeline.PipelineManager, 'history', side_effect=server.history):
+            with mock.patch.object(pipeline.PipelineManager, 'get', side_effect=server.get):
+                store = PipelineHistoryStore(
+                    manager=pipeline.PipelineManager(session=mock_session),
+                    path=str(tmpdir.join('history.db'))
+                )
+                yield store
+                store.close()
+
+    def test_first_sync_downloads_everything(self, store, server):
+        assert store.sync(self.NAME) == 10
+        assert store.counters(self.NAME) == list(range(10, 0, -1))
+        assert server.requested == [0, 3, 6, 9, 10]
+
+    def test_incremental_sync_stops_at_known_instance(self, store, server):
+        store.sync(self.NAME)
+        server.add(11)
+        server.add(12)
+        server.requested = list()
+
+        assert store.sync(self.NAME) == 2
+        assert server.requested == [0]
+        assert store.counters(self.NAME)[:3] == [12, 11, 10]
+
+    def test_instance_fetched_by_get_does_not_stop_sync(self, store, server):
+        store.sync(self.NAME)
+        for counter in range(11, 17):
+            server.add(counter)
+
+        store.get(self.NAME, 15)
+        assert store.sync(self.NAME) == 6
+
+        assert store.counters(self.NAME) == list(range(16, 0, -1))
+
+        server.add(17)
+        server.requested = list()
+        assert store.sync(self.NAME) == 1
+        assert server.requested == [0]
+
+    def test_running_instances_are_refreshed(self, store, server):
+        server.add(9, result=StageResult.Unknown)
+        store.sync(self.NAME)
+
+        server.add(9, result=StageResult.Failed)
+        server.add(11)
+        server.requested = list()
+
+        assert store.sync(self.NAME) == 3
+        assert server.requested == [0, 3]
+        assert store.history(self.NAME)[2].data.stages[0].result == StageResult.Failed
+
+    def test_interrupted_sync_is_continued(self, store, server):
+        with mock.patch.object(pipeline.PipelineManager, 'history', side_effect=[server.history(self.NAME), KeyError]):
+            with pytest.raises(KeyError):
+                store.sync(self.NAME)
+
+        assert store.counters(self.NAME) == [10, 9, 8]
+        assert store.sync(self.NAME) == 10
+        assert len(store.counters(self.NAME)) == 10
+
+    def test_full_sync(self, store, server):
+        store.sync(self.NAME)
+        assert store.sync(self.NAME, full=True) == 10
+
+    def test_history_pages(self, store):
+        store.sync(self.NAME)
+        page = store.history(self.NAME, offset=8)
+
+        assert all(isinstance(i, pipeline.PipelineInstance) for i in page)
+        assert [i.data.counter for i in page] == [2, 1]
+
+    def test_full_history(self, store):
+        store.sync(self.NAME, look_ahead=2)
+        assert [i.data.counter for i in store.full_history(self.NAME)] == list(range(10, 0, -1))
+
+    def test_get_is_served_locally(self, store, server):
+        store.sync(self.NAME)
+        with mock.patch.object(pipeline.PipelineManager, 'get') as get_mock:
+            assert store.get(self.NAME, 5).data.counter == 5
+            assert not get_mock.called
+
+    def test_get_missing_is_fetched(self, store, server):
+        assert store.get(self.NAME, 5).data.counter == 5
+        assert store.counters(self.NAME) == [5]
+
+    def test_data_is_persisted(self, store, server, mock_session, tmpdir):
+        store.sync(self.NAME)
+        manager = pipeline.PipelineManager(session=mock_session)
+        with PipelineHistoryStore(manager=manager, path=str(tmpdir.join('history.db'))) as other:
+            assert other.counters(self.NAME) == list(range(10, 0, -1))
+
+
+class TestCompleted(object):
+    @pytest.mark.parametrize('results, expected', [
+        ([StageResult.Passed, StageResult.Failed], True),
+        ([StageResult.Passed, StageResult.Cancelled], True),
+        ([StageResult.Passed, StageResult.Unknown], False),
+        ([], False),
+    ])
+    def test_pipeline_instance(self, mock_session, results, expected):
+        instance = pipeline.PipelineInstance(
+            session=mock_session,
+            data={'stages': [{'result': result} for result in results]}
+        )
+        assert instance.completed is expected
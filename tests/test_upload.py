@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+import array
+import io
+import zipfile
+
+import mock
+import pytest
+import six
+
+from yagocd.exception import YagocdException
+from yagocd.resources import artifact
+from yagocd.upload import MultipartStream, ZipStream
+
+
+def body_of(stream):
+    return b''.join(bytes(chunk) for chunk in stream)
+
+
+def expected_body(stream, content, filename=b'file'):
+    boundary = stream.content_type.split('boundary=')[1].encode('utf-8')
+    return b''.join([
+        b'--', boundary, b'\r\n',
+        b'Content-Disposition: form-data; name="file"; filename="', filename, b'"\r\n',
+        b'Content-Type: application/octet-stream\r\n\r\n',
+        content,
+        b'\r\n--', boundary, b'--\r\n',
+    ])
+
+
+class TestMultipartStream(object):
+    CONTENT = b'<testsuite tests="1"/>' * 1000
+
+    def test_bytes(self):
+        stream = MultipartStream(self.CONTENT, chunk_size=1000)
+
+        body = body_of(stream)
+
+        assert body == expected_body(stream, self.CONTENT)
+        assert stream.size == len(body)
+        assert all(type(chunk) is bytes for chunk in stream)
+
+    def test_memoryview(self):
+        content = array.array('i', range(1000))
+        stream = MultipartStream(memoryview(content))
+
+        assert body_of(stream) == expected_body(stream, content.tobytes())
+        assert stream.size == len(body_of(stream))
+
+    def test_file_object(self, tmpdir):
+        tmpdir.join('report.xml').write_binary(self.CONTENT)
+
+        with open(str(tmpdir.join('report.xml')), 'rb') as f:
+            f.read(10)
+            stream = MultipartStream(f, chunk_size=1000)
+            body = body_of(stream)
+
+            assert not f.closed
+
+        assert body == expected_body(stream, self.CONTENT[10:])
+        assert stream.size == len(body)
+
+    def test_memory_buffer(self):
+        buf = io.BytesIO(self.CONTENT)
+        stream = MultipartStream(buf)
+
+        assert body_of(stream) == expected_body(stream, self.CONTENT)
+        assert stream.size == len(body_of(MultipartStream(io.BytesIO(self.CONTENT))))
+
+    def test_generator(self):
+        closed = []
+
+        def generate():
+            try:
+                yield b'first,'
+                yield b''
+                yield b'second'
+            finally:
+                closed.append(True)
+
+        stream = MultipartStream(generate())
+        chunks = list(stream)
+
+        assert b'' not in chunks
+        assert b''.join(chunks) == expected_body(stream, b'first,second')
+        assert stream.size is None
+        assert closed == [True]
+
+    @pytest.mark.skipif(six.PY2, reason="httplib of Python 2 can't send sized iterables")
+    def test_len(self):
+        assert MultipartStream(self.CONTENT).len == len(body_of(MultipartStream(self.CONTENT)))
+        assert MultipartStream(iter([self.CONTENT])).len == 0
+
+    @pytest.mark.skipif(six.PY3, reason="Python 3 sends sized bodies with Content-Length")
+    def test_no_len(self):
+        assert not hasattr(MultipartStream(self.CONTENT), 'len')
+
+    def test_close_not_sent_generator(self):
+        closed = []
+
+        def generate():
+            try:
+                yield b'data'
+            finally:
+                closed.append(True)
+
+        generator = generate()
+        next(generator)
+        MultipartStream(generator).close()
+
+        assert closed == [True]
+
+    def test_unknown_size(self):
+        source = mock.MagicMock(spec=['read', 'tell'])
+        source.tell.side_effect = IOError('illegal seek')
+
+        assert MultipartStream.source_size(source) is None
+
+    def test_filename_is_quoted(self):
+        stream = MultipartStream(b'', filename='my "report"\r\n.xml')
+        assert b'filename="my %22report%22%0D%0A.xml"' in body_of(stream)
+
+
+@pytest.fixture()
+def build_dir(tmpdir):
+    build = tmpdir.mkdir('build')
+    build.join('result.xml').write_binary(b'<testsuite tests="1"/>' * 1000)
+    build.mkdir('lib').join('app.jar').write_binary(bytes(bytearray(range(256))) * 100)
+    build.mkdir('empty')
+    return build
+
+
+def archive_of(body):
+    content = body.split(b'\r\n\r\n', 1)[1].rsplit(b'\r\n--', 1)[0]
+    return zipfile.ZipFile(io.BytesIO(content))
+
+
+class TestZipStream(object):
+    @pytest.mark.parametrize('compression', [zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED])
+    def test_archive(self, build_dir, compression):
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(ZipStream(str(build_dir), compression=compression))))
+
+        assert archive.testzip() is None
+        assert archive.namelist() == ['result.xml', 'empty/', 'lib/', 'lib/app.jar']
+        assert archive.read('lib/app.jar') == build_dir.join('lib', 'app.jar').read_binary()
+        assert archive.getinfo('lib/app.jar').compress_type == compression
+
+    def test_stored_files_have_no_data_descriptors(self, build_dir):
+        data = b''.join(ZipStream(str(build_dir), compression=zipfile.ZIP_STORED))
+        assert b'PK\x07\x08' not in data
+
+    def test_chunks(self, build_dir):
+        chunks = list(ZipStream(str(build_dir), compression=zipfile.ZIP_STORED, chunk_size=4096))
+
+        assert all(len(chunk) >= 4096 for chunk in chunks[:-1])
+        assert len(chunks) > 1
+
+    def test_unicode_names(self, tmpdir):
+        tmpdir.join(u'r\xe9sum\xe9.txt').write_binary(b'data')
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(ZipStream(str(tmpdir)))))
+
+        assert archive.namelist() == [u'r\xe9sum\xe9.txt']
+
+    def test_zip64(self, build_dir):
+        with mock.patch.object(ZipStream, 'ZIP64_LIMIT', 1024), mock.patch.object(ZipStream, 'ZIP64_COUNT_LIMIT', 2):
+            data = b''.join(ZipStream(str(build_dir)))
+
+        assert b'PK\x06\x06' in data
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        assert archive.testzip() is None
+        assert archive.read('result.xml') == build_dir.join('result.xml').read_binary()
+
+    def test_file_changed_while_archived(self, build_dir):
+        stream = iter(ZipStream(str(build_dir), compression=zipfile.ZIP_STORED, chunk_size=1))
+        next(stream)
+        build_dir.join('result.xml').write_binary(b'<testsuite tests="2"/>' * 1000)
+
+        with pytest.raises(YagocdException):
+            list(stream)
+
+    def test_unsupported_compression(self, build_dir):
+        with pytest.raises(ValueError):
+            ZipStream(str(build_dir), compression=99)
+
+
+class TestUpload(object):
+    @pytest.fixture()
+    def manager(self, mock_session):
+        mock_session.urljoin.side_effect = lambda *args: '/'.join(args)
+        return artifact.ArtifactManager(
+            session=mock_session,
+            pipeline_name='Shared_Services',
+            pipeline_counter=7,
+            stage_name='Commit',
+            stage_counter='1',
+            job_name='build'
+        )
+
+    def test_create(self, manager, mock_session):
+        manager.upload(path='reports/result.xml', source=b'<xml/>')
+
+        call = mock_session.post.call_args[1]
+        assert call['path'].endswith('/reports/result.xml')
+        assert isinstance(call['data'], MultipartStream)
+        assert call['headers']['Confirm'] == 'true'
+        assert call['headers']['Content-Type'] == call['data'].content_type
+        assert expected_body(call['data'], b'<xml/>', filename=b'result.xml') == body_of(call['data'])
+
+    def test_append(self, manager, mock_session):
+        manager.upload(path='log.txt', source=[b'line\n'], append=True)
+
+        call = mock_session.put.call_args[1]
+        assert 'Confirm' not in call['headers']
+        assert body_of(call['data']).count(b'line\n') == 1
+
+    def test_generator_is_closed_on_failure(self, manager, mock_session):
+        closed = []
+
+        def generate():
+            try:
+                yield b'data'
+            finally:
+                closed.append(True)
+
+        mock_session.post.side_effect = IOError('connection refused')
+        generator = generate()
+        next(generator)
+
+        with pytest.raises(IOError):
+            manager.upload(path='file.txt', source=generator)
+
+        assert closed == [True]
+
+    def test_create_closes_file(self, manager, tmpdir):
+        filename = tmpdir.join('file.txt')
+        filename.write('data')
+
+        with mock.patch('yagocd.resources.artifact.open', mock.mock_open(read_data=b'data'), create=True) as open_mock:
+            manager.create(path='file.txt', filename=str(filename))
+            manager.append(path='file.txt', filename=str(filename))
+
+        assert open_mock.return_value.__exit__.call_count == 2
+
+    def test_upload_directory(self, manager, mock_session, build_dir):
+        manager.upload_directory(local_dir=str(build_dir), path='reports/')
+
+        assert mock_session.post.call_count == 1
+        call = mock_session.post.call_args[1]
+        assert call['path'].endswith('/reports/')
+        assert call['headers']['Confirm'] == 'true'
+
+        body = body_of(call['data'])
+        assert b'name="zipfile"; filename="reports.zip"' in body
+        assert b'Content-Type: application/zip' in body
+        assert archive_of(body).read('result.xml') == build_dir.join('result.xml').read_binary()
+        assert call['data'].size is None
+
+    def test_upload_missing_directory(self, manager, mock_session, tmpdir):
+        with pytest.raises(ValueError):
+            manager.upload_directory(local_dir=str(tmpdir.join('missing')), path='reports')
+
+        assert not mock_session.post.called
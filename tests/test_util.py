@@ -25,11 +25,16 @@
 # THE SOFTWARE.
 #
 ###############################################################################
+import copy
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from mock import mock
 
 from yagocd.resources import pipeline
-from yagocd.util import since, YagocdUtil
+from yagocd.util import AttrDict, AttrList, since, YagocdUtil
 
 
 class TestBuildGraph(object):
@@ -49,9 +54,36 @@ class TestBuildGraph(object):
         YagocdUtil.build_graph(
             nodes=pipelines,
             dependencies=lambda parent: [material for material in parent.data.materials],
-            compare=lambda candidate, child: candidate.description == child.data.name
+            node_key=lambda child: child.data.name,
+            dependency_key=lambda material: material.description
         )
         assert child_a.descendants == [parent_a]
+        assert parent_a.predecessors == [child_a]
+
+    def test_shared_keys(self, session_fixture):
+        nodes = [
+            pipeline.PipelineInstance(session=session_fixture, data={'id': 'a', 'counter': 1}),
+            pipeline.PipelineInstance(session=session_fixture, data={'id': 'a', 'counter': 2}),
+            pipeline.PipelineInstance(session=session_fixture, data={'id': 'b', 'counter': 1}),
+            pipeline.PipelineInstance(session=session_fixture, data={'id': 'c', 'counter': 1}),
+        ]
+        dependencies = {'a': [], 'b': ['a'], 'c': ['b', 'a', 'unknown']}
+
+        YagocdUtil.build_graph(
+            nodes=nodes,
+            dependencies=lambda parent: dependencies[parent.data.id],
+            node_key=lambda child: child.data.id,
+            dependency_key=lambda parent_id: parent_id
+        )
+
+        first_a, second_a, b, c = nodes
+        assert first_a.predecessors == []
+        assert first_a.descendants == [b, c]
+        assert second_a.descendants == [b, c]
+        assert b.predecessors == [first_a, second_a]
+        assert b.descendants == [c]
+        assert c.predecessors == [first_a, second_a, b]
+        assert c.descendants == []
 
 
 class TestGraphDepthWalk(object):
@@ -69,6 +101,170 @@ class TestGraphDepthWalk(object):
         assert sorted(YagocdUtil.graph_depth_walk(root, lambda x: graph.get(x))) == sorted(expected)
 
 
+class TestPaginate(object):
+    PAGE_SIZE = 10
+    TOTAL = 95
+
+    @pytest.fixture()
+    def requested(self):
+        return list()
+
+    @pytest.fixture()
+    def fetch_page(self, requested):
+        lock = threading.Lock()
+
+        def fetch(offset):
+            with lock:
+                requested.append(offset)
+            return list(range(offset, min(offset + self.PAGE_SIZE, self.TOTAL)))
+
+        return fetch
+
+    @pytest.mark.parametrize('look_ahead', [0, 1, 3, 20])
+    def test_all_items_in_order(self, fetch_page, look_ahead):
+        assert list(YagocdUtil.paginate(fetch_page, look_ahead=look_ahead)) == list(range(self.TOTAL))
+
+    def test_sequential_offsets(self, fetch_page, requested):
+        list(YagocdUtil.paginate(fetch_page))
+        assert requested == list(range(0, self.TOTAL, self.PAGE_SIZE)) + [self.TOTAL]
+
+    def test_empty(self):
+        assert list(YagocdUtil.paginate(lambda offset: [], look_ahead=3)) == []
+
+    def test_look_ahead_window_is_bounded(self, fetch_page, requested):
+        generator = YagocdUtil.paginate(fetch_page, look_ahead=2)
+        assert next(generator) == 0
+        generator.close()
+
+        assert len(requested) <= 3
+        assert set(requested) <= {0, 10, 20}
+
+    def test_close_stops_requesting_pages(self, requested):
+        release = threading.Event()
+        futures = list()
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def submit(self, *args, **kwargs):
+                future = super(RecordingExecutor, self).submit(*args, **kwargs)
+                futures.append(future)
+                return future
+
+        def fetch(offset):
+            requested.append(offset)
+            if offset:
+                release.wait(5)
+            return list(range(offset, offset + self.PAGE_SIZE))
+
+        with mock.patch('yagocd.util.ThreadPoolExecutor', RecordingExecutor):
+            generator = YagocdUtil.paginate(fetch, look_ahead=1)
+            assert next(generator) == 0
+            generator.close()
+        release.set()
+
+        # the pending page is either cancelled or left to finish in background
+        assert len(futures) == 1
+        if not futures[0].cancelled():
+            futures[0].result(timeout=5)
+
+        assert requested in ([0], [0, 10])
+        assert list(generator) == []
+
+    def test_error_is_raised_in_consumer(self):
+        def fetch(offset):
+            if offset:
+                raise ValueError(offset)
+            return list(range(self.PAGE_SIZE))
+
+        with pytest.raises(ValueError):
+            list(YagocdUtil.paginate(fetch, look_ahead=2))
+
+
+class TestAttrDict(object):
+    @pytest.fixture()
+    def raw(self):
+        return {
+            'name': 'foo',
+            'materials': [{'description': 'bar', 'attributes': {'url': 'git@example.com'}}],
+            'stages': [],
+        }
+
+    def test_attribute_access(self, raw):
+        data = AttrDict(raw)
+        assert data.name == 'foo'
+        assert data.materials[0].attributes.url == 'git@example.com'
+        assert [m.description for m in data.materials] == ['bar']
+
+    def test_nested_values_are_wrapped_lazily(self, raw):
+        data = AttrDict(raw)
+        assert type(dict.__getitem__(data, 'materials')) is list
+
+        materials = data.materials
+        assert isinstance(materials, AttrList)
+        assert dict.__getitem__(data, 'materials') is materials
+        assert type(list.__getitem__(materials, 0)) is dict
+        assert data.materials is materials
+
+    def test_missing_attribute(self, raw):
+        data = AttrDict(raw)
+        with pytest.raises(AttributeError):
+            _ = data.missing  # noqa
+        assert not hasattr(data, 'missing')
+        assert data.get('missing') is None
+
+    def test_dict_protocol(self, raw):
+        data = AttrDict(raw)
+        assert 'name' in data
+        assert data == raw
+        assert isinstance(data.get('materials')[0], AttrDict)
+        assert all(isinstance(v, AttrDict) for v in data.materials[:1])
+        assert dict(data.items())['materials'][0].description == 'bar'
+
+    def test_set_attribute(self, raw):
+        data = AttrDict(raw)
+        data.materials[0].description = 'baz'
+        data.label = 'qux'
+        assert data['label'] == 'qux'
+        assert json.loads(json.dumps(data))['materials'][0]['description'] == 'baz'
+
+    def test_reversed(self, raw):
+        raw['materials'].append({'description': 'baz'})
+        data = AttrDict(raw)
+        assert [m.description for m in reversed(data.materials)] == ['baz', 'bar']
+
+    def test_list_pop(self, raw):
+        data = AttrDict(raw)
+        assert data.materials.pop().attributes.url == 'git@example.com'
+        assert data.materials == []
+
+    def test_pop(self, raw):
+        data = AttrDict(raw)
+        assert data.pop('materials')[0].description == 'bar'
+        assert data.pop('missing', None) is None
+        with pytest.raises(KeyError):
+            data.pop('missing')
+
+    def test_setdefault(self, raw):
+        data = AttrDict(raw)
+        assert data.setdefault('materials')[0].description == 'bar'
+        assert data.setdefault('label', {'name': 'qux'}).name == 'qux'
+        assert data.label.name == 'qux'
+
+    def test_popitem(self):
+        data = AttrDict({'stage': {'name': 'build'}})
+        key, value = data.popitem()
+        assert key == 'stage'
+        assert value.name == 'build'
+        assert data == {}
+
+    def test_copy(self, raw):
+        data = AttrDict(raw)
+        _ = data.materials[0].attributes  # noqa
+        duplicate = copy.deepcopy(data)
+        assert duplicate == data
+        duplicate.materials[0].attributes.url = 'changed'
+        assert data.materials[0].attributes.url == 'git@example.com'
+
+
 @pytest.mark.parametrize('since_version, expected_exc', [
     ('0.0.0', None),
     ('1.2.3.4', None),
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+"""
+Asynchronous client, based on :mod:`asyncio`.
+
+Requires Python 3.5 or newer, so this module is not imported by the
+package automatically.
+"""
+
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+
+from yagocd.client import Yagocd
+from yagocd.resources import BaseManager
+
+
+class AsyncSession(object):
+    """
+    Asynchronous wrapper around :class:`yagocd.session.Session`.
+
+    Blocking requests are executed in a bounded pool of worker threads,
+    which is sized together with the connection pool of the underlying
+    session, so up to `concurrency` requests could be in flight at the
+    same time from a single event loop.
+    """
+
+    DEFAULT_CONCURRENCY = 100
+
+    def __init__(self, session, concurrency=None):
+        """
+        :param session: synchronous session to wrap.
+        :type session: yagocd.session.Session
+        :param concurrency: maximum number of simultaneous requests.
+        """
+        self._session = session
+        self._concurrency = concurrency or self.DEFAULT_CONCURRENCY
+        self._executor = ThreadPoolExecutor(max_workers=self._concurrency)
+
+        if self._session.pool['pool_maxsize'] < self._concurrency:
+            self._session.configure_pool(pool_maxsize=self._concurrency)
+
+    @property
+    def session(self):
+        """
+        Synchronous session, used by the managers.
+
+        :rtype: yagocd.session.Session
+        """
+        return self._session
+
+    @property
+    def concurrency(self):
+        return self._concurrency
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Executes blocking callable in the pool of workers.
+
+        :param func: callable to execute.
+        :return: result of the callable.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def request(self, method, path, params=None, data=None, headers=None, files=None, stream=False):
+        return await self.run(
+            self._session.request,
+            method=method, path=path, params=params, data=data, headers=headers, files=files, stream=stream
+        )
+
+    async def get(self, path, params=None, headers=None, stream=False):
+        return await self.request(method='get', path=path, params=params, headers=headers, stream=stream)
+
+    async def post(self, path, params=None, data=None, headers=None, files=None):
+        return await self.request(method='post', path=path, params=params, data=data, headers=headers, files=files)
+
+    async def put(self, path, data=None, headers=None, files=None):
+        return await self.request(method='put', path=path, data=data, headers=headers, files=files)
+
+    async def patch(self, path, data=None, headers=None):
+        return await self.request(method='patch', path=path, data=data, headers=headers)
+
+    async def delete(self, path, data=None, headers=None):
+        return await self.request(method='delete', path=path, data=data, headers=headers)
+
+    def close(self):
+        """
+        Stops the workers and closes pooled connections.
+        """
+        self._executor.shutdown(wait=True)
+        self._session.close()
+
+
+class AsyncIterator(object):
+    """
+    Asynchronous iterator over a blocking iterator: every step of the
+    original iterator is executed in the pool of workers.
+    """
+
+    _EXHAUSTED = object()
+
+    def __init__(self, session, factory):
+        """
+        :param session: asynchronous session.
+        :type session: yagocd.aio.AsyncSession
+        :param factory: callable, returning blocking iterator.
+        """
+        self._session = session
+        self._factory = factory
+        self._iterator = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._iterator is None:
+            self._iterator = await self._session.run(lambda: iter(self._factory()))
+
+        item = await self._session.run(next, self._iterator, self._EXHAUSTED)
+        if item is self._EXHAUSTED:
+            raise StopAsyncIteration
+        return item
+
+
+class AsyncManager(object):
+    """
+    Asynchronous proxy for a manager.
+
+    All public methods of the wrapped manager are exposed as coroutines,
+    generator methods (like ``full_history``) return asynchronous iterators
+    and the manager itself supports ``async for`` if it's iterable.
+    Entities, returned by the methods, are the usual synchronous objects.
+    """
+
+    def __init__(self, manager, session):
+        """
+        :param manager: synchronous manager to wrap.
+        :type manager: yagocd.resources.BaseManager
+        :param session: asynchronous session.
+        :type session: yagocd.aio.AsyncSession
+        """
+        self._manager = manager
+        self._session = session
+
+    @property
+    def manager(self):
+        """
+        Wrapped synchronous manager.
+        """
+        return self._manager
+
+    def __getattr__(self, name):
+        attribute = getattr(self._manager, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        if inspect.isgeneratorfunction(inspect.unwrap(attribute)):
+            @functools.wraps(attribute)
+            def generator_method(*args, **kwargs):
+                return AsyncIterator(self._session, functools.partial(attribute, *args, **kwargs))
+
+            return generator_method
+
+        @functools.wraps(attribute)
+        async def method(*args, **kwargs):
+            return await self._session.run(attribute, *args, **kwargs)
+
+        return method
+
+    def __getitem__(self, item):
+        return self._session.run(self._manager.__getitem__, item)
+
+    def __aiter__(self):
+        return AsyncIterator(self._session, lambda: self._manager)
+
+
+class AsyncYagocd(object):
+    """
+    Asynchronous GoCD client.
+
+    It gives access to the same managers as :class:`yagocd.client.Yagocd`,
+    but their methods are coroutines, so many requests could be executed
+    concurrently from one event loop::
+
+        async with AsyncYagocd(server='http://localhost:8153', concurrency=200) as go:
+            statuses = await asyncio.gather(*[go.pipelines.status(name) for name in names])
+    """
+
+    def __init__(self, server=None, auth=None, options=None, concurrency=None):
+        """
+        Construct an asynchronous GoCD client instance.
+
+        :param server: url of the Go server.
+        :param auth: authorization, that will be passed to requests.
+        :param options: dictionary of additional options, see :class:`yagocd.client.Yagocd`.
+        :param concurrency: maximum number of simultaneous requests.
+        """
+        self._client = Yagocd(server=server, auth=auth, options=options)
+        self._session = AsyncSession(session=self._client._session, concurrency=concurrency)
+        self._managers = dict()
+
+    def __getattr__(self, name):
+        attribute = getattr(self._client, name)
+        if isinstance(attribute, BaseManager):
+            if name not in self._managers:
+                self._managers[name] = AsyncManager(manager=attribute, session=self._session)
+            return self._managers[name]
+        return attribute
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def client(self):
+        """
+        Wrapped synchronous client.
+
+        :rtype: yagocd.client.Yagocd
+        """
+        return self._client
+
+    @property
+    def session(self):
+        """
+        :rtype: yagocd.aio.AsyncSession
+        """
+        return self._session
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Executes blocking callable, for example method of an entity, in the pool of workers.
+        """
+        return await self._session.run(func, *args, **kwargs)
+
+    def close(self):
+        self._session.close()
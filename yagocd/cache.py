@@ -0,0 +1,449 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+_replace = getattr(os, 'replace', os.rename)
+
+
+class CachedResponse(object):
+    """
+    Stored copy of a response together with its validators.
+    """
+
+    # headers, describing the transfer of particular response, which
+    # should not be copied from `304 Not Modified` to the stored response
+    TRANSFER_HEADERS = ('content-length', 'content-encoding', 'transfer-encoding')
+
+    def __init__(self, response):
+        """
+        :type response: requests.models.Response
+        """
+        self.status_code = response.status_code
+        self.reason = response.reason
+        self.headers = CaseInsensitiveDict(response.headers)
+        self.content = response.content
+        self.encoding = response.encoding
+
+    @property
+    def etag(self):
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self):
+        return self.headers.get('Last-Modified')
+
+    def conditional_headers(self):
+        """
+        Headers to be sent for revalidation of the response.
+
+        :rtype: dict
+        """
+        headers = dict()
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def refresh(self, not_modified):
+        """
+        Updates stored headers from `304 Not Modified` response and builds
+        response object, which could be used as if it was received from server.
+
+        :param not_modified: `304 Not Modified` response from the server.
+        :type not_modified: requests.models.Response
+        :rtype: requests.models.Response
+        """
+        for name, value in not_modified.headers.items():
+            if name.lower() not in self.TRANSFER_HEADERS:
+                self.headers[name] = value
+
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = self.encoding
+        response._content = self.content
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.history = not_modified.history
+        response.elapsed = not_modified.elapsed
+        response.cookies = not_modified.cookies
+        return response
+
+
+class ResponseCache(object):
+    """
+    HTTP cache for conditional `GET` requests.
+
+    Responses, having `ETag` or `Last-Modified` validators, are stored per
+    url, query parameters and `Accept` header. Next request to the same
+    resource is sent with `If-None-Match`/`If-Modified-Since` headers,
+    and if server answers with `304 Not Modified`, the stored body is
+    returned instead of downloading it again.
+
+    Any other request to the url (e.g. `PUT` or `DELETE`) invalidates
+    stored responses for it. Instance of the cache is thread safe.
+    """
+
+    DEFAULT_MAX_ENTRIES = 1000
+
+    # methods, which could change state of the resource on the server
+    UNSAFE_METHODS = ('post', 'put', 'patch', 'delete')
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        :param max_entries: maximum number of stored responses, least recently
+        used responses are evicted first.
+        """
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._bytes_saved = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(url, params, headers):
+        """
+        Builds key of the cache entry.
+
+        :param url: full url of the request.
+        :param params: query parameters of the request.
+        :param headers: headers of the request.
+        :return: hashable key.
+        """
+        if isinstance(params, dict):
+            params = tuple(sorted(params.items()))
+        elif params is not None:
+            params = tuple(params)
+        return url, params, CaseInsensitiveDict(headers or {}).get('Accept')
+
+    def conditional_headers(self, key):
+        """
+        Headers to revalidate the stored response, if there is one.
+
+        :param key: key of the cache entry.
+        :rtype: dict
+        """
+        entry = self.revalidate(key)
+        return entry.conditional_headers() if entry is not None else dict()
+
+    def revalidate(self, key):
+        """
+        Takes the stored response to be revalidated. It should be passed
+        to :meth:`process` together with the response from the server, so
+        `304 Not Modified` is answered with it even if it's evicted from
+        the cache meanwhile.
+
+        :param key: key of the cache entry.
+        :rtype: yagocd.cache.CachedResponse
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._revalidations += 1
+            return entry
+
+    def process(self, key, method, response, revalidated=None):
+        """
+        Handles the response from the server: returns stored response on
+        `304 Not Modified`, stores new one or invalidates stale entries.
+
+        :param key: key of the cache entry.
+        :param method: HTTP method of the request.
+        :param response: response from the server.
+        :type response: requests.models.Response
+        :param revalidated: stored response, validators of which were
+        sent, see :meth:`revalidate`.
+        :type revalidated: yagocd.cache.CachedResponse
+        :rtype: requests.models.Response
+        """
+        url = key[0]
+        with self._lock:
+            if method.lower() in self.UNSAFE_METHODS:
+                self._invalidate(url)
+                return response
+            elif method.lower() != 'get':
+                return response
+
+            entry = revalidated or self._entries.get(key)
+            if response.status_code == 304 and entry is not None:
+                self._store(key, entry)
+
+                self._hits += 1
+                self._bytes_saved += len(entry.content)
+                return entry.refresh(response)
+
+            self._misses += 1
+            self._entries.pop(key, None)
+            if response.status_code == 200 and ('ETag' in response.headers or 'Last-Modified' in response.headers):
+                self._store(key, CachedResponse(response))
+
+        return response
+
+    def _store(self, key, entry):
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _invalidate(self, url):
+        for key in [k for k in self._entries if k[0] == url]:
+            del self._entries[key]
+
+    def clear(self):
+        """
+        Removes all stored responses, counters are kept intact.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hits(self):
+        """
+        Number of responses served from cache after `304 Not Modified`.
+        """
+        return self._hits
+
+    @property
+    def misses(self):
+        """
+        Number of `GET` requests, for which full response was received.
+        """
+        return self._misses
+
+    @property
+    def revalidations(self):
+        """
+        Number of conditional requests sent to the server.
+        """
+        return self._revalidations
+
+    @property
+    def bytes_saved(self):
+        """
+        Total size of bodies, which were not downloaded thanks to the cache.
+        """
+        return self._bytes_saved
+
+    @property
+    def stats(self):
+        """
+        Snapshot of all counters of the cache.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(
+                hits=self._hits,
+                misses=self._misses,
+                revalidations=self._revalidations,
+                bytes_saved=self._bytes_saved,
+                entries=len(self._entries),
+            )
+
+
+class MemoryStorage(object):
+    """
+    In-memory storage with least recently used eviction.
+    """
+
+    DEFAULT_MAX_ENTRIES = 10000
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is not None:
+                self._entries[key] = value
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskStorage(object):
+    """
+    Storage, keeping each value as a JSON file in the given directory,
+    so it survives restarts and could be shared between processes.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: directory to keep files in, created if missing.
+        """
+        self._path = path
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    def __len__(self):
+        return len([name for name in os.listdir(self._path) if name.endswith('.json')])
+
+    def _filename(self, key):
+        return os.path.join(self._path, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, key):
+        try:
+            with open(self._filename(key)) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def set(self, key, value):
+        filename = self._filename(key)
+        temporary = '{}.{}.tmp'.format(filename, uuid.uuid4().hex)
+        with open(temporary, 'w') as f:
+            json.dump(value, f)
+        # rename is atomic, so readers never see partially written file
+        _replace(temporary, filename)
+
+    def delete(self, key):
+        try:
+            os.remove(self._filename(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        for name in os.listdir(self._path):
+            if name.endswith('.json'):
+                os.remove(os.path.join(self._path, name))
+
+
+class InstanceCache(object):
+    """
+    Cache of pipeline and stage instances, which is aware of their results.
+
+    Instances, which are completed (all stages have final result), never
+    change, so they are kept forever. Instances in progress are kept for
+    a short `ttl` only.
+    """
+
+    DEFAULT_TTL = 10
+
+    def __init__(self, storage=None, ttl=DEFAULT_TTL):
+        """
+        :param storage: storage to keep instances in, :class:`MemoryStorage` by default.
+        :param ttl: number of seconds to keep not completed instances.
+        """
+        self._storage = storage if storage is not None else MemoryStorage()
+        self._ttl = ttl
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def storage(self):
+        return self._storage
+
+    def get(self, key):
+        """
+        Gets data of the instance.
+
+        :param key: key of the instance.
+        :return: stored data or ``None`` if it's missing or expired.
+        """
+        entry = self._storage.get(key)
+        if entry is not None and entry['expires'] is not None and entry['expires'] < time.time():
+            self._storage.delete(key)
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            return entry['data']
+
+    def set(self, key, data, completed):
+        """
+        Stores data of the instance.
+
+        :param key: key of the instance.
+        :param data: JSON data of the instance.
+        :param completed: whether the instance would not change anymore.
+        """
+        expires = None if completed else time.time() + self._ttl
+        self._storage.set(key, dict(data=data, expires=expires))
+
+    def clear(self):
+        self._storage.clear()
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def stats(self):
+        """
+        Snapshot of all counters of the cache.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(hits=self._hits, misses=self._misses)
@@ -65,6 +65,13 @@ class Yagocd(object):
         'context_path': 'go/',
         'api_path': 'api/',
         'verify': True,
+        'cache': False,
+        'instance_cache': False,
+        'pool_connections': 10,
+        'pool_maxsize': 10,
+        'pool_block': False,
+        'keep_alive': True,
+        'retry': False,
         'headers': {
             'Accept': BaseManager.ACCEPT_HEADER,
         }
@@ -83,6 +90,20 @@ class Yagocd(object):
             overwritten by some managers, because of API.
             * verify -- verify SSL certs. Defaults to ``True``.
             * headers -- default headers for requests (default is ``'Accept': 'application/vnd.go.cd.v1+json'``)
+            * cache -- cache responses with ``ETag``/``Last-Modified`` and revalidate them with conditional
+            requests. Could be ``True`` or instance of :class:`yagocd.cache.ResponseCache` (default is ``False``).
+            * instance_cache -- cache pipeline and stage instances, got by counters: completed ones are kept
+            forever, running ones for a short time. Could be ``True`` or instance of
+            :class:`yagocd.cache.InstanceCache` (default is ``False``).
+            * pool_connections -- number of hosts to keep connection pools for (default is ``10``).
+            * pool_maxsize -- maximum number of connections kept per host. Should be not less than number of
+            threads, sharing the client (default is ``10``).
+            * pool_block -- wait for a free connection when all of them are in use, instead of opening a new one,
+            which won't be kept in the pool (default is ``False``).
+            * keep_alive -- reuse connections between requests (default is ``True``).
+            * retry -- retry idempotent requests, failed with connection errors or 429/502/503/504 statuses, with
+            exponential backoff. Could be ``True`` or instance of :class:`yagocd.retry.RetryPolicy`
+            (default is ``False``).
         """
         options = {} if options is None else options
 
@@ -127,6 +148,26 @@ class Yagocd(object):
         """
         return self._session.server_url
 
+    @property
+    def retry(self):
+        """
+        Property for accessing policy of retrying failed requests, which holds retry counters.
+
+        :return: policy instance or ``None`` if retrying is disabled.
+        :rtype: yagocd.retry.RetryPolicy
+        """
+        return self._session.retry
+
+    @property
+    def cache(self):
+        """
+        Property for accessing HTTP cache, which holds hit/miss/revalidation counters.
+
+        :return: cache instance or ``None`` if caching is disabled.
+        :rtype: yagocd.cache.ResponseCache
+        """
+        return self._session.cache
+
     @property
     def agents(self):
         """
@@ -0,0 +1,464 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import six
+
+from yagocd.exception import RequestError, YagocdException
+
+_replace = getattr(os, 'replace', os.rename)
+
+
+class DownloadResult(object):
+    """
+    Result of a streaming download.
+    """
+
+    def __init__(self, size, checksum, algorithm):
+        """
+        :param size: number of bytes written.
+        :param checksum: hex digest of written bytes or ``None``, if it was not calculated.
+        :param algorithm: name of the hash algorithm, e.g. ``sha256``.
+        """
+        self.size = size
+        self.checksum = checksum
+        self.algorithm = algorithm
+
+    def __eq__(self, other):
+        if not isinstance(other, DownloadResult):
+            return NotImplemented
+        return (self.size, self.checksum, self.algorithm) == (other.size, other.checksum, other.algorithm)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return '<{cls}: {size} bytes, {algorithm}={checksum}>'.format(
+            cls=self.__class__.__name__, size=self.size, algorithm=self.algorithm, checksum=self.checksum
+        )
+
+
+class Downloader(object):
+    """
+    Writes body of a streamed response to a file in fixed-size chunks,
+    so memory usage doesn't depend on size of the body.
+    """
+
+    DEFAULT_CHUNK_SIZE = 1024 * 1024
+    DEFAULT_ALGORITHM = 'sha256'
+    DEFAULT_ATTEMPTS = 3
+    DEFAULT_MIN_SEGMENT_SIZE = 16 * 1024 * 1024
+    DEFAULT_SPOOL_SIZE = 8 * 1024 * 1024
+    PARTIAL_SUFFIX = '.part'
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, algorithm=DEFAULT_ALGORITHM):
+        """
+        :param chunk_size: size of chunks in bytes to read and write.
+        :param progress: callable, which is called after every chunk with
+        number of bytes written so far and expected total number of bytes
+        (``None``, if the server didn't tell it).
+        :param algorithm: name of :mod:`hashlib` algorithm to calculate
+        checksum of the body with, or ``None`` to skip it.
+        """
+        self._chunk_size = chunk_size
+        self._progress = progress
+        self._algorithm = algorithm
+
+    def save(self, response, destination):
+        """
+        Saves body of the response.
+
+        :param response: response, requested with ``stream=True``.
+        :type response: requests.Response
+        :param destination: path to the file or binary file-like object
+        to write to. File object is not closed, file at the path is
+        removed if download fails.
+        :return: number of written bytes and checksum of them.
+        :rtype: yagocd.download.DownloadResult
+        """
+        try:
+            if not isinstance(destination, six.string_types):
+                return self._write(response, destination, self._digest())
+
+            try:
+                with open(destination, 'wb') as f:
+                    return self._write(response, f, self._digest())
+            except BaseException:
+                if os.path.exists(destination):
+                    os.remove(destination)
+                raise
+        finally:
+            response.close()
+
+    def extract(self, response, local_dir, spool_size=DEFAULT_SPOOL_SIZE):
+        """
+        Extracts zip archive from body of the response into the directory.
+
+        The body is written to a temporary file, which is kept in memory
+        until it grows over ``spool_size`` bytes and is moved to disk then.
+        Entries are extracted from it one by one in chunks, so memory usage
+        doesn't depend on size of the archive. Absolute paths and ``..``
+        in names of entries are sanitized, as :meth:`zipfile.ZipFile.extract` does.
+
+        :param response: response, requested with ``stream=True``.
+        :type response: requests.Response
+        :param local_dir: directory to extract the archive into.
+        :param spool_size: maximum size of the archive in bytes to keep in memory.
+        :return: paths to extracted files and directories.
+        :rtype: list
+        """
+        with tempfile.SpooledTemporaryFile(max_size=spool_size) as spool:
+            try:
+                self._write(response, spool, None)
+            finally:
+                response.close()
+
+            spool.seek(0)
+            # before Python 3.11 spooled file lacks methods, zipfile relies on
+            try:
+                archive = zipfile.ZipFile(spool if hasattr(spool, 'seekable') else spool._file)
+            except zipfile.BadZipfile as e:
+                raise YagocdException("Body of <{}> is not a zip archive: {}".format(response.url, e))
+
+            try:
+                return [archive.extract(info, local_dir) for info in archive.infolist()]
+            finally:
+                archive.close()
+
+    def resume(self, request, destination, expected_size=None, attempts=DEFAULT_ATTEMPTS):
+        """
+        Saves body of the response to the file, continuing from where an
+        interrupted download stopped.
+
+        The body is written to ``<destination>.part`` file, which is kept
+        if the download fails, so the next call asks the server only for
+        the remaining bytes using ``Range`` header. If the server ignores
+        the header and sends whole body, the file is rewritten from start.
+        Once all bytes are received, the file is renamed to the destination.
+
+        :param request: callable, receiving dictionary of additional headers
+        and returning response, requested with ``stream=True``, or ``None``
+        if the body is not available yet.
+        :param destination: path to the file to write to.
+        :param expected_size: expected size of the file in bytes; if omitted,
+        size announced by the server is checked.
+        :param attempts: how many times to request the body in a row, while
+        connection is dropped in the middle of the transfer.
+        :return: number of bytes in the file and checksum of all of them, or
+        ``None`` if ``request`` returned ``None``.
+        :rtype: yagocd.download.DownloadResult
+        """
+        partial = destination + self.PARTIAL_SUFFIX
+
+        for attempt in range(1, attempts + 1):
+            try:
+                result, total = self._attempt(request, partial)
+            except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError):
+                if attempt == attempts:
+                    raise
+                continue
+
+            if result is None:
+                return None
+
+            total = expected_size if expected_size is not None else total
+            if total is None or result.size == total:
+                _replace(partial, destination)
+                return result
+
+            if result.size > total:
+                os.remove(partial)
+                raise YagocdException(
+                    "Size of <{}> mismatches: expected {} bytes, got {}".format(destination, total, result.size)
+                )
+
+        raise YagocdException("Download of <{}> is incomplete after {} attempts".format(destination, attempts))
+
+    def _attempt(self, request, partial):
+        offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+        # offsets are counted in bytes of the file, not of compressed body
+        headers = {'Accept-Encoding': 'identity'}
+        if offset:
+            headers['Range'] = 'bytes={}-'.format(offset)
+
+        try:
+            response = request(headers)
+        except RequestError as e:
+            if not offset or e.response is None or e.response.status_code != 416:
+                raise
+
+            _, total = self.content_range(e.response)
+            # the part was written completely, but wasn't renamed
+            if total == offset:
+                return self._complete(partial, offset), total
+
+            # the file has shrunk on the server since the part was written
+            os.remove(partial)
+            return self._attempt(request, partial)
+
+        if response is None:
+            return None, None
+
+        try:
+            return self._append(response, partial, offset)
+        finally:
+            response.close()
+
+    def segmented(
+        self,
+        request,
+        destination,
+        segments,
+        min_segment_size=DEFAULT_MIN_SEGMENT_SIZE,
+        attempts=DEFAULT_ATTEMPTS
+    ):
+        """
+        Saves the file by splitting it into byte ranges and fetching them
+        concurrently, each one written to its place in a preallocated file.
+
+        Size of the file is learnt from the first ranged request. If the
+        server ignores ``Range`` header, the body of that response is saved
+        as in :meth:`save`. Checksum is calculated by reading the file
+        after all ranges are written.
+
+        :param request: callable, receiving dictionary of additional headers
+        and returning response, requested with ``stream=True``, or ``None``
+        if the body is not available yet.
+        :param destination: path to the file to write to.
+        :param segments: maximum number of ranges to fetch in parallel.
+        :param min_segment_size: files are not split into ranges smaller than that.
+        :param attempts: how many times to request the rest of a range,
+        if connection is dropped in the middle of it.
+        :return: number of bytes in the file and checksum of them, or
+        ``None`` if ``request`` returned ``None``.
+        :rtype: yagocd.download.DownloadResult
+        """
+        try:
+            response = request({'Accept-Encoding': 'identity', 'Range': 'bytes=0-0'})
+        except RequestError as e:
+            # only empty files have no satisfiable ranges
+            if e.response is None or e.response.status_code != 416:
+                raise
+            response = request({'Accept-Encoding': 'identity'})
+
+        if response is None:
+            return None
+
+        start, total = self.content_range(response)
+        if response.status_code != 206 or start != 0 or total is None:
+            return self.save(response, destination)
+        response.close()
+
+        count = max(1, min(segments, total // max(min_segment_size, 1)))
+        bounds = [total * i // count for i in range(count + 1)]
+
+        with open(destination, 'wb') as f:
+            f.truncate(total)
+
+        progress = _Progress(self._progress, total)
+        executor = ThreadPoolExecutor(max_workers=count)
+        try:
+            futures = [
+                executor.submit(self._fetch_range, request, destination, bounds[i], bounds[i + 1], progress, attempts)
+                for i in range(count)
+            ]
+            for future in futures:
+                future.result()
+        except BaseException:
+            progress.cancel()
+            executor.shutdown(wait=True)
+            os.remove(destination)
+            raise
+        executor.shutdown(wait=True)
+
+        return DownloadResult(size=total, checksum=self.checksum(destination), algorithm=self._algorithm)
+
+    def _fetch_range(self, request, destination, start, end, progress, attempts):
+        position = start
+        for attempt in range(1, attempts + 1):
+            response = None
+            try:
+                response = request({'Accept-Encoding': 'identity', 'Range': 'bytes={}-{}'.format(position, end - 1)})
+                self._check_range(response, position, destination)
+                with open(destination, 'r+b') as f:
+                    f.seek(position)
+                    for chunk in response.iter_content(chunk_size=self._chunk_size):
+                        if progress.cancelled:
+                            raise YagocdException("Download of <{}> is cancelled".format(destination))
+                        if position + len(chunk) > end:
+                            raise YagocdException("Server has sent more bytes than requested")
+
+                        f.write(chunk)
+                        position += len(chunk)
+                        progress.add(len(chunk))
+            except requests.RequestException:
+                if attempt == attempts:
+                    raise
+                continue
+            finally:
+                if response is not None:
+                    response.close()
+
+            if position == end:
+                return
+
+        raise YagocdException("Range {}-{} of <{}> is incomplete after {} attempts".format(
+            start, end - 1, destination, attempts
+        ))
+
+    def _check_range(self, response, position, destination):
+        if response is None or response.status_code != 206 or self.content_range(response)[0] != position:
+            raise YagocdException("Server hasn't sent bytes from {} of <{}>".format(position, destination))
+
+    def checksum(self, filename):
+        """
+        Calculates checksum of the local file.
+
+        :param filename: path to the file.
+        :return: hex digest of the file or ``None``, if algorithm is not set.
+        """
+        digest = self._digest()
+        if digest is None:
+            return None
+
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(self._chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _append(self, response, partial, offset):
+        digest = self._digest()
+        start, total = self.content_range(response)
+
+        if response.status_code == 206:
+            if start != offset:
+                raise YagocdException(
+                    "Server has sent bytes from {} instead of {} for <{}>".format(start, offset, partial)
+                )
+            if digest is not None and offset:
+                with open(partial, 'rb') as f:
+                    for chunk in iter(lambda: f.read(self._chunk_size), b''):
+                        digest.update(chunk)
+            mode = 'ab'
+        else:
+            offset = 0
+            total = self.expected_size(response)
+            mode = 'wb'
+
+        with open(partial, mode) as f:
+            result = self._write(response, f, digest=digest, written=offset, total=total)
+        return result, total
+
+    def _complete(self, partial, size):
+        if self._progress is not None:
+            self._progress(size, size)
+        return DownloadResult(size=size, checksum=self.checksum(partial), algorithm=self._algorithm)
+
+    def _digest(self):
+        return hashlib.new(self._algorithm) if self._algorithm else None
+
+    def _write(self, response, output, digest, written=0, total=None):
+        if total is None:
+            total = self.expected_size(response)
+
+        for chunk in response.iter_content(chunk_size=self._chunk_size):
+            if not chunk:
+                continue
+
+            output.write(chunk)
+            if digest is not None:
+                digest.update(chunk)
+            written += len(chunk)
+
+            if self._progress is not None:
+                self._progress(written, total)
+
+        return DownloadResult(
+            size=written,
+            checksum=digest.hexdigest() if digest is not None else None,
+            algorithm=self._algorithm
+        )
+
+    @staticmethod
+    def expected_size(response):
+        """
+        Returns size of the body, announced by the server.
+
+        :return: number of bytes or ``None`` if it's unknown.
+        """
+        length = response.headers.get('Content-Length')
+        # size of encoded body differs from size of decoded one, which is written
+        if length is None or not length.isdigit() or response.headers.get('Content-Encoding'):
+            return None
+        return int(length)
+
+    @staticmethod
+    def content_range(response):
+        """
+        Returns position of the first byte and size of the whole body from
+        ``Content-Range`` header of a partial response. Responses with
+        ``416 Range Not Satisfiable`` status have only the size: ``bytes */N``.
+
+        :return: tuple of first byte position and total number of bytes,
+        each is ``None`` if it's unknown.
+        """
+        match = re.match(r'bytes\s+(?:(\d+)-\d+|\*)/(\d+|\*)', response.headers.get('Content-Range', ''))
+        if match is None:
+            return None, None
+        start, total = match.groups()
+        return int(start) if start is not None else None, int(total) if total.isdigit() else None
+
+
+class _Progress(object):
+    """
+    Counter of bytes, written by several threads at once.
+    """
+
+    def __init__(self, callback, total):
+        self._callback = callback
+        self._total = total
+        self._written = 0
+        self._lock = threading.Lock()
+        self.cancelled = False
+
+    def add(self, size):
+        with self._lock:
+            self._written += size
+            if self._callback is not None:
+                self._callback(self._written, self._total)
+
+    def cancel(self):
+        self.cancelled = True
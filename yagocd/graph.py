@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+class DependencyGraph(object):
+    """
+    Reachability index over linked :class:`yagocd.resources.BaseNode` objects.
+
+    Transitive predecessors and descendants are computed once for the whole
+    graph: nodes are condensed into strongly connected components and every
+    component gets a bitset of the nodes reachable from it. After that,
+    checking whether one node depends on another is a single bit test, and
+    transitive lists are decoded from the bitset once per component.
+
+    Nodes are attached to the graph they were built into, so their
+    ``get_predecessors(transitive=True)`` and ``get_descendants(transitive=True)``
+    use the index. Re-linking any node through the ``predecessors`` or
+    ``descendants`` setters invalidates the index, and it's rebuilt on the
+    next query. If lists of predecessors or descendants are modified in
+    place, :meth:`invalidate` should be called explicitly.
+    """
+
+    def __init__(self, nodes):
+        """
+        :param nodes: list of linked nodes, e.g. result of
+        :meth:`yagocd.resources.pipeline.PipelineManager.list`. Nodes, which
+        are linked to the given ones but are not in the list, are added too.
+        :type nodes: list of yagocd.resources.BaseNode
+        """
+        self._nodes = list(nodes)
+        self._index = None
+        self._predecessors = None
+        self._descendants = None
+
+        for node in self._nodes:
+            node.graph = self
+
+    @property
+    def nodes(self):
+        """
+        :return: all nodes of the graph.
+        :rtype: list of yagocd.resources.BaseNode
+        """
+        self._build()
+        return list(self._nodes)
+
+    def __len__(self):
+        self._build()
+        return len(self._nodes)
+
+    def __contains__(self, node):
+        self._build()
+        return node in self._index
+
+    def invalidate(self):
+        """
+        Drops computed reachability index. It will be rebuilt from the
+        current links of the nodes on the next query.
+        """
+        self._index = None
+        self._predecessors = None
+        self._descendants = None
+
+    def predecessors(self, node, transitive=False):
+        """
+        Method for getting predecessors (parents) of the node.
+
+        :param node: node of the graph.
+        :param transitive: if ``True``, return all predecessors reachable
+        from the node, not only the direct ones.
+        :return: list of predecessors in the order of graph nodes.
+        :rtype: list of yagocd.resources.BaseNode
+        """
+        if not transitive:
+            return node.predecessors
+
+        self._build()
+        return list(self._predecessors.nodes(self._index[node]))
+
+    def descendants(self, node, transitive=False):
+        """
+        Method for getting descendants (children) of the node.
+
+        :param node: node of the graph.
+        :param transitive: if ``True``, return all descendants reachable
+        from the node, not only the direct ones.
+        :return: list of descendants in the order of graph nodes.
+        :rtype: list of yagocd.resources.BaseNode
+        """
+        if not transitive:
+            return node.descendants
+
+        self._build()
+        return list(self._descendants.nodes(self._index[node]))
+
+    def is_predecessor(self, node, other):
+        """
+        Checks whether `other` is a direct or transitive predecessor of `node`.
+
+        :rtype: bool
+        """
+        self._build()
+        return self._predecessors.reaches(self._index[node], self._index[other])
+
+    def is_descendant(self, node, other):
+        """
+        Checks whether `other` is a direct or transitive descendant of `node`.
+
+        :rtype: bool
+        """
+        self._build()
+        return self._descendants.reaches(self._index[node], self._index[other])
+
+    def _build(self):
+        if self._index is not None:
+            return
+
+        nodes = self._nodes
+        index = dict((node, position) for position, node in enumerate(nodes))
+        # include nodes, which are linked to the graph but were not listed
+        position = 0
+        while position < len(nodes):
+            node = nodes[position]
+            for near in node.predecessors + node.descendants:
+                if near not in index:
+                    index[near] = len(nodes)
+                    nodes.append(near)
+                    near.graph = self
+            position += 1
+
+        self._predecessors = _Reachability(nodes, index, lambda node: node.predecessors)
+        self._descendants = _Reachability(nodes, index, lambda node: node.descendants)
+        self._index = index
+
+
+class _Reachability(object):
+    """
+    Transitive closure of one direction of the graph. Strongly connected
+    components are found with iterative Tarjan's algorithm, which emits
+    every component after all components reachable from it, so their
+    bitsets are ready by the time they are needed.
+    """
+
+    def __init__(self, nodes, index, near_nodes):
+        self._nodes = nodes
+        edges = [[index[near] for near in near_nodes(node)] for node in nodes]
+
+        self._component = [None] * len(nodes)
+        self._reach = list()
+        self._decoded = dict()
+
+        order = [None] * len(nodes)
+        low = [0] * len(nodes)
+        on_stack = [False] * len(nodes)
+        stack = list()
+        counter = 0
+
+        for root in range(len(nodes)):
+            if order[root] is not None:
+                continue
+
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, iter(edges[root]))]
+
+            while work:
+                vertex, neighbours = work[-1]
+                for near in neighbours:
+                    if order[near] is None:
+                        order[near] = low[near] = counter
+                        counter += 1
+                        stack.append(near)
+                        on_stack[near] = True
+                        work.append((near, iter(edges[near])))
+                        break
+                    elif on_stack[near]:
+                        low[vertex] = min(low[vertex], order[near])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[vertex])
+                    if low[vertex] == order[vertex]:
+                        self._add_component(vertex, stack, on_stack, edges)
+
+    def _add_component(self, root, stack, on_stack, edges):
+        component = len(self._reach)
+        members = list()
+        while True:
+            vertex = stack.pop()
+            on_stack[vertex] = False
+            self._component[vertex] = component
+            members.append(vertex)
+            if vertex == root:
+                break
+
+        bits = 0
+        member_bits = 0
+        cyclic = len(members) > 1
+        for vertex in members:
+            member_bits |= 1 << vertex
+            for near in edges[vertex]:
+                other = self._component[near]
+                if other == component:
+                    cyclic = True
+                else:
+                    bits |= self._reach[other] | (1 << near)
+
+        if cyclic:
+            bits |= member_bits
+        self._reach.append(bits)
+
+    def reaches(self, source, target):
+        return bool(self._reach[self._component[source]] >> target & 1)
+
+    def nodes(self, source):
+        component = self._component[source]
+        result = self._decoded.get(component)
+        if result is None:
+            result = list()
+            bits = bin(self._reach[component])[:1:-1]
+            position = bits.find('1')
+            while position != -1:
+                result.append(self._nodes[position])
+                position = bits.find('1', position + 1)
+            self._decoded[component] = result
+        return result
@@ -27,9 +27,7 @@
 #
 ###############################################################################
 
-from easydict import EasyDict
-
-from yagocd.util import YagocdUtil
+from yagocd.util import AttrDict, YagocdUtil
 
 
 class BaseManager(object):
@@ -54,6 +52,30 @@ class BaseManager(object):
         self._session = session
         self.base_api = self._session.base_api()
 
+    @classmethod
+    def shared(cls, session):
+        """
+        Method for getting an instance of the manager, shared by everything
+        working with the given session. Entities use it instead of creating
+        their own managers, so building thousands of entities doesn't
+        allocate thousands of managers.
+
+        Instances are kept in the session itself and live as long as it.
+        Only managers, which need nothing but a session to be constructed,
+        could be shared.
+
+        :param session: session object from client.
+        :type session: yagocd.session.Session
+        :return: instance of the manager.
+        """
+        manager = session._shared_managers.get(cls)
+        if manager is None:
+            with session._lock:
+                manager = session._shared_managers.get(cls)
+                if manager is None:
+                    manager = session._shared_managers[cls] = cls(session=session)
+        return manager
+
     def _accept_header(self):
         """
         Method for determining correct `Accept` header.
@@ -82,12 +104,16 @@ class BaseManager(object):
 
 
 class Base(object):
+    __slots__ = ('_session', '_data', '_etag')
+
     def __init__(self, session, data, etag=None):
         self._session = session
-        self._data = EasyDict(data)
+        self._data = AttrDict(data or {})
         self._etag = etag
 
-        self.base_api = self._session.base_api()
+    @property
+    def base_api(self):
+        return self._session.base_api()
 
     @property
     def data(self):
@@ -105,11 +131,29 @@ class Base(object):
 
 
 class BaseNode(Base):
+    __slots__ = ('_predecessors', '_descendants', '_graph')
+
     def __init__(self, session, data):
         super(BaseNode, self).__init__(session, data)
 
         self._predecessors = list()
         self._descendants = list()
+        self._graph = None
+
+    @property
+    def graph(self):
+        """
+        Property for getting reachability index this node belongs to.
+        When set, transitive predecessors and descendants are taken from it
+        instead of walking the graph on every call.
+
+        :rtype: yagocd.graph.DependencyGraph
+        """
+        return self._graph
+
+    @graph.setter
+    def graph(self, value):
+        self._graph = value
 
     def get_predecessors(self, transitive=False):
         """
@@ -121,11 +165,15 @@ class BaseNode(Base):
         """
         result = self._predecessors
         if transitive:
+            if self._graph is not None:
+                return self._graph.predecessors(self, transitive=True)
             return YagocdUtil.graph_depth_walk(result, lambda v: v.predecessors)
         return result
 
     def set_predecessors(self, value):
         self._predecessors = value
+        if self._graph is not None:
+            self._graph.invalidate()
 
     predecessors = property(get_predecessors, set_predecessors)
 
@@ -140,10 +188,14 @@ class BaseNode(Base):
         """
         result = self._descendants
         if transitive:
+            if self._graph is not None:
+                return self._graph.descendants(self, transitive=True)
             return YagocdUtil.graph_depth_walk(result, lambda v: v.descendants)
         return result
 
     def set_descendants(self, value):
         self._descendants = value
+        if self._graph is not None:
+            self._graph.invalidate()
 
     descendants = property(get_descendants, set_descendants)
@@ -30,7 +30,7 @@ import json
 
 from yagocd.resources import Base, BaseManager
 from yagocd.resources.job import JobInstance
-from yagocd.util import since
+from yagocd.util import since, YagocdUtil
 
 
 @since('15.2.0')
@@ -206,6 +206,22 @@ class AgentManager(BaseManager):
             jobs.append(JobInstance(session=self._session, data=data, stage=None))
         return jobs
 
+    @since('14.3.0')
+    def full_job_history(self, uuid, look_ahead=0):
+        """
+        Lists all the jobs that have executed on an agent.
+
+        :versionadded: 14.3.0.
+
+        This method uses generator to get full job history.
+        :param uuid: uuid of the agent.
+        :param look_ahead: number of next pages to fetch in parallel, while current one is consumed.
+        :return: an array of :class:`yagocd.resources.job.JobInstance` along with the job transitions.
+        :rtype: list of yagocd.resources.job.JobInstance
+        """
+        for job in YagocdUtil.paginate(lambda offset: self.job_history(uuid, offset), look_ahead=look_ahead):
+            yield job
+
 
 class AgentEntity(Base):
-    pass
+    __slots__ = ()
@@ -26,10 +26,23 @@
 #
 ###############################################################################
 
+import fnmatch
+import heapq
+import os
+import posixpath
+import re
+import threading
 import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
+import six
+
+from yagocd.download import Downloader
 from yagocd.exception import YagocdException
 from yagocd.resources import Base, BaseManager
+from yagocd.upload import MultipartStream, ZipStream
 from yagocd.util import RequireParamMixin, since
 
 
@@ -53,6 +66,14 @@ class ArtifactManager(BaseManager, RequireParamMixin):
     NAME_FIELD = 'name'
     FILES_FIELD = 'files'
 
+    # md5 sums of all artifacts, written by the agent after uploading them
+    CHECKSUM_PATH = '/cruise-output/md5.checksum'
+    DEFAULT_MIRROR_WORKERS = 8
+    DEFAULT_DIRECTORY_WORKERS = 8
+
+    # number of job listings to keep parsed and indexed
+    LISTING_CACHE_SIZE = 32
+
     def __init__(
         self,
         session,
@@ -90,6 +111,9 @@ class ArtifactManager(BaseManager, RequireParamMixin):
         self._stage_counter = stage_counter
         self._job_name = job_name
 
+        self._listings = OrderedDict()
+        self._listings_lock = threading.Lock()
+
     def __iter__(self):
         """
         Method for iterating over all artifacts, using `walk`.
@@ -152,11 +176,15 @@ class ArtifactManager(BaseManager, RequireParamMixin):
         pipeline_counter=None,
         stage_name=None,
         stage_counter=None,
-        job_name=None
+        job_name=None,
+        refresh=True
     ):
         """
         Artifact tree generator - analogue of `os.walk`.
 
+        The listing of the job is requested on every call, unless `refresh`
+        is disabled to walk the cached one, see :meth:`listing`.
+
         :param top: root path, from which traversal would be started.
         :param topdown: if is True or not specified, directories are scanned
         from top-down. If topdown is set to False, directories are scanned
@@ -166,82 +194,146 @@ class ArtifactManager(BaseManager, RequireParamMixin):
         :param stage_name: name of the stage.
         :param stage_counter: stage counter.
         :param job_name: name of the job.
+        :param refresh: request the listing again instead of walking the cached one.
         :rtype: collections.Iterator[
             (str, list[yagocd.resources.artifact.Artifact], list[yagocd.resources.artifact.Artifact])
         ]
         """
-        artifacts = self.list(
+        listing = self.listing(
+            refresh=refresh,
             pipeline_name=pipeline_name,
             pipeline_counter=pipeline_counter,
             stage_name=stage_name,
             stage_counter=stage_counter,
             job_name=job_name
         )
-        return self._json_walk(top=top, topdown=topdown, artifacts=artifacts)
+        return listing.walk(top=top, topdown=topdown)
 
-    def _json_walk(self, top, topdown, artifacts):
+    def listing(
+        self,
+        refresh=False,
+        pipeline_name=None,
+        pipeline_counter=None,
+        stage_name=None,
+        stage_counter=None,
+        job_name=None
+    ):
         """
-        JSON walker - analogue of `os.walk`.
-        Recursively walks through internal representation of the Artifact object.
+        Gets listing of all artifacts in a job, indexed by path.
 
-        :param top: top or root path from which to start traversing.
-        :param topdown: if is True or not specified, directories are scanned
-        from top-down. If topdown is set to False, directories are scanned
-        from bottom-up.
-        :param artifacts: original list of artifacts, obtained from `list` method.
-        :rtype: collections.Iterator[
-            (str, list[yagocd.resources.artifact.Artifact], list[yagocd.resources.artifact.Artifact])
-        ]
-        """
-        folders = list()
-        files = list()
-        children = self._get_children(artifacts, top)
-        if children is None:
-            return
+        The listing is requested once and kept for every job, so walking
+        the tree or looking up artifacts again doesn't make new requests.
+        Listing of a job is forgotten after uploading an artifact to it.
+        Artifacts of a job, which is still running, could be added later
+        by its agent, so use `refresh` to see them.
 
-        for artifact in children:
-            artifact_type = artifact.data.get(self.TYPE_FIELD)
-            if artifact_type == self.FOLDER_TYPE:
-                folders.append(artifact)
-            elif artifact_type == self.FILE_TYPE:
-                files.append(artifact)
-            else:
-                raise ValueError("Unknown artifact type '{}'!".format(artifact_type))
+        :versionadded: 14.3.0.
 
-        if topdown:
-            yield top, folders, files
-        for folder in folders:
-            new_path = self._session.urljoin(top, folder.data.get(self.NAME_FIELD))
+        :param refresh: request the listing again, even if it's cached.
+        :param pipeline_name: name of the pipeline.
+        :param pipeline_counter: pipeline counter.
+        :param stage_name: name of the stage.
+        :param stage_counter: stage counter.
+        :param job_name: name of the job.
+        :rtype: yagocd.resources.artifact.ArtifactListing
+        """
+        func_args = locals()
+        key = self._listing_key({p: self._require_param(p, func_args) for p in self.PATH_PARAMETERS})
+
+        with self._listings_lock:
+            listing = None if refresh else self._listings.pop(key, None)
+        if listing is None:
+            listing = ArtifactListing(self.list(
+                pipeline_name=pipeline_name,
+                pipeline_counter=pipeline_counter,
+                stage_name=stage_name,
+                stage_counter=stage_counter,
+                job_name=job_name
+            ))
+
+        with self._listings_lock:
+            self._listings[key] = listing
+            while len(self._listings) > self.LISTING_CACHE_SIZE:
+                self._listings.popitem(last=False)
+
+        return listing
+
+    def find(
+        self,
+        predicate,
+        top='/',
+        pipeline_name=None,
+        pipeline_counter=None,
+        stage_name=None,
+        stage_counter=None,
+        job_name=None,
+        refresh=False
+    ):
+        """
+        Finds artifacts, matching the predicate, in the cached listing of a job
+        without downloading them.
 
-            for x in self._json_walk(new_path, topdown, children):
-                yield x
+        :versionadded: 14.3.0.
 
-        if not topdown:
-            yield top, folders, files
+        :param predicate: callable, receiving an artifact and returning ``True``
+        if it should be found.
+        :param top: path of the folder to search in.
+        :param pipeline_name: name of the pipeline.
+        :param pipeline_counter: pipeline counter.
+        :param stage_name: name of the stage.
+        :param stage_counter: stage counter.
+        :param job_name: name of the job.
+        :param refresh: request the listing again, e.g. if the job is still running.
+        :rtype: collections.Iterator[yagocd.resources.artifact.Artifact]
+        """
+        listing = self.listing(
+            refresh=refresh,
+            pipeline_name=pipeline_name,
+            pipeline_counter=pipeline_counter,
+            stage_name=stage_name,
+            stage_counter=stage_counter,
+            job_name=job_name
+        )
+        return listing.find(predicate=predicate, top=top)
 
-    def _get_children(self, artifacts, path):
+    def glob(
+        self,
+        pattern,
+        pipeline_name=None,
+        pipeline_counter=None,
+        stage_name=None,
+        stage_counter=None,
+        job_name=None,
+        refresh=False
+    ):
         """
-        Method for extracting artifact children from a given artifacts list by some path.
+        Finds artifacts by path pattern in the cached listing of a job
+        without downloading them, e.g. `test-reports/**/*.xml`.
+        See :meth:`ArtifactListing.glob` for the syntax.
 
-        :param artifacts: list of artifacts from which to extract path.
-        :param path: string representing POSIX path.
-        :return: nested artifacts, located at the given path.
-        :rtype: list[yagocd.resources.artifact.Artifact]
+        :versionadded: 14.3.0.
+
+        :param pattern: pattern of artifact paths.
+        :param pipeline_name: name of the pipeline.
+        :param pipeline_counter: pipeline counter.
+        :param stage_name: name of the stage.
+        :param stage_counter: stage counter.
+        :param job_name: name of the job.
+        :param refresh: request the listing again, e.g. if the job is still running.
+        :rtype: collections.Iterator[yagocd.resources.artifact.Artifact]
         """
-        if not path or path in ['/']:
-            return artifacts
-
-        for candidate in artifacts:
-            if candidate.path.rstrip('/') == path.rstrip('/'):
-                children = candidate.data.get(self.FILES_FIELD)
-                if children is None:
-                    return  # case for a file type
-                else:
-                    return [Artifact(session=self._session, data=data) for data in children]
-        else:
-            raise ValueError("Can't find requested path '{path}' in the given artifacts '{artifacts}'!".format(
-                path=path, artifacts=artifacts)
-            )
+        listing = self.listing(
+            refresh=refresh,
+            pipeline_name=pipeline_name,
+            pipeline_counter=pipeline_counter,
+            stage_name=stage_name,
+            stage_counter=stage_counter,
+            job_name=job_name
+        )
+        return listing.glob(pattern)
+
+    def _listing_key(self, parameters):
+        return tuple(str(parameters[p]) for p in self.PATH_PARAMETERS)
 
     def file(
         self,
@@ -352,21 +444,406 @@ class ArtifactManager(BaseManager, RequireParamMixin):
         :param job_name: name of the job.
         :return: The requested directory contents in the form of a zip file.
         """
+        return self._wait(
+            lambda: self.directory(path, pipeline_name, pipeline_counter, stage_name, stage_counter, job_name),
+            timeout=timeout,
+            backoff=backoff,
+            max_wait=max_wait
+        )
+
+    def directory_extract(
+        self,
+        path,
+        local_dir,
+        timeout=60,
+        backoff=0.4,
+        max_wait=4,
+        spool_size=Downloader.DEFAULT_SPOOL_SIZE,
+        chunk_size=Downloader.DEFAULT_CHUNK_SIZE,
+        progress=None,
+        pipeline_name=None,
+        pipeline_counter=None,
+        stage_name=None,
+        stage_counter=None,
+        job_name=None,
+    ):
+        """
+        Gets an artifact directory by its path and extracts it into the
+        local directory. Like `directory_wait`, this method waits for the
+        directory to be compressed by the server, but instead of returning
+        the zip as bytes, streams it into a temporary file, which is kept
+        in memory only while it's smaller than ``spool_size``.
+
+        :versionadded: 14.3.0.
+
+        :param path: path to directory.
+        :param local_dir: local directory to extract files into.
+        :param timeout: timeout in seconds to wait for directory.
+        :param backoff: backoff value.
+        :param max_wait: maximum wait amount.
+        :param spool_size: maximum size of the zip in bytes to keep in memory.
+        :param chunk_size: size of chunks in bytes to read the zip with.
+        :param progress: callable, receiving number of bytes received so far
+        and expected total (or ``None`` if it's unknown) after every chunk.
+        :param pipeline_name: name of the pipeline.
+        :param pipeline_counter: pipeline counter.
+        :param stage_name: name of the stage.
+        :param stage_counter: stage counter.
+        :param job_name: name of the job.
+        :return: paths to extracted files and directories or ``None``, if
+        the directory wasn't compressed in time.
+        :rtype: list
+        """
+        func_args = locals()
+        parameters = {p: self._require_param(p, func_args) for p in self.PATH_PARAMETERS}
+
+        url = self._session.urljoin(self.RESOURCE_PATH, path).format(base_api=self.base_api, **parameters)
+        downloader = Downloader(chunk_size=chunk_size, progress=progress, algorithm=None)
+
+        def extract():
+            response = self._get_streamed(url)
+            if response is None:
+                return None
+            return downloader.extract(response, local_dir, spool_size=spool_size)
+
+        return self._wait(extract, timeout=timeout, backoff=backoff, max_wait=max_wait)
+
+    def directories_wait(
+        self,
+        directories,
+        timeout=60,
+        backoff=0.4,
+        max_wait=4,
+        workers=DEFAULT_DIRECTORY_WORKERS,
+    ):
+        """
+        Gets many artifact directories at once, e.g. of all jobs of a stage.
+        Directories are requested in parallel and polled from a single loop:
+        each one, which is still being compressed, is requested again after
+        its own backoff, like `directory_wait` does, and is yielded as soon
+        as its zip is ready. So the total wait is the longest compression
+        time instead of the sum of them.
+
+        :versionadded: 14.3.0.
+
+        :param directories: paths of directories of the job, known to the
+        manager, or dictionaries with `path` and any of `pipeline_name`,
+        `pipeline_counter`, `stage_name`, `stage_counter` and `job_name`.
+        :param timeout: timeout in seconds to wait for each directory.
+        :param backoff: backoff value.
+        :param max_wait: maximum wait amount.
+        :param workers: number of requests to make in parallel.
+        :return: pairs of the requested directory and its zip, or ``None``
+        if it wasn't compressed in time, in order of readiness.
+        :rtype: collections.Iterator[tuple]
+        """
+        directories = list(directories)
+        fetches = [self._directory_fetch(directory) for directory in directories]
+        if not fetches:
+            return
+
+        workers = min(workers, len(fetches))
+        with self._session.pooled(workers) as pool:
+            fetches = [pool.bind(fetch) for fetch in fetches]
+            for index, directory_zip in self._wait_many(fetches, timeout, backoff, max_wait, workers):
+                yield directories[index], directory_zip
+
+    def _directory_fetch(self, directory):
+        if isinstance(directory, six.string_types):
+            directory = dict(path=directory)
+
+        values = {p: directory.get(p) for p in self.PATH_PARAMETERS}
+        parameters = {p: self._require_param(p, values) for p in self.PATH_PARAMETERS}
+        path = directory['path']
+        return lambda: self.directory(path=path, **parameters)
+
+    @staticmethod
+    def _wait(fetch, timeout, backoff, max_wait):
         start_time = time.time()
         time_elapsed = 0
         counter = 0
-        directory_zip = None
+        result = None
 
         while time_elapsed < timeout:
-            directory_zip = self.directory(path, pipeline_name, pipeline_counter, stage_name, stage_counter, job_name)
-            if directory_zip is not None:
+            result = fetch()
+            if result is not None:
                 break
 
             time.sleep(min(backoff * (2 ** counter), max_wait))
             counter += 1
             time_elapsed = time.time() - start_time
 
-        return directory_zip
+        return result
+
+    @staticmethod
+    def _wait_many(fetches, timeout, backoff, max_wait, workers):
+        # heap of (time, index) of fetches to be made: the earliest one is first
+        schedule = [(0, index) for index in range(len(fetches))]
+        counters = [0] * len(fetches)
+        started = [None] * len(fetches)
+        pending = dict()
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            while schedule or pending:
+                now = time.time()
+                while schedule and schedule[0][0] <= now and len(pending) < workers:
+                    _, index = heapq.heappop(schedule)
+                    if started[index] is None:
+                        started[index] = now
+                    pending[executor.submit(fetches[index])] = index
+
+                for future in ArtifactManager._next_done(pending, schedule, workers):
+                    index = pending.pop(future)
+                    result = future.result()
+                    if result is None:
+                        due = time.time() + min(backoff * (2 ** counters[index]), max_wait)
+                        counters[index] += 1
+                        if due - started[index] < timeout:
+                            heapq.heappush(schedule, (due, index))
+                            continue
+
+                    yield index, result
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _next_done(pending, schedule, workers):
+        delay = None
+        if schedule and len(pending) < workers:
+            delay = max(schedule[0][0] - time.time(), 0)
+
+        if not pending:
+            time.sleep(delay)
+            return []
+
+        done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+        return done
+
+    def _get_streamed(self, url, headers=None):
+        response = self._session.get(path=url, headers=headers, stream=True)
+        # server is still compressing the directory
+        if response.status_code == 202:
+            response.close()
+            return None
+        return response
+
+    def download(
+        self,
+        path,
+        destination,
+        chunk_size=Downloader.DEFAULT_CHUNK_SIZE,
+        progress=None,
+        algorithm=Downloader.DEFAULT_ALGORITHM,
+        resume=False,
+        segments=None,
+        pipeline_name=None,
+        pipeline_counter=None,
+        stage_name=None,
+        stage_counter=None,
+        job_name=None,
+    ):
+        """
+        Streams an artifact file or directory zip by its path to the
+        destination in chunks, without loading it into memory.
+
+        With ``resume`` enabled, the body is written to ``<destination>.part``
+        file, which is kept if the transfer is interrupted: the next download
+        requests only the missing bytes with ``Range`` header. If the server
+        ignores ranges, the file is downloaded from start.
+
+        With ``segments`` set, large file is split into up to that many byte
+        ranges, which are fetched in parallel over pooled connections and
+        written right into their places in the destination file. If the
+        server doesn't support ranges, the file is downloaded in one stream.
+
+        :versionadded: 14.3.0.
+
+        :param path: path to the file or directory zip, e.g. `target/dist.zip`.
+        :param destination: path to the local file or binary file-like object to write to.
+        :param chunk_size: size of chunks in bytes.
+        :param progress: callable, receiving number of bytes written so far
+        and expected total (or ``None`` if it's unknown) after every chunk.
+        :param algorithm: name of :mod:`hashlib` algorithm for checksum or ``None``.
+        :param resume: continue previously interrupted download, `destination`
+        should be a path then.
+        :param segments: number of byte ranges to download in parallel,
+        `destination` should be a path then.
+        :param pipeline_name: name of the pipeline.
+        :param pipeline_counter: pipeline counter.
+        :param stage_name: name of the stage.
+        :param stage_counter: stage counter.
+        :param job_name: name of the job.
+        :return: number of bytes written and their checksum, or ``None`` if the
+        server is still compressing the requested directory (`202 Accepted`).
+        :rtype: yagocd.download.DownloadResult
+        """
+        if resume and segments:
+            raise ValueError("Segmented download can't be resumed!")
+
+        func_args = locals()
+        parameters = {p: self._require_param(p, func_args) for p in self.PATH_PARAMETERS}
+
+        url = self._session.urljoin(self.RESOURCE_PATH, path).format(base_api=self.base_api, **parameters)
+
+        def request(headers=None):
+            return self._get_streamed(url, headers=headers)
+
+        downloader = Downloader(chunk_size=chunk_size, progress=progress, algorithm=algorithm)
+        if resume:
+            return downloader.resume(request, destination)
+        if segments:
+            with self._session.pooled(segments) as pool:
+                return downloader.segmented(pool.bind(request), destination, segments=segments)
+
+        response = request()
+        if response is None:
+            return None
+        return downloader.save(response, destination)
+
+    def mirror(
+        self,
+        local_dir,
+        top='/',
+        workers=DEFAULT_MIRROR_WORKERS,
+        chunk_size=Downloader.DEFAULT_CHUNK_SIZE,
+        pipeline_name=None,
+        pipeline_counter=None,
+        stage_name=None,
+        stage_counter=None,
+        job_name=None,
+    ):
+        """
+        Downloads all artifact files of a job into the local directory,
+        keeping the tree structure. Files are streamed by a bounded pool of
+        workers, which get connections of their own, if the pool of the
+        session is smaller (see :meth:`yagocd.session.Session.pooled`).
+
+        Files are checked against md5 sums from `cruise-output/md5.checksum`,
+        which the agent uploads together with artifacts. Local copies with
+        matching checksum (or size, if listing has it) are not downloaded
+        again, and downloaded files with different checksum are removed.
+
+        :versionadded: 14.3.0.
+
+        :param local_dir: path to the local directory.
+        :param top: path of the artifact folder to mirror.
+        :param workers: number of files to download in parallel.
+        :param chunk_size: size of chunks in bytes.
+        :param pipeline_name: name of the pipeline.
+        :param pipeline_counter: pipeline counter.
+        :param stage_name: name of the stage.
+        :param stage_counter: stage counter.
+        :param job_name: name of the job.
+        :return: dictionary with lists of ``downloaded`` and ``skipped`` artifact paths.
+        :rtype: dict[str, list[str]]
+        """
+        func_args = locals()
+        parameters = {p: self._require_param(p, func_args) for p in self.PATH_PARAMETERS}
+
+        listing = self.listing(**parameters)
+        files = list()
+        for path, folders, items in listing.walk(top=top, topdown=True):
+            local_path = self._local_path(local_dir, top, path)
+            if not os.path.isdir(local_path):
+                os.makedirs(local_path)
+            files.extend((item, self._local_path(local_dir, top, item.path)) for item in items)
+
+        checksums = self._checksums(listing)
+        result = dict(downloaded=list(), skipped=list())
+
+        pending = list()
+        for item, local_path in files:
+            checksum = checksums.get(item.path.lstrip(Artifact.SEP))
+            if self._is_mirrored(item, local_path, checksum):
+                result['skipped'].append(item.path)
+            else:
+                pending.append((item, local_path, checksum))
+
+        futures = list()
+        pool = self._session.pooled(workers)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            mirror_file = pool.bind(self._mirror_file)
+            futures = [executor.submit(mirror_file, item, local_path, checksum, chunk_size)
+                       for item, local_path, checksum in pending]
+            for (item, _, _), future in zip(pending, futures):
+                future.result()
+                result['downloaded'].append(item.path)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=True)
+            pool.close()
+
+        return result
+
+    @staticmethod
+    def _local_path(local_dir, top, path):
+        relative = path[len(top.rstrip(Artifact.SEP)):].strip(Artifact.SEP)
+        return os.path.join(local_dir, *relative.split(Artifact.SEP)) if relative else local_dir
+
+    def _checksums(self, listing):
+        """
+        Reads md5 sums of artifacts from the checksum file, if it's uploaded.
+
+        :param listing: listing of job artifacts.
+        :type listing: yagocd.resources.artifact.ArtifactListing
+        :return: dictionary of checksums by artifact path, relative to the job.
+        :rtype: dict[str, str]
+        """
+        checksum_file = listing.get(self.CHECKSUM_PATH)
+        if checksum_file is None:
+            return dict()
+        return self._parse_checksums(checksum_file.fetch())
+
+    @staticmethod
+    def _parse_checksums(content):
+        """
+        Parses checksum file, which is in Java properties format.
+
+        :param content: content of the file.
+        :return: dictionary of checksums by artifact path.
+        :rtype: dict[str, str]
+        """
+        if isinstance(content, bytes):
+            content = content.decode('utf-8')
+
+        checksums = dict()
+        for line in content.splitlines():
+            line = line.strip()
+            if not line or line[0] in '#!':
+                continue
+            match = re.match(r'((?:[^\\=:]|\\.)*)\s*[=:]\s*(.*)', line)
+            if match is None:
+                continue
+            key, value = match.groups()
+            checksums[re.sub(r'\\(.)', r'\1', key.strip())] = value.strip()
+
+        return checksums
+
+    @staticmethod
+    def _is_mirrored(artifact, local_path, checksum):
+        if not os.path.isfile(local_path):
+            return False
+        if checksum is not None:
+            return Downloader(algorithm='md5').checksum(local_path) == checksum
+
+        size = artifact.data.get('size')
+        return size is not None and os.path.getsize(local_path) == size
+
+    @staticmethod
+    def _mirror_file(artifact, local_path, checksum, chunk_size):
+        result = artifact.download(local_path, chunk_size=chunk_size, algorithm='md5' if checksum else None)
+        if checksum is not None and result.checksum != checksum:
+            os.remove(local_path)
+            raise YagocdException("Checksum of <{}> mismatches: expected {}, got {}".format(
+                artifact.path, checksum, result.checksum
+            ))
 
     def create(
         self,
@@ -396,13 +873,16 @@ class ArtifactManager(BaseManager, RequireParamMixin):
         func_args = locals()
         parameters = {p: self._require_param(p, func_args) for p in self.PATH_PARAMETERS}
 
-        response = self._session.post(
-            path=self._session.urljoin(self.RESOURCE_PATH, path).format(base_api=self.base_api, **parameters),
-            files={'file': open(filename, 'rb')},
-            headers={
-                'Confirm': 'true'
-            },
-        )
+        with open(filename, 'rb') as f:
+            response = self._session.post(
+                path=self._session.urljoin(self.RESOURCE_PATH, path).format(base_api=self.base_api, **parameters),
+                files={'file': f},
+                headers={
+                    'Confirm': 'true'
+                },
+            )
+        with self._listings_lock:
+            self._listings.pop(self._listing_key(parameters), None)
 
         return response.text
 
@@ -434,14 +914,353 @@ class ArtifactManager(BaseManager, RequireParamMixin):
         func_args = locals()
         parameters = {p: self._require_param(p, func_args) for p in self.PATH_PARAMETERS}
 
-        response = self._session.put(
-            path=self._session.urljoin(self.RESOURCE_PATH, path).format(base_api=self.base_api, **parameters),
-            files={'file': open(filename, 'rb')}
+        with open(filename, 'rb') as f:
+            response = self._session.put(
+                path=self._session.urljoin(self.RESOURCE_PATH, path).format(base_api=self.base_api, **parameters),
+                files={'file': f}
+            )
+        with self._listings_lock:
+            self._listings.pop(self._listing_key(parameters), None)
+
+        return response.text
+
+    def upload(
+        self,
+        path,
+        source,
+        append=False,
+        chunk_size=MultipartStream.DEFAULT_CHUNK_SIZE,
+        pipeline_name=None,
+        pipeline_counter=None,
+        stage_name=None,
+        stage_counter=None,
+        job_name=None,
+    ):
+        """
+        Uploads content as an artifact without writing it to a local file.
+        The content is streamed to the server chunk by chunk, so it doesn't
+        need to fit in memory.
+
+        :versionadded: 14.3.0.
+
+        :param path: path to the file within job directory.
+        :param source: bytes-like object, binary file-like object or an
+        iterable of bytes, e.g. a generator. File objects are left open,
+        iterators are closed once the request is done.
+        :param append: append the content to an existing artifact instead
+        of creating a new one.
+        :param chunk_size: size of chunks in bytes to read file objects with.
+        :param pipeline_name: name of the pipeline.
+        :param pipeline_counter: pipeline counter.
+        :param stage_name: name of the stage.
+        :param stage_counter: stage counter.
+        :param job_name: name of the job.
+        :return: an acknowledgement that the file was created or appended.
+        """
+        func_args = locals()
+        parameters = {p: self._require_param(p, func_args) for p in self.PATH_PARAMETERS}
+
+        body = MultipartStream(source, filename=posixpath.basename(path.rstrip('/')), chunk_size=chunk_size)
+        url = self._session.urljoin(self.RESOURCE_PATH, path).format(base_api=self.base_api, **parameters)
+        try:
+            if append:
+                response = self._session.put(path=url, data=body, headers={'Content-Type': body.content_type})
+            else:
+                response = self._session.post(
+                    path=url,
+                    data=body,
+                    headers={
+                        'Confirm': 'true',
+                        'Content-Type': body.content_type
+                    },
+                )
+        finally:
+            body.close()
+
+        with self._listings_lock:
+            self._listings.pop(self._listing_key(parameters), None)
+
+        return response.text
+
+    def upload_directory(
+        self,
+        local_dir,
+        path,
+        compression=zipfile.ZIP_DEFLATED,
+        chunk_size=ZipStream.DEFAULT_CHUNK_SIZE,
+        pipeline_name=None,
+        pipeline_counter=None,
+        stage_name=None,
+        stage_counter=None,
+        job_name=None,
+    ):
+        """
+        Uploads a local directory as artifacts in a single request. The
+        directory is zipped while it's being sent, without a temporary file,
+        and the server extracts the archive into the given path.
+
+        :versionadded: 14.3.0.
+
+        :param local_dir: local directory to upload.
+        :param path: path to the directory within job directory.
+        :param compression: ``zipfile.ZIP_DEFLATED`` or ``zipfile.ZIP_STORED``,
+        which skips compression of already compressed files, but reads them twice.
+        :param chunk_size: size of chunks in bytes to read files and send the archive with.
+        :param pipeline_name: name of the pipeline.
+        :param pipeline_counter: pipeline counter.
+        :param stage_name: name of the stage.
+        :param stage_counter: stage counter.
+        :param job_name: name of the job.
+        :return: an acknowledgement that the files were created.
+        """
+        func_args = locals()
+        parameters = {p: self._require_param(p, func_args) for p in self.PATH_PARAMETERS}
+
+        if not os.path.isdir(local_dir):
+            raise ValueError("Local path <{}> is not a directory".format(local_dir))
+
+        archive = ZipStream(local_dir, compression=compression, chunk_size=chunk_size)
+        # server extracts archives, sent in `zipfile` field
+        body = MultipartStream(
+            archive,
+            field='zipfile',
+            filename='{}.zip'.format(posixpath.basename(path.rstrip('/')) or 'artifacts'),
+            content_type='application/zip'
         )
+        try:
+            response = self._session.post(
+                path=self._session.urljoin(self.RESOURCE_PATH, path).format(base_api=self.base_api, **parameters),
+                data=body,
+                headers={
+                    'Confirm': 'true',
+                    'Content-Type': body.content_type
+                },
+            )
+        finally:
+            body.close()
+
+        with self._listings_lock:
+            self._listings.pop(self._listing_key(parameters), None)
 
         return response.text
 
 
+class ArtifactListing(object):
+    """
+    Listing of all artifacts in a job.
+
+    Nested artifacts are created once and indexed by their path, so any
+    of them could be found without scanning the tree.
+    """
+
+    # part of glob pattern, matching any number of nested folders
+    RECURSIVE = '**'
+
+    def __init__(self, artifacts):
+        """
+        :param artifacts: top level artifacts of a job, as returned by
+        :meth:`ArtifactManager.list`. They are linked to the listing.
+        :type artifacts: list[yagocd.resources.artifact.Artifact]
+        """
+        self._artifacts = artifacts
+        self._index = dict()
+        self._children = dict()
+
+        stack = list(artifacts)
+        while stack:
+            artifact = stack.pop()
+            artifact._listing = self
+
+            key = self._key(artifact.path)
+            self._index[key] = artifact
+
+            children = artifact.data.get(ArtifactManager.FILES_FIELD)
+            if children is not None:
+                self._children[key] = [
+                    Artifact(session=artifact._session, data=data, listing=self) for data in children
+                ]
+                stack.extend(self._children[key])
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        """
+        Iterates over artifacts at all levels.
+
+        :rtype: collections.Iterator[yagocd.resources.artifact.Artifact]
+        """
+        return iter(self._index.values())
+
+    def __contains__(self, path):
+        return self._key(path) in self._index
+
+    @staticmethod
+    def _key(path):
+        return path.rstrip(Artifact.SEP)
+
+    @property
+    def artifacts(self):
+        """
+        Top level artifacts of the job.
+
+        :rtype: list[yagocd.resources.artifact.Artifact]
+        """
+        return self._artifacts
+
+    def get(self, path):
+        """
+        Finds artifact by its path.
+
+        :param path: path to the file or folder, e.g. `/target/dist.zip`.
+        :return: the artifact or ``None``, if there is no such one.
+        :rtype: yagocd.resources.artifact.Artifact
+        """
+        return self._index.get(self._key(path))
+
+    def children(self, path):
+        """
+        Gets artifacts, located directly in the folder.
+
+        :param path: path to the folder, `/` for top level.
+        :return: nested artifacts or ``None`` if the path is a file.
+        :rtype: list[yagocd.resources.artifact.Artifact]
+        """
+        if not path or path in ['/']:
+            return self._artifacts
+
+        key = self._key(path)
+        if key not in self._index:
+            raise ValueError("Can't find requested path '{path}' in the given artifacts '{artifacts}'!".format(
+                path=path, artifacts=self._artifacts)
+            )
+        return self._children.get(key)
+
+    def walk(self, top='/', topdown=True):
+        """
+        Artifact tree generator - analogue of `os.walk`.
+
+        :param top: root path, from which traversal would be started.
+        :param topdown: if is True or not specified, directories are scanned
+        from top-down. If topdown is set to False, directories are scanned
+        from bottom-up.
+        :rtype: collections.Iterator[
+            (str, list[yagocd.resources.artifact.Artifact], list[yagocd.resources.artifact.Artifact])
+        ]
+        """
+        folders = list()
+        files = list()
+        children = self.children(top)
+        if children is None:
+            return
+
+        for artifact in children:
+            artifact_type = artifact.data.get(ArtifactManager.TYPE_FIELD)
+            if artifact_type == ArtifactManager.FOLDER_TYPE:
+                folders.append(artifact)
+            elif artifact_type == ArtifactManager.FILE_TYPE:
+                files.append(artifact)
+            else:
+                raise ValueError("Unknown artifact type '{}'!".format(artifact_type))
+
+        if topdown:
+            yield top, folders, files
+        for folder in folders:
+            new_path = top.rstrip(Artifact.SEP) + Artifact.SEP + folder.data.get(ArtifactManager.NAME_FIELD)
+
+            for x in self.walk(new_path, topdown):
+                yield x
+
+        if not topdown:
+            yield top, folders, files
+
+    def find(self, predicate, top='/'):
+        """
+        Finds artifacts, matching the predicate, in the tree order.
+
+        :param predicate: callable, receiving an artifact and returning ``True``
+        if it should be found.
+        :param top: path of the folder to search in.
+        :rtype: collections.Iterator[yagocd.resources.artifact.Artifact]
+        """
+        stack = [iter(self.children(top) or [])]
+        while stack:
+            for artifact in stack[-1]:
+                if predicate(artifact):
+                    yield artifact
+
+                children = self._children.get(self._key(artifact.path))
+                if children:
+                    stack.append(iter(children))
+                    break
+            else:
+                stack.pop()
+
+    def glob(self, pattern):
+        """
+        Finds artifacts by path pattern. Parts of the pattern between
+        slashes are matched against names with :func:`fnmatch.fnmatchcase`,
+        so ``*``, ``?`` and ``[seq]`` don't cross folders, while ``**``
+        matches any number of nested folders, e.g. `test-reports/**/*.xml`.
+        Leading slash is optional.
+
+        :param pattern: pattern of artifact paths.
+        :rtype: collections.Iterator[yagocd.resources.artifact.Artifact]
+        """
+        parts = list()
+        for part in pattern.split(Artifact.SEP):
+            if part and not (part == self.RECURSIVE and parts and parts[-1] == self.RECURSIVE):
+                parts.append(part)
+
+        seen = set()
+        for artifact in self._glob(self._artifacts, parts):
+            # several `**` could match the same artifact in different ways
+            if artifact.path not in seen:
+                seen.add(artifact.path)
+                yield artifact
+
+    def _glob(self, artifacts, parts):
+        if not parts:
+            return iter([])
+        if parts[0] == self.RECURSIVE:
+            return self._glob_recursive(artifacts, parts)
+        return self._glob_names(artifacts, parts)
+
+    def _glob_recursive(self, artifacts, parts):
+        rest = parts[1:]
+        if not rest:
+            for artifact in artifacts:
+                yield artifact
+                for x in self.find(lambda a: True, top=artifact.path):
+                    yield x
+            return
+
+        # `**` matching no folders
+        for x in self._glob(artifacts, rest):
+            yield x
+        for children in self._folders(artifacts):
+            for x in self._glob(children, parts):
+                yield x
+
+    def _glob_names(self, artifacts, parts):
+        part, rest = parts[0], parts[1:]
+        matching = [a for a in artifacts if fnmatch.fnmatchcase(a.data.get(ArtifactManager.NAME_FIELD), part)]
+        if not rest:
+            for artifact in matching:
+                yield artifact
+            return
+
+        for children in self._folders(matching):
+            for x in self._glob(children, rest):
+                yield x
+
+    def _folders(self, artifacts):
+        for artifact in artifacts:
+            children = self._children.get(self._key(artifact.path))
+            if children:
+                yield children
+
+
 class Artifact(Base):
     """
     Class, representing artifact of the build.
@@ -449,12 +1268,17 @@ class Artifact(Base):
     It could be one of file or folder.
     """
 
+    __slots__ = (
+        '_pipeline_name', '_pipeline_counter', '_stage_name', '_stage_counter', '_job_name', '_path', '_listing'
+    )
+
     SEP = '/'
 
     PART_COUNT = 5
 
-    def __init__(self, session, data):
+    def __init__(self, session, data, listing=None):
         super(Artifact, self).__init__(session, data)
+        self._listing = listing
 
         base = self._session.urljoin(self._session.server_url, self._session._options['context_path'], 'files')
         parts = self.data.url.replace(base, '').strip(self.SEP).split(self.SEP, self.PART_COUNT)
@@ -469,15 +1293,6 @@ class Artifact(Base):
         if self.data.type == ArtifactManager.FOLDER_TYPE and not self._path.endswith(self.SEP):
             self._path += self.SEP
 
-        self._manager = ArtifactManager(
-            session=session,
-            pipeline_name=self._pipeline_name,
-            pipeline_counter=self._pipeline_counter,
-            stage_name=self._stage_name,
-            stage_counter=self._stage_counter,
-            job_name=self._job_name
-        )
-
     def __str__(self):
         return self.__repr__()
 
@@ -515,6 +1330,8 @@ class Artifact(Base):
     def walk(self, topdown=True):
         """
         Artifact tree generator - analogue of `os.walk`.
+        Nested artifacts are taken from the listing, this artifact came from,
+        so no requests are made.
 
         :param topdown: if is True or not specified, directories are scanned
         from top-down. If topdown is set to False, directories are scanned
@@ -523,7 +1340,20 @@ class Artifact(Base):
             (str, list[yagocd.resources.artifact.Artifact], list[yagocd.resources.artifact.Artifact])
         ]
         """
-        return self._manager.walk(top=self._path, topdown=topdown)
+        if self._listing is None:
+            if self.data.type == ArtifactManager.FOLDER_TYPE and ArtifactManager.FILES_FIELD not in self.data:
+                # nested artifacts are unknown, so listing of the whole job is needed
+                self._listing = ArtifactManager.shared(self._session).listing(
+                    pipeline_name=self._pipeline_name,
+                    pipeline_counter=self._pipeline_counter,
+                    stage_name=self._stage_name,
+                    stage_counter=self._stage_counter,
+                    job_name=self._job_name
+                )
+            else:
+                self._listing = ArtifactListing([self])
+
+        return self._listing.walk(top=self._path, topdown=topdown)
 
     def fetch(self):
         """
@@ -532,8 +1362,50 @@ class Artifact(Base):
 
         :return: content of the artifact.
         """
-        if self.data.type == self._manager.FOLDER_TYPE:
+        if self.data.type == ArtifactManager.FOLDER_TYPE:
             raise YagocdException("Can't fetch folder <{}>, only file!".format(self._path))
 
         response = self._session.get(self.data.url)
         return response.content
+
+    def download(
+        self,
+        destination,
+        chunk_size=Downloader.DEFAULT_CHUNK_SIZE,
+        progress=None,
+        algorithm=Downloader.DEFAULT_ALGORITHM,
+        resume=False
+    ):
+        """
+        Method for streaming artifact's content to the destination in chunks,
+        without loading it into memory.
+        Could only be applicable for file type.
+
+        With ``resume`` enabled, interrupted download is continued from the
+        last received byte, see :meth:`ArtifactManager.download`. Final size
+        is checked against the listing, if it has ``size`` of the file,
+        otherwise against the size announced by the server.
+
+        :param destination: path to the local file or binary file-like object to write to.
+        :param chunk_size: size of chunks in bytes.
+        :param progress: callable, receiving number of bytes written so far
+        and expected total (or ``None`` if it's unknown) after every chunk.
+        :param algorithm: name of :mod:`hashlib` algorithm for checksum or ``None``.
+        :param resume: continue previously interrupted download, `destination`
+        should be a path then.
+        :return: number of bytes written and their checksum.
+        :rtype: yagocd.download.DownloadResult
+        """
+        if self.data.type == ArtifactManager.FOLDER_TYPE:
+            raise YagocdException("Can't download folder <{}>, only file!".format(self._path))
+
+        downloader = Downloader(chunk_size=chunk_size, progress=progress, algorithm=algorithm)
+        if resume:
+            return downloader.resume(
+                lambda headers: self._session.get(self.data.url, headers=headers, stream=True),
+                destination,
+                expected_size=self.data.get('size')
+            )
+
+        response = self._session.get(self.data.url, stream=True)
+        return downloader.save(response, destination)
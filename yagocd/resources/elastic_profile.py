@@ -160,4 +160,4 @@ class ElasticAgentProfileManager(BaseManager):
 
 
 class ElasticAgentProfile(Base):
-    pass
+    __slots__ = ()
@@ -161,4 +161,4 @@ class EnvironmentManager(BaseManager):
 
 
 class EnvironmentConfig(Base):
-    pass
+    __slots__ = ()
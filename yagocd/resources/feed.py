@@ -26,9 +26,17 @@
 #
 ###############################################################################
 
-from yagocd.resources import BaseManager
+import re
+from xml.etree import ElementTree
+
+# noinspection PyUnresolvedReferences
+from six.moves.urllib.parse import unquote
+
+from yagocd.resources import Base, BaseManager
 from yagocd.util import RequireParamMixin, since
 
+ATOM_NAMESPACE = '{http://www.w3.org/2005/Atom}'
+
 
 @since('14.3.0')
 class FeedManager(BaseManager, RequireParamMixin):
@@ -43,6 +51,8 @@ class FeedManager(BaseManager, RequireParamMixin):
     PIPELINES_RESOURCE_PATH = '{base_api}/pipelines'
     STAGES_RESOURCE_PATH = '{base_api}/stages'
 
+    PAGE_LINKS = ('next', 'previous')
+
     def __init__(
         self,
         session,
@@ -73,28 +83,28 @@ class FeedManager(BaseManager, RequireParamMixin):
 
         return response.text
 
-    def pipeline_by_id(self, pipeline_id):
+    def pipeline_by_id(self, pipeline_id, parse=False):
         """
         Gets XML representation of pipeline.
 
         :versionadded: 14.3.0.
 
         :param pipeline_id: id of pipeline. Note: this is *not* a counter.
-        :return: a pipeline object in XML format.
+        :param parse: parse the document into an entry, see :meth:`document_entry`.
+        :return: a pipeline object in XML format or its entry.
+        :rtype: str | yagocd.resources.feed.FeedEntry
         """
-        response = self._session.get(
-            path=self._session.urljoin(
+        return self._document(
+            self._session.urljoin(
                 self.PIPELINES_RESOURCE_PATH,
                 'THIS_PARAMETER_IS_USELESS',  # WTF?!!
                 '{}.xml'.format(pipeline_id)
             ).format(
                 base_api=self.base_api
             ),
-            headers={'Accept': 'application/xml'},
+            parse
         )
 
-        return response.text
-
     def stages(self, pipeline_name):
         """
         Gets feed of all stages for the specified pipeline with links to the pipeline and stage details.
@@ -116,28 +126,28 @@ class FeedManager(BaseManager, RequireParamMixin):
 
         return response.text
 
-    def stage_by_id(self, stage_id):
+    def stage_by_id(self, stage_id, parse=False):
         """
         Gets XML representation of stage.
 
         :versionadded: 14.3.0.
 
         :param stage_id: id of stage. Note: this is *not* a counter.
-        :return: a stage object in XML format.
+        :param parse: parse the document into an entry, see :meth:`document_entry`.
+        :return: a stage object in XML format or its entry.
+        :rtype: str | yagocd.resources.feed.FeedEntry
         """
-        response = self._session.get(
-            path=self._session.urljoin(
+        return self._document(
+            self._session.urljoin(
                 self.STAGES_RESOURCE_PATH,
                 '{}.xml'.format(stage_id)
             ).format(
                 base_api=self.base_api
             ),
-            headers={'Accept': 'application/xml'},
+            parse
         )
 
-        return response.text
-
-    def stage(self, pipeline_name, pipeline_counter, stage_name, stage_counter):
+    def stage(self, pipeline_name, pipeline_counter, stage_name, stage_counter, parse=False):
         """
         Gets XML representation of stage.
 
@@ -147,7 +157,9 @@ class FeedManager(BaseManager, RequireParamMixin):
         :param pipeline_counter: pipeline counter.
         :param stage_name: name of stage.
         :param stage_counter: stage counter.
-        :return: a stage object in XML format.
+        :param parse: parse the document into an entry, see :meth:`document_entry`.
+        :return: a stage object in XML format or its entry.
+        :rtype: str | yagocd.resources.feed.FeedEntry
         """
 
         func_args = locals()
@@ -156,8 +168,8 @@ class FeedManager(BaseManager, RequireParamMixin):
         stage_name = self._require_param('stage_name', func_args)
         stage_counter = self._require_param('stage_counter', func_args)
 
-        response = self._session.get(
-            path=self._session.urljoin(
+        return self._document(
+            self._session.urljoin(
                 self.PIPELINES_RESOURCE_PATH,
                 pipeline_name,
                 pipeline_counter,
@@ -166,26 +178,228 @@ class FeedManager(BaseManager, RequireParamMixin):
             ).format(
                 base_api=self._session.base_api(api_path=''),  # WTF?!!
             ),
-            headers={'Accept': 'application/xml'},
+            parse
         )
 
-        return response.text
-
-    def job_by_id(self, job_id):
+    def job_by_id(self, job_id, parse=False):
         """
         Gets XML representation of job.
 
         :versionadded: 14.3.0.
 
         :param job_id: id of job. Note: this is *not* a counter.
-        :return: a job object in XML format.
+        :param parse: parse the document into an entry, see :meth:`document_entry`.
+        :return: a job object in XML format or its entry.
+        :rtype: str | yagocd.resources.feed.FeedEntry
         """
-        response = self._session.get(
-            path='{base_api}/jobs/{job_id}.xml'.format(
+        return self._document(
+            '{base_api}/jobs/{job_id}.xml'.format(
                 base_api=self.base_api,
                 job_id=job_id
             ),
-            headers={'Accept': 'application/xml'},
+            parse
+        )
+
+    def pipeline_names(self):
+        """
+        Lists names of all pipelines, parsing the list as it's received.
+
+        :versionadded: 14.3.0.
+
+        :return: names of pipelines.
+        :rtype: collections.Iterator[str]
+        """
+        url = (self.PIPELINES_RESOURCE_PATH + '.xml').format(base_api=self.base_api)
+        for element in self._iterparse(url, {}):
+            match = re.search(r'/pipelines/([^/]+)/stages\.xml$', element.get('href', ''))
+            if element.tag == 'pipeline' and match is not None:
+                yield unquote(match.group(1))
+
+    def stage_entries(self, pipeline_name=None, follow='next'):
+        """
+        Streams entries of feed of stages for the specified pipeline. Each
+        page is parsed incrementally, while it's received, and entries are
+        yielded and dropped one by one, so memory usage doesn't depend on
+        size of the feed. The next page is requested only when all entries
+        of the current one are consumed.
+
+        :versionadded: 14.3.0.
+
+        :param pipeline_name: name of pipeline, for which to list stages.
+        :param follow: page link to follow after each page: ``next`` for
+        older stages, ``previous`` for newer ones or ``None`` to read a
+        single page.
+        :return: entries of the feed.
+        :rtype: collections.Iterator[yagocd.resources.feed.FeedEntry]
+        """
+        if follow is not None and follow not in self.PAGE_LINKS:
+            raise ValueError("Unknown page link: {}".format(follow))
+
+        pipeline_name = self._require_param('pipeline_name', dict(pipeline_name=pipeline_name))
+        url = self._session.urljoin(self.PIPELINES_RESOURCE_PATH, pipeline_name, 'stages.xml').format(
+            base_api=self.base_api
         )
+        return self.entries(url, follow=follow)
+
+    def entries(self, url, follow='next'):
+        """
+        Streams entries of an Atom feed by its url, following the page
+        links lazily, see :meth:`stage_entries`.
+
+        :param url: url of the first page of the feed.
+        :param follow: page link to follow after each page: ``next``,
+        ``previous`` or ``None`` to read a single page.
+        :return: entries of the feed.
+        :rtype: collections.Iterator[yagocd.resources.feed.FeedEntry]
+        """
+        visited = set()
+        while url is not None and url not in visited:
+            visited.add(url)
+
+            links = dict()
+            for element in self._iterparse(url, links):
+                if element.tag == ATOM_NAMESPACE + 'entry':
+                    yield FeedEntry.from_element(self._session, element)
+
+            url = links.get(follow) if follow is not None else None
 
+    def document_entry(self, url):
+        """
+        Parses a document of a single pipeline, stage or job, e.g. the one
+        returned by :meth:`stage_by_id`, into an entry, see
+        :meth:`FeedEntry.from_document`.
+
+        :param url: url of the document.
+        :rtype: yagocd.resources.feed.FeedEntry
+        """
+        attributes = dict()
+        elements = self._iterparse(url, dict(), attributes)
+        return FeedEntry.from_document(self._session, elements, attributes)
+
+    def _document(self, url, parse):
+        if parse:
+            return self.document_entry(url)
+
+        response = self._session.get(path=url, headers={'Accept': 'application/xml'})
         return response.text
+
+    def _iterparse(self, url, links, attributes=None):
+        """
+        Yields children of the root element of the document as soon as
+        each of them is parsed, and collects links of the root by their
+        relation into `links` dictionary and attributes of the root into
+        `attributes` one. Yielded children are removed from the tree
+        afterwards.
+        """
+        response = self._session.get(path=url, headers={'Accept': 'application/xml'}, stream=True)
+        # parse the body as it's decompressed, not the compressed stream
+        response.raw.decode_content = True
+
+        try:
+            root = None
+            depth = 0
+            for event, element in ElementTree.iterparse(response.raw, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    if root is None:
+                        root = element
+                        if attributes is not None:
+                            attributes.update(root.attrib)
+                    continue
+
+                depth -= 1
+                if depth != 1:
+                    continue
+
+                if element.tag in (ATOM_NAMESPACE + 'link', 'link'):
+                    links[element.get('rel')] = element.get('href')
+                yield element
+                root.clear()
+        finally:
+            response.close()
+
+
+class FeedEntry(Base):
+    """
+    Entry of an Atom feed: `id`, `title`, `updated`, names of `authors`,
+    `links` with their `rel`, `href`, `type` and `title` and terms of
+    `categories`, e.g. stage result, are available in `data`.
+
+    Documents of a single pipeline, stage or job are parsed into entries
+    as well, see :meth:`from_document`.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_element(cls, session, element):
+        """
+        Creates an entry from parsed ``<entry>`` element.
+
+        :param session: session object from client.
+        :type session: yagocd.session.Session
+        :param element: the element.
+        :rtype: yagocd.resources.feed.FeedEntry
+        """
+        def text(tag):
+            return element.findtext(ATOM_NAMESPACE + tag)
+
+        return cls(session, dict(
+            id=text('id'),
+            title=text('title'),
+            updated=text('updated'),
+            authors=[author.findtext(ATOM_NAMESPACE + 'name') for author in element.iter(ATOM_NAMESPACE + 'author')],
+            links=[dict(link.attrib) for link in element.iter(ATOM_NAMESPACE + 'link')],
+            categories=[category.get('term') for category in element.iter(ATOM_NAMESPACE + 'category')],
+        ))
+
+    @classmethod
+    def from_document(cls, session, elements, attributes):
+        """
+        Creates an entry from children of the root element of a document
+        of a single pipeline, stage or job. Attributes of the root, e.g.
+        `name` and `counter`, `links` and texts of children, e.g. `id`,
+        `result` and `state`, are available in `data`. Other children are
+        converted into dictionaries of their attributes, e.g. `pipeline`,
+        and lists of their own children by tag, e.g. `jobs.job`.
+
+        :param session: session object from client.
+        :type session: yagocd.session.Session
+        :param elements: children of the root element.
+        :param attributes: attributes of the root element, which could be
+        filled while `elements` are parsed.
+        :rtype: yagocd.resources.feed.FeedEntry
+        """
+        data = dict(links=list())
+        for element in elements:
+            if element.tag == 'link':
+                data['links'].append(dict(element.attrib))
+            else:
+                data[element.tag] = cls._element_data(element)
+
+        data.update(attributes)
+        return cls(session, data)
+
+    @classmethod
+    def _element_data(cls, element):
+        if not len(element) and not element.attrib:
+            return element.text
+
+        data = dict(element.attrib)
+        if element.text and element.text.strip():
+            data['text'] = element.text
+        for child in element:
+            data.setdefault(child.tag, list()).append(cls._element_data(child))
+        return data
+
+    def link(self, rel='alternate', media_type=None):
+        """
+        Finds url of the entry's link.
+
+        :param rel: relation of the link.
+        :param media_type: media type of the link, e.g. `text/html`, or ``None`` for any.
+        :return: url of the first matching link or ``None``.
+        """
+        for link in self.data.links:
+            if link.get('rel') == rel and (media_type is None or link.get('type') == media_type):
+                return link.get('href')
@@ -29,12 +29,11 @@
 import re
 from distutils.version import LooseVersion
 
-from easydict import EasyDict
 # noinspection PyUnresolvedReferences
 from six.moves import html_parser
 
 from yagocd.resources import BaseManager
-from yagocd.util import since
+from yagocd.util import AttrDict, since
 
 
 class AboutPageTableParser(html_parser.HTMLParser):
@@ -138,7 +137,7 @@ class InfoManager(BaseManager):
         if LooseVersion(self._session.server_version) <= LooseVersion('16.3.0'):
             return response.text
 
-        return EasyDict(response.json())
+        return AttrDict(response.json())
 
     def process_list(self):
         """
@@ -151,4 +150,4 @@ class InfoManager(BaseManager):
             },
         )
 
-        return EasyDict(response.json())
+        return AttrDict(response.json())
@@ -26,10 +26,26 @@
 #
 ###############################################################################
 
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import six
+from six.moves import queue
+
+from yagocd.download import Downloader
+from yagocd.exception import RequestError, YagocdException
 from yagocd.resources import Base, BaseManager
 from yagocd.resources.artifact import ArtifactManager
 from yagocd.resources.property import PropertyManager
-from yagocd.util import RequireParamMixin, since
+from yagocd.resources.stage import StageManager
+from yagocd.util import RequireParamMixin, since, YagocdUtil
+
+
+# marks the end of matches of a log in the queue
+_SEARCH_END = object()
 
 
 @since('14.3.0')
@@ -44,6 +60,11 @@ class JobManager(BaseManager, RequireParamMixin):
 
     RESOURCE_PATH = '{base_api}/jobs'
 
+    # number of console logs to search in parallel
+    DEFAULT_SEARCH_WORKERS = 8
+    # number of matches of a single log, waiting to be consumed
+    SEARCH_QUEUE_SIZE = 100
+
     def __init__(
         self,
         session,
@@ -108,6 +129,116 @@ class JobManager(BaseManager, RequireParamMixin):
 
         return instances
 
+    def full_history(self, pipeline_name=None, stage_name=None, job_name=None, look_ahead=0):
+        """
+        The job history allows users to list job instances of specified job.
+
+        :versionadded: 14.3.0.
+
+        This method uses generator to get full job history.
+        :param pipeline_name: pipeline name.
+        :param stage_name: stage name.
+        :param job_name: job name.
+        :param look_ahead: number of next pages to fetch in parallel, while current one is consumed.
+        :return: an array of jobs instances.
+        :rtype: list of yagocd.resources.job.JobInstance
+        """
+        instances = YagocdUtil.paginate(
+            lambda offset: self.history(pipeline_name, stage_name, job_name, offset),
+            look_ahead=look_ahead
+        )
+        for instance in instances:
+            yield instance
+
+    def search_console(self, jobs, pattern, workers=DEFAULT_SEARCH_WORKERS, first=False, flags=0):
+        """
+        Searches console logs of the jobs for lines, matching the regular
+        expression, e.g. to find out which of the last runs of a job failed
+        with some error. Logs are streamed by a bounded pool of workers and
+        matched line by line, so they are never kept in memory as a whole.
+        Matches are passed to the consumer through a bounded queue per log:
+        a worker pauses reading the log, while its queue is full.
+
+        :param jobs: iterable of job instances, e.g. :meth:`full_history` or
+        :meth:`yagocd.resources.agent.AgentManager.full_job_history`. It's
+        consumed lazily, only a few jobs ahead of the workers.
+        :param pattern: regular expression as a string or a compiled one.
+        :param workers: number of logs to search in parallel.
+        :param first: yield only the first matching line of each log and
+        stop downloading it.
+        :param flags: flags to compile string pattern with, e.g. ``re.IGNORECASE``.
+        :return: matching lines in order of the jobs and of lines in a log.
+        :rtype: collections.Iterator[yagocd.resources.job.ConsoleMatch]
+        """
+        if isinstance(pattern, six.string_types):
+            pattern = re.compile(pattern, flags)
+
+        pool = self._session.pooled(workers)
+        search_console = pool.bind(self._search_console)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        stopped = threading.Event()
+        pending = deque()
+        try:
+            for job in jobs:
+                matches = queue.Queue(maxsize=self.SEARCH_QUEUE_SIZE)
+                pending.append((executor.submit(search_console, job, pattern, first, matches, stopped), matches))
+                # keep workers busy, while matches of the oldest job are consumed
+                if len(pending) >= 2 * workers:
+                    for match in self._consume(*pending.popleft()):
+                        yield match
+
+            while pending:
+                for match in self._consume(*pending.popleft()):
+                    yield match
+        finally:
+            stopped.set()
+            for future, _ in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+            pool.close()
+
+    @staticmethod
+    def _consume(future, matches):
+        match = matches.get()
+        while match is not _SEARCH_END:
+            yield match
+            match = matches.get()
+        # error of the worker is raised after the matches, found before it
+        future.result()
+
+    @classmethod
+    def _search_console(cls, job, pattern, first, matches, stopped):
+        try:
+            cls._search_lines(job, pattern, first, matches, stopped)
+        finally:
+            cls._put(matches, _SEARCH_END, stopped)
+
+    @classmethod
+    def _search_lines(cls, job, pattern, first, matches, stopped):
+        lines = iter(ConsoleLog(job, follow=False))
+        try:
+            for number, line in enumerate(lines, 1):
+                match = pattern.search(line)
+                if match is None:
+                    continue
+
+                if not cls._put(matches, ConsoleMatch(job, number, line, match), stopped):
+                    return
+                if first:
+                    break
+        finally:
+            lines.close()
+
+    @staticmethod
+    def _put(matches, item, stopped):
+        while not stopped.is_set():
+            try:
+                matches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
 
 class JobInstance(Base):
     """
@@ -126,9 +257,12 @@ class JobInstance(Base):
     could implement those magic methods as needed.
     """
 
+    __slots__ = ('_stage', '_artifacts')
+
     def __init__(self, session, data, stage):
         super(JobInstance, self).__init__(session, data)
         self._stage = stage
+        self._artifacts = None
 
     @property
     def pipeline_name(self):
@@ -210,6 +344,17 @@ class JobInstance(Base):
             job_name=self.data.name
         )
 
+    @property
+    def locator(self):
+        """
+        Returns locator of the job instance, unique within the server.
+
+        :return: locator like `pipeline/counter/stage/counter/job`.
+        """
+        return '/'.join(str(part) for part in (
+            self.pipeline_name, self.pipeline_counter, self.stage_name, self.stage_counter, self.data.name
+        ))
+
     @property
     def stage(self):
         return self._stage
@@ -218,17 +363,52 @@ class JobInstance(Base):
     def artifacts(self):
         """
         Property for accessing artifact manager of the current job.
+        The manager is created once, so it keeps listing of artifacts.
 
         :return: instance of :class:`yagocd.resources.artifact.ArtifactManager`
         :rtype: yagocd.resources.artifact.ArtifactManager
         """
-        return ArtifactManager(
-            session=self._session,
-            pipeline_name=self.pipeline_name,
-            pipeline_counter=self.pipeline_counter,
-            stage_name=self.stage_name,
-            stage_counter=self.stage_counter,
-            job_name=self.data.name
+        if self._artifacts is None:
+            self._artifacts = ArtifactManager(
+                session=self._session,
+                pipeline_name=self.pipeline_name,
+                pipeline_counter=self.pipeline_counter,
+                stage_name=self.stage_name,
+                stage_counter=self.stage_counter,
+                job_name=self.data.name
+            )
+        return self._artifacts
+
+    def console(
+        self,
+        offset=0,
+        follow=True,
+        interval=None,
+        max_interval=None,
+        encoding='utf-8',
+    ):
+        """
+        Iterates over lines of console log of the job. Only bytes after the
+        offset are requested with ``Range`` header, so following a running
+        job doesn't download the log again and again.
+
+        :param offset: byte offset in the log to start from, e.g.
+        :attr:`ConsoleLog.offset` of a previous iterator.
+        :param follow: keep polling for new lines until the job completes.
+        :param interval: seconds to wait between polls, while the log grows.
+        :param max_interval: maximum seconds to wait between polls, while
+        the log doesn't change.
+        :param encoding: encoding of the log.
+        :return: iterator over lines of the log without line endings.
+        :rtype: yagocd.resources.job.ConsoleLog
+        """
+        return ConsoleLog(
+            job=self,
+            offset=offset,
+            follow=follow,
+            interval=interval if interval is not None else ConsoleLog.DEFAULT_INTERVAL,
+            max_interval=max_interval if max_interval is not None else ConsoleLog.DEFAULT_MAX_INTERVAL,
+            encoding=encoding,
         )
 
     @property
@@ -247,3 +427,200 @@ class JobInstance(Base):
             stage_counter=self.stage_counter,
             job_name=self.data.name
         )
+
+
+class ConsoleLog(object):
+    """
+    Iterator over lines of console log of a job, which fetches only new
+    bytes of the log with ``Range`` requests.
+
+    While following a running job, the log is polled after ``interval``
+    seconds as long as it grows. When it doesn't change, the interval is
+    doubled up to ``max_interval`` and the state of the job is checked,
+    so idle jobs are polled rarely. Once the job is completed, the rest
+    of the log is read and the iteration stops.
+    """
+
+    PATH = 'cruise-output/console.log'
+    DEFAULT_INTERVAL = 1
+    DEFAULT_MAX_INTERVAL = 30
+    DEFAULT_CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        job,
+        offset=0,
+        follow=True,
+        interval=DEFAULT_INTERVAL,
+        max_interval=DEFAULT_MAX_INTERVAL,
+        encoding='utf-8',
+        chunk_size=DEFAULT_CHUNK_SIZE
+    ):
+        """
+        :param job: job to read console log of.
+        :type job: yagocd.resources.job.JobInstance
+        :param offset: byte offset in the log to start from.
+        :param follow: keep polling for new lines until the job completes.
+        :param interval: seconds to wait between polls, while the log grows.
+        :param max_interval: maximum seconds to wait between polls.
+        :param encoding: encoding of the log.
+        :param chunk_size: size of chunks in bytes to read responses with.
+        """
+        self._job = job
+        self._session = job._session
+        self._follow = follow
+        self._interval = interval
+        self._max_interval = max_interval
+        self._encoding = encoding
+        self._chunk_size = chunk_size
+
+        #: offset in bytes right after the last yielded line
+        self.offset = offset
+        self._position = offset
+        self._buffer = b''
+
+        self._url = self._session.urljoin(ArtifactManager.RESOURCE_PATH, self.PATH).format(
+            base_api=self._session.base_api(api_path=''),
+            pipeline_name=job.pipeline_name,
+            pipeline_counter=job.pipeline_counter,
+            stage_name=job.stage_name,
+            stage_counter=job.stage_counter,
+            job_name=job.data.name
+        )
+
+    def __iter__(self):
+        finished = not self._follow or self._job.data.get('state') in JobState.FINAL
+        delay = self._interval
+
+        while True:
+            received = False
+            for line in self._fetch():
+                received = True
+                yield line
+
+            if finished:
+                break
+
+            if received:
+                delay = self._interval
+            else:
+                # the rest of the log is read once more after the job completes
+                finished = self._is_finished()
+                if finished:
+                    continue
+                delay = min(delay * 2, self._max_interval)
+
+            time.sleep(delay)
+
+        if self._buffer:
+            line, self._buffer = self._buffer, b''
+            self.offset = self._position
+            yield line.decode(self._encoding, 'replace')
+
+    def _fetch(self):
+        try:
+            response = self._session.get(
+                path=self._url,
+                # offsets are counted in bytes of the log, not of compressed body
+                headers={'Range': 'bytes={}-'.format(self._position), 'Accept-Encoding': 'identity'},
+                stream=True
+            )
+        except RequestError as e:
+            # the log is not created yet or has no new bytes
+            if e.response is not None and e.response.status_code in (404, 416):
+                return []
+            raise
+
+        return self._lines(response)
+
+    def _lines(self, response):
+        try:
+            skip = self._skipped(response)
+            for chunk in response.iter_content(chunk_size=self._chunk_size):
+                if skip:
+                    chunk, skip = chunk[skip:], max(skip - len(chunk), 0)
+                if not chunk:
+                    continue
+
+                self._position += len(chunk)
+                lines = (self._buffer + chunk).split(b'\n')
+                self._buffer = lines.pop()
+                for line in lines:
+                    self.offset += len(line) + 1
+                    yield line.rstrip(b'\r').decode(self._encoding, 'replace')
+        finally:
+            response.close()
+
+    def _skipped(self, response):
+        if response.status_code != 206:
+            # the server ignored the range, so the bytes, which were read already, are skipped
+            return self._position
+
+        start, _ = Downloader.content_range(response)
+        if start != self._position:
+            raise YagocdException("Console log of <{}> is sent from byte {} instead of {}".format(
+                self._job.data.name, start, self._position
+            ))
+        return 0
+
+    def _is_finished(self):
+        stage = StageManager.shared(self._session).get(
+            pipeline_name=self._job.pipeline_name,
+            pipeline_counter=self._job.pipeline_counter,
+            stage_name=self._job.stage_name,
+            stage_counter=self._job.stage_counter
+        )
+        job = stage.job(self._job.data.name)
+        return job is None or job.data.get('state') in JobState.FINAL
+
+
+class ConsoleMatch(object):
+    """
+    Line of console log of a job, matching a searched pattern.
+    """
+
+    def __init__(self, job, line_number, line, match):
+        """
+        :param job: job, which log contains the line.
+        :type job: yagocd.resources.job.JobInstance
+        :param line_number: number of the line in the log, starting from 1.
+        :param line: the line without line ending.
+        :param match: match object of the pattern.
+        """
+        self.job = job
+        self.line_number = line_number
+        self.line = line
+        self.match = match
+
+    @property
+    def locator(self):
+        """
+        Locator of the job, e.g. `pipeline/1/stage/1/job`.
+        """
+        return self.job.locator
+
+    def __repr__(self):
+        return '<{cls}: {locator}:{line_number}: {line}>'.format(
+            cls=self.__class__.__name__, locator=self.locator, line_number=self.line_number, line=self.line
+        )
+
+
+class JobState(object):
+    """
+    Enumeration of the Job states.
+
+    :url: https://github.com/gocd/gocd/blob/master/domain/src/com/thoughtworks/go/domain/JobState.java
+    """
+    Unknown = 'Unknown'
+    Scheduled = 'Scheduled'
+    Assigned = 'Assigned'
+    Preparing = 'Preparing'
+    Building = 'Building'
+    Completing = 'Completing'
+    Completed = 'Completed'
+    Discontinued = 'Discontinued'
+    Paused = 'Paused'
+    Rescheduled = 'Rescheduled'
+
+    # states, after which the job instance is not going to run anymore
+    FINAL = (Completed, Discontinued, Rescheduled)
@@ -169,8 +169,8 @@ class MaterialManager(BaseManager):
 
 
 class MaterialEntity(Base):
-    pass
+    __slots__ = ()
 
 
 class ModificationEntity(BaseNode):
-    pass
+    __slots__ = ()
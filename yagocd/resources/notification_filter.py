@@ -124,4 +124,4 @@ class NotificationFilterManager(BaseManager):
 
 
 class NotificationFilter(Base):
-    pass
+    __slots__ = ()
@@ -154,4 +154,4 @@ class PackageManager(BaseManager):
 
 
 class Package(Base):
-    pass
+    __slots__ = ()
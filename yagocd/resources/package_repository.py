@@ -153,4 +153,4 @@ class PackageRepositoryManager(BaseManager):
 
 
 class PackageRepository(Base):
-    pass
+    __slots__ = ()
@@ -29,13 +29,12 @@ import json
 import time
 from distutils.version import LooseVersion
 
-from easydict import EasyDict
-
+from yagocd.graph import DependencyGraph
 from yagocd.resources import BaseManager, BaseNode
 from yagocd.resources.material import ModificationEntity
 from yagocd.resources.pipeline_config import PipelineConfigManager
-from yagocd.resources.stage import StageInstance
-from yagocd.util import since, YagocdUtil
+from yagocd.resources.stage import StageInstance, StageResult
+from yagocd.util import AttrDict, since, YagocdUtil
 
 
 @since('14.3.0')
@@ -104,7 +103,8 @@ class PipelineManager(BaseManager):
         return YagocdUtil.build_graph(
             nodes=pipelines,
             dependencies=lambda parent: [material for material in parent.data.materials],
-            compare=lambda candidate, child: candidate.description == child.data.name
+            node_key=lambda child: child.data.name,
+            dependency_key=lambda material: material.description
         )
 
     def find(self, name):
@@ -121,6 +121,20 @@ class PipelineManager(BaseManager):
             if pipeline.data.name == name:
                 return pipeline
 
+    def graph(self):
+        """
+        Lists all available pipelines and builds a reachability index over
+        them, so transitive predecessors and descendants of any pipeline
+        are answered without walking the graph again.
+        Every call lists pipelines anew and builds a new index.
+
+        :versionadded: 14.3.0.
+
+        :return: dependency graph of all pipelines.
+        :rtype: yagocd.graph.DependencyGraph
+        """
+        return DependencyGraph(self.list())
+
     def history(self, name, offset=0):
         """
         The pipeline history allows users to list pipeline instances.
@@ -145,7 +159,7 @@ class PipelineManager(BaseManager):
 
         return instances
 
-    def full_history(self, name):
+    def full_history(self, name, look_ahead=0):
         """
         Method for accessing full history of specific pipeline.
 
@@ -153,17 +167,12 @@ class PipelineManager(BaseManager):
 
         It yields each instance and after one chunk is over moves to the next one.
         :param name: name of the pipeline.
+        :param look_ahead: number of next pages to fetch in parallel, while current one is consumed.
         :return: an array of pipeline instances :class:`yagocd.resources.pipeline.PipelineInstance`.
         :rtype: list of yagocd.resources.pipeline.PipelineInstance
         """
-        offset = 0
-        instances = self.history(name, offset)
-        while instances:
-            for instance in instances:
-                yield instance
-
-            offset += len(instances)
-            instances = self.history(name, offset)
+        for instance in YagocdUtil.paginate(lambda offset: self.history(name, offset), look_ahead=look_ahead):
+            yield instance
 
     def last(self, name):
         """
@@ -181,6 +190,7 @@ class PipelineManager(BaseManager):
     def get(self, name, counter):
         """
         Gets pipeline instance object.
+        If instance cache is enabled, completed instances are returned from it.
 
         :versionadded: 14.3.0.
 
@@ -189,13 +199,24 @@ class PipelineManager(BaseManager):
         :return: A pipeline instance object :class:`yagocd.resources.pipeline.PipelineInstance`.
         :rtype: yagocd.resources.pipeline.PipelineInstance
         """
+        cache = self._session.instance_cache
+        cache_key = 'pipeline/{}/{}'.format(name, counter)
+        if cache is not None:
+            data = cache.get(cache_key)
+            if data is not None:
+                return PipelineInstance(session=self._session, data=data)
+
         response = self._session.get(
             path=self._session.urljoin(self.RESOURCE_PATH, 'instance', counter).format(
                 base_api=self.base_api, name=name),
             headers={'Accept': 'application/json'},
         )
 
-        return PipelineInstance(session=self._session, data=response.json())
+        data = response.json()
+        instance = PipelineInstance(session=self._session, data=data)
+        if cache is not None:
+            cache.set(cache_key, data, completed=instance.completed)
+        return instance
 
     def status(self, name):
         """
@@ -204,7 +225,7 @@ class PipelineManager(BaseManager):
         :versionadded: 14.3.0.
 
         :param name: name of the pipeline.
-        :return: JSON containing information about pipeline state, wrapped in EasyDict class.
+        :return: JSON containing information about pipeline state, wrapped in AttrDict class.
         """
         response = self._session.get(
             path=self._session.urljoin(self.RESOURCE_PATH, 'status').format(
@@ -212,7 +233,7 @@ class PipelineManager(BaseManager):
             headers={'Accept': 'application/json'},
         )
 
-        return EasyDict(response.json())
+        return AttrDict(response.json())
 
     def pause(self, name, cause):
         """
@@ -356,7 +377,7 @@ class PipelineManager(BaseManager):
             headers={'Accept': 'application/json'},
         )
 
-        data = EasyDict(response.json())
+        data = AttrDict(response.json())
 
         nodes = list()
         dependencies = dict()
@@ -403,7 +424,8 @@ class PipelineManager(BaseManager):
         return YagocdUtil.build_graph(
             nodes=nodes,
             dependencies=lambda parent: dependencies[parent.data.id],
-            compare=lambda candidate, child: candidate == child.data.id
+            node_key=lambda child: child.data.id,
+            dependency_key=lambda parent_id: parent_id
         )
 
 
@@ -413,10 +435,12 @@ class PipelineEntity(BaseNode):
     Executing ``history`` will return pipeline instances.
     """
 
+    __slots__ = ('_group', '_pipeline')
+
     def __init__(self, session, data, group=None):
         super(PipelineEntity, self).__init__(session, data)
         self._group = group
-        self._pipeline = PipelineManager(session=session)
+        self._pipeline = PipelineManager.shared(session)
 
     def __iter__(self):
         """
@@ -481,15 +505,16 @@ class PipelineEntity(BaseNode):
         """
         return self._pipeline.history(name=self.data.name, offset=offset)
 
-    def full_history(self):
+    def full_history(self, look_ahead=0):
         """
         Method for accessing full history of specific pipeline.
 
         It yields each instance and after one chunk is over moves to the next one.
+        :param look_ahead: number of next pages to fetch in parallel, while current one is consumed.
         :return: an array of pipeline instances :class:`yagocd.resources.pipeline.PipelineInstance`.
         :rtype: list of yagocd.resources.pipeline.PipelineInstance
         """
-        return self._pipeline.full_history(name=self.data.name)
+        return self._pipeline.full_history(name=self.data.name, look_ahead=look_ahead)
 
     def last(self):
         """
@@ -513,7 +538,7 @@ class PipelineEntity(BaseNode):
         """
         The pipeline status allows users to check if the pipeline is paused, locked and schedulable.
 
-        :return: JSON containing information about pipeline state, wrapped in EasyDict class.
+        :return: JSON containing information about pipeline state, wrapped in AttrDict class.
         """
         return self._pipeline.status(name=self.data.name)
 
@@ -598,9 +623,11 @@ class PipelineInstance(BaseNode):
     Pipeline instance represents concrete execution of specific pipeline.
     """
 
+    __slots__ = ('_manager',)
+
     def __init__(self, session, data):
         super(PipelineInstance, self).__init__(session, data)
-        self._manager = PipelineManager(session=session)
+        self._manager = PipelineManager.shared(session)
 
     def __iter__(self):
         """
@@ -639,6 +666,17 @@ class PipelineInstance(BaseNode):
         """
         return PipelineEntity.get_url(server_url=self._session.server_url, pipeline_name=self.data.name)
 
+    @property
+    def completed(self):
+        """
+        Check whether all stages of the pipeline instance have reached final result.
+        Stages, which were not scheduled yet, make the instance not completed.
+
+        :return: ``True`` if the instance is not going to change anymore.
+        """
+        stages = self.data.get('stages') or []
+        return bool(stages) and all(stage.get('result') in StageResult.FINAL for stage in stages)
+
     def stages(self):
         """
         Method for getting stages from pipeline instance.
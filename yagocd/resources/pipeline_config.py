@@ -160,4 +160,4 @@ class PipelineConfigManager(BaseManager, RequireParamMixin):
 
 
 class PipelineConfig(Base):
-    pass
+    __slots__ = ()
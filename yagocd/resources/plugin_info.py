@@ -98,4 +98,4 @@ class PluginInfoManager(BaseManager):
 
 
 class PluginInfo(Base):
-    pass
+    __slots__ = ()
@@ -144,4 +144,4 @@ class SCMManager(BaseManager):
 
 
 class SCMMaterial(Base):
-    pass
+    __slots__ = ()
@@ -25,9 +25,13 @@
 # THE SOFTWARE.
 #
 ###############################################################################
+from concurrent.futures import ThreadPoolExecutor
+
+# jobs module imports this one: its names are resolved only when they are used
+import yagocd.resources.job
 from yagocd.resources import Base, BaseManager
-from yagocd.resources.job import JobInstance
-from yagocd.util import RequireParamMixin, since
+from yagocd.resources.artifact import ArtifactManager
+from yagocd.util import RequireParamMixin, since, YagocdUtil
 
 
 @since('14.3.0')
@@ -122,6 +126,7 @@ class StageManager(BaseManager, RequireParamMixin):
     ):
         """
         Gets stage instance object.
+        If instance cache is enabled, completed instances are returned from it.
 
         :versionadded: 15.1.0.
 
@@ -138,6 +143,13 @@ class StageManager(BaseManager, RequireParamMixin):
         stage_name = self._require_param('stage_name', func_args)
         stage_counter = self._require_param('stage_counter', func_args)
 
+        cache = self._session.instance_cache
+        cache_key = 'stage/{}/{}/{}/{}'.format(pipeline_name, pipeline_counter, stage_name, stage_counter)
+        if cache is not None:
+            data = cache.get(cache_key)
+            if data is not None:
+                return StageInstance(session=self._session, data=data, pipeline=None)
+
         response = self._session.get(
             path=self._session.urljoin(self.RESOURCE_PATH, 'instance', pipeline_counter, stage_counter).format(
                 base_api=self.base_api,
@@ -147,7 +159,11 @@ class StageManager(BaseManager, RequireParamMixin):
             headers={'Accept': 'application/json'},
         )
 
-        return StageInstance(session=self._session, data=response.json(), pipeline=None)
+        data = response.json()
+        instance = StageInstance(session=self._session, data=data, pipeline=None)
+        if cache is not None:
+            cache.set(cache_key, data, completed=instance.completed)
+        return instance
 
     def history(self, pipeline_name=None, stage_name=None, offset=0):
         """
@@ -181,24 +197,23 @@ class StageManager(BaseManager, RequireParamMixin):
 
         return instances
 
-    def full_history(self, pipeline_name=None, stage_name=None):
+    def full_history(self, pipeline_name=None, stage_name=None, look_ahead=0):
         """
         The stage history allows users to list stage instances of specified stage.
 
         This method uses generator to get full stage history.
         :param pipeline_name: pipeline name.
         :param stage_name: stage name.
+        :param look_ahead: number of next pages to fetch in parallel, while current one is consumed.
         :return: an array of stage instances :class:`yagocd.resources.stage.StageInstance`.
         :rtype: list of yagocd.resources.stage.StageInstance
         """
-        offset = 0
-        instances = self.history(pipeline_name, stage_name, offset)
-        while instances:
-            for instance in instances:
-                yield instance
-
-            offset += len(instances)
-            instances = self.history(pipeline_name, stage_name, offset)
+        instances = YagocdUtil.paginate(
+            lambda offset: self.history(pipeline_name, stage_name, offset),
+            look_ahead=look_ahead
+        )
+        for instance in instances:
+            yield instance
 
     def last(self, pipeline_name=None, stage_name=None):
         """
@@ -218,11 +233,16 @@ class StageInstance(Base):
     Class representing instance of specific stage.
     """
 
+    __slots__ = ('_pipeline', '_manager')
+
+    # number of jobs to fetch artifact listings of in parallel
+    DEFAULT_LISTING_WORKERS = 8
+
     def __init__(self, session, data, pipeline):
         super(StageInstance, self).__init__(session, data)
         self._pipeline = pipeline
 
-        self._manager = StageManager(session=self._session)
+        self._manager = StageManager.shared(self._session)
 
     def __iter__(self):
         """
@@ -314,6 +334,15 @@ class StageInstance(Base):
     def pipeline(self):
         return self._pipeline
 
+    @property
+    def completed(self):
+        """
+        Check whether the stage instance has reached final result and would not change anymore.
+
+        :return: ``True`` if result of the stage is one of :attr:`StageResult.FINAL`.
+        """
+        return self.data.get('result') in StageResult.FINAL
+
     def cancel(self):
         """
         Cancel an active stage of a specified stage.
@@ -331,7 +360,7 @@ class StageInstance(Base):
         """
         jobs = list()
         for data in self.data.jobs:
-            jobs.append(JobInstance(session=self._session, data=data, stage=self))
+            jobs.append(yagocd.resources.job.JobInstance(session=self._session, data=data, stage=self))
 
         return jobs
 
@@ -347,6 +376,105 @@ class StageInstance(Base):
             if job.data.name == name:
                 return job
 
+    def find_artifacts(self, predicate, workers=DEFAULT_LISTING_WORKERS):
+        """
+        Finds artifacts of all jobs, matching the predicate, without
+        downloading them. Listings of jobs are fetched in parallel and
+        cached, see :meth:`yagocd.resources.artifact.ArtifactManager.listing`.
+
+        :param predicate: callable, receiving an artifact and returning ``True``
+        if it should be found.
+        :param workers: number of listings to fetch in parallel.
+        :return: artifacts of jobs in the order of jobs.
+        :rtype: collections.Iterator[yagocd.resources.artifact.Artifact]
+        """
+        return self._search_artifacts(lambda listing: listing.find(predicate), workers)
+
+    def glob_artifacts(self, pattern, workers=DEFAULT_LISTING_WORKERS):
+        """
+        Finds artifacts of all jobs by path pattern without downloading
+        them, e.g. `test-reports/**/*.xml`. Listings of jobs are fetched
+        in parallel and cached, see
+        :meth:`yagocd.resources.artifact.ArtifactListing.glob` for the syntax.
+
+        :param pattern: pattern of artifact paths.
+        :param workers: number of listings to fetch in parallel.
+        :return: artifacts of jobs in the order of jobs.
+        :rtype: collections.Iterator[yagocd.resources.artifact.Artifact]
+        """
+        return self._search_artifacts(lambda listing: listing.glob(pattern), workers)
+
+    def artifact_directories(
+        self,
+        path,
+        timeout=60,
+        backoff=0.4,
+        max_wait=4,
+        workers=ArtifactManager.DEFAULT_DIRECTORY_WORKERS
+    ):
+        """
+        Gets artifact directory with the same path from all jobs, waiting
+        for the server to compress them concurrently, see
+        :meth:`yagocd.resources.artifact.ArtifactManager.directories_wait`.
+
+        :param path: path to directory.
+        :param timeout: timeout in seconds to wait for each directory.
+        :param backoff: backoff value.
+        :param max_wait: maximum wait amount.
+        :param workers: number of requests to make in parallel.
+        :return: pairs of job and its directory zip, or ``None`` if it wasn't
+        compressed in time, in order of readiness.
+        :rtype: collections.Iterator[tuple]
+        """
+        jobs = self.jobs()
+        directories = [
+            dict(
+                path=path,
+                pipeline_name=job.pipeline_name,
+                pipeline_counter=job.pipeline_counter,
+                stage_name=job.stage_name,
+                stage_counter=job.stage_counter,
+                job_name=job.data.name
+            )
+            for job in jobs
+        ]
+        jobs = {job.data.name: job for job in jobs}
+
+        results = ArtifactManager.shared(self._session).directories_wait(
+            directories, timeout=timeout, backoff=backoff, max_wait=max_wait, workers=workers
+        )
+        for directory, directory_zip in results:
+            yield jobs[directory['job_name']], directory_zip
+
+    def _search_artifacts(self, search, workers):
+        jobs = self.jobs()
+        if not jobs:
+            return
+
+        manager = ArtifactManager.shared(self._session)
+
+        def listing(job):
+            return manager.listing(
+                pipeline_name=job.pipeline_name,
+                pipeline_counter=job.pipeline_counter,
+                stage_name=job.stage_name,
+                stage_counter=job.stage_counter,
+                job_name=job.data.name
+            )
+
+        with self._session.pooled(workers) as pool:
+            executor = ThreadPoolExecutor(max_workers=min(workers, len(jobs)))
+            listing = pool.bind(listing)
+            futures = [executor.submit(listing, job) for job in jobs]
+            try:
+                for future in futures:
+                    for artifact in search(future.result()):
+                        yield artifact
+            finally:
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=False)
+
 
 class StageResult(object):
     """
@@ -363,6 +491,9 @@ class StageResult(object):
     Cancelled = 'Cancelled'
     Unknown = 'Unknown'
 
+    # results, after which stage is not going to change
+    FINAL = (Passed, Failed, Cancelled)
+
 
 class StageState(object):
     """
@@ -167,4 +167,4 @@ class TemplateManager(BaseManager):
 
 
 class TemplateConfig(Base):
-    pass
+    __slots__ = ()
@@ -200,4 +200,5 @@ class UserEntity(Base):
     """
     The user object.
     """
-    pass
+
+    __slots__ = ()
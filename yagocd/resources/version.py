@@ -25,10 +25,9 @@
 # THE SOFTWARE.
 #
 ###############################################################################
-from easydict import EasyDict
 
 from yagocd.resources import BaseManager
-from yagocd.util import since
+from yagocd.util import AttrDict, since
 
 
 @since('16.6.0')
@@ -46,4 +45,4 @@ class VersionManager(BaseManager):
             path='{base_api}/version'.format(base_api=self.base_api)
         )
 
-        return EasyDict(response.json())
+        return AttrDict(response.json())
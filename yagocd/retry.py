@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+import random
+import threading
+import time
+from email.utils import mktime_tz, parsedate_tz
+
+import requests
+
+
+class RetryPolicy(object):
+    """
+    Policy of retrying requests, which failed for transient reasons:
+    connection errors and responses with one of `statuses`.
+
+    Only idempotent `methods` are retried by default. Delay before the
+    next attempt grows exponentially with `backoff_factor` and is
+    randomized ("full jitter"), so many clients don't come back at once.
+    If the response has ``Retry-After`` header, the server's delay is
+    respected instead; if it's longer than `max_backoff`, the request is
+    not retried at all.
+
+    Total number of retries is limited by a budget: no more than
+    `min_budget` retries plus `budget` share of all requests made through
+    the policy. This way a server which is down is not hammered with
+    ``total`` times more requests than usual.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+    DEFAULT_STATUSES = frozenset([429, 502, 503, 504])
+
+    def __init__(
+        self,
+        total=3,
+        backoff_factor=0.5,
+        max_backoff=30.0,
+        statuses=DEFAULT_STATUSES,
+        methods=IDEMPOTENT_METHODS,
+        jitter=True,
+        budget=0.2,
+        min_budget=10,
+        respect_retry_after=True
+    ):
+        """
+        :param total: maximum number of retries of a single request.
+        :param backoff_factor: base delay in seconds, doubled with every attempt.
+        :param max_backoff: maximum delay in seconds between attempts.
+        :param statuses: response status codes, which should be retried.
+        :param methods: HTTP methods, which could be retried.
+        :param jitter: randomize delays between zero and computed backoff.
+        :param budget: share of requests, which could be retried, e.g.
+        ``0.2`` allows 20 retries for every 100 requests.
+        :param min_budget: number of retries allowed regardless of `budget`.
+        :param respect_retry_after: use delay from ``Retry-After`` header.
+        """
+        self._total = total
+        self._backoff_factor = backoff_factor
+        self._max_backoff = max_backoff
+        self._statuses = frozenset(statuses)
+        self._methods = frozenset(method.upper() for method in methods)
+        self._jitter = jitter
+        self._budget = budget
+        self._min_budget = min_budget
+        self._respect_retry_after = respect_retry_after
+        self._lock = threading.Lock()
+
+        self._requests = 0
+        self._retries = 0
+        self._recovered = 0
+        self._given_up = 0
+        self._budget_exhausted = 0
+        self._reasons = dict()
+
+    def is_retryable(self, method, response=None, error=None):
+        """
+        Checks whether the request could be retried at all.
+
+        :param method: HTTP method of the request.
+        :param response: response, if it was received.
+        :param error: exception, raised instead of response.
+        :rtype: bool
+        """
+        if method.upper() not in self._methods:
+            return False
+        if error is not None:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout))
+        return response is not None and response.status_code in self._statuses
+
+    def start(self):
+        """
+        Registers new request, made through the policy.
+        """
+        with self._lock:
+            self._requests += 1
+
+    def backoff(self, method, attempt, response=None, error=None):
+        """
+        Decides whether failed attempt of the request should be retried.
+
+        :param method: HTTP method of the request.
+        :param attempt: number of the failed attempt, starting from ``0``.
+        :param response: response, if it was received.
+        :param error: exception, raised instead of response.
+        :return: delay in seconds before the next attempt or ``None``, if
+        the request should not be retried.
+        """
+        if not self.is_retryable(method, response=response, error=error):
+            return None
+
+        delay = self._delay(attempt, response)
+        with self._lock:
+            if attempt >= self._total or delay is None:
+                self._given_up += 1
+                return None
+            if self._retries >= self._min_budget + self._budget * self._requests:
+                self._budget_exhausted += 1
+                return None
+
+            self._retries += 1
+            reason = type(error).__name__ if error is not None else response.status_code
+            self._reasons[reason] = self._reasons.get(reason, 0) + 1
+        return delay
+
+    def finish(self, attempts, success):
+        """
+        Registers result of the request.
+
+        :param attempts: number of attempts made.
+        :param success: whether the last attempt has succeeded.
+        """
+        if attempts > 1 and success:
+            with self._lock:
+                self._recovered += 1
+
+    def _delay(self, attempt, response):
+        if self._respect_retry_after and response is not None:
+            retry_after = self.retry_after(response)
+            if retry_after is not None:
+                return retry_after if retry_after <= self._max_backoff else None
+
+        delay = min(self._max_backoff, self._backoff_factor * (2 ** attempt))
+        if self._jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    @staticmethod
+    def retry_after(response):
+        """
+        Parses ``Retry-After`` header of the response.
+
+        :return: delay in seconds or ``None`` if the header is missing or malformed.
+        """
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+
+        parsed = parsedate_tz(value)
+        if parsed is None:
+            return None
+        return max(0.0, mktime_tz(parsed) - time.time())
+
+    @property
+    def stats(self):
+        """
+        Snapshot of retry counters:
+
+        * requests -- number of requests made through the policy;
+        * retries -- number of retried attempts;
+        * recovered -- requests, which succeeded after retrying;
+        * given_up -- requests, which failed after all allowed retries;
+        * budget_exhausted -- failures, which were not retried because of the budget;
+        * reasons -- number of retries by status code or exception name;
+        * retry_rate -- retries per request.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(
+                requests=self._requests,
+                retries=self._retries,
+                recovered=self._recovered,
+                given_up=self._given_up,
+                budget_exhausted=self._budget_exhausted,
+                reasons=dict(self._reasons),
+                retry_rate=float(self._retries) / self._requests if self._requests else 0.0
+            )
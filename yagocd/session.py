@@ -27,12 +27,19 @@
 ###############################################################################
 
 import copy
+import functools
+import threading
+import time
 
 import requests
+import six
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, HTTPAdapter
 # noinspection PyUnresolvedReferences
 from six.moves.urllib.parse import urljoin
 
+from yagocd.cache import InstanceCache, ResponseCache
 from yagocd.exception import RequestError
+from yagocd.retry import RetryPolicy
 
 
 class Session(object):
@@ -40,14 +47,54 @@ class Session(object):
     Class for working with sessions.
     Instance of this class is created only once in the initialization of ``yagocd.client.Client`` and then passed
     as a parameter for all managers.
+
+    Session is safe to share between threads: connections are taken from
+    a thread-safe pool, and lazily initialized state is guarded by a lock.
+    Size the pool with ``pool_maxsize`` option to the number of threads,
+    otherwise extra connections are opened and dropped on every request.
+    Operations, which make more requests at once, take a separate pool
+    for their threads with :meth:`pooled`.
     """
 
     def __init__(self, auth, options):
         self._auth = auth
         self._options = options
         self._session = requests.Session()
+        self._lock = threading.RLock()
+        # managers, shared by entities, see `yagocd.resources.BaseManager.shared`
+        self._shared_managers = dict()
+        # transport of the operation pool, the current thread works for
+        self._local = threading.local()
         self.__server_version = None
 
+        self._pool = dict(
+            pool_connections=self._options.get('pool_connections', DEFAULT_POOLSIZE),
+            pool_maxsize=self._options.get('pool_maxsize', DEFAULT_POOLSIZE),
+            pool_block=self._options.get('pool_block', DEFAULT_POOLBLOCK),
+        )
+        self.configure_pool()
+
+        if not self._options.get('keep_alive', True):
+            self._session.headers['Connection'] = 'close'
+
+        self._cache = self._options.get('cache')
+        if self._cache is True:
+            self._cache = ResponseCache()
+        elif self._cache is False:
+            self._cache = None
+
+        self._instance_cache = self._options.get('instance_cache')
+        if self._instance_cache is True:
+            self._instance_cache = InstanceCache()
+        elif self._instance_cache is False:
+            self._instance_cache = None
+
+        self._retry = self._options.get('retry')
+        if self._retry is True:
+            self._retry = RetryPolicy()
+        elif self._retry is False:
+            self._retry = None
+
     @staticmethod
     def urljoin(*args):
         """
@@ -78,33 +125,123 @@ class Session(object):
         :return: server version parsed from `about` page.
         """
         if self.__server_version is None:
-            from yagocd.resources.info import InfoManager
-            self.__server_version = InfoManager(self).version
+            with self._lock:
+                if self.__server_version is None:
+                    from yagocd.resources.info import InfoManager
+                    self.__server_version = InfoManager(self).version
 
         return self.__server_version
 
-    def request(self, method, path, params=None, data=None, headers=None, files=None):
+    @property
+    def pool(self):
+        """
+        Property for getting connection pool settings.
+
+        :return: dictionary with ``pool_connections``, ``pool_maxsize`` and ``pool_block`` keys.
+        """
+        return dict(self._pool)
+
+    @property
+    def cache(self):
+        """
+        Property for getting HTTP cache of conditional requests.
+
+        :return: cache instance or ``None`` if caching is disabled.
+        :rtype: yagocd.cache.ResponseCache
+        """
+        return self._cache
+
+    @property
+    def instance_cache(self):
+        """
+        Property for getting cache of pipeline and stage instances.
+
+        :return: cache instance or ``None`` if caching is disabled.
+        :rtype: yagocd.cache.InstanceCache
+        """
+        return self._instance_cache
+
+    @property
+    def retry(self):
+        """
+        Property for getting policy of retrying failed requests.
+
+        :return: policy instance or ``None`` if retrying is disabled.
+        :rtype: yagocd.retry.RetryPolicy
+        """
+        return self._retry
+
+    def request(self, method, path, params=None, data=None, headers=None, files=None, stream=False):
         # this should work even if path is absolute (e.g. for files)
         url = urljoin(self._options['server'], path)
 
         merged_headers = copy.deepcopy(self._options['headers'])
         merged_headers.update(headers or {})
 
-        response = self._session.request(
-            method=method,
-            url=url,
-            params=params,
-            data=data,
-            headers=merged_headers,
-            files=files,
-            auth=self._auth,
-            verify=self._options['verify']
-        )
+        cache_key = None
+        revalidated = None
+        # streamed bodies are meant to be written somewhere, not kept in memory
+        if self._cache is not None and not stream:
+            cache_key = self._cache.key(url, params, merged_headers)
+            if method.lower() == 'get':
+                revalidated = self._cache.revalidate(cache_key)
+            if revalidated is not None:
+                merged_headers.update(revalidated.conditional_headers())
+
+        response = self._send(method, url, params, data, merged_headers, files, stream)
+        if cache_key is not None:
+            response = self._cache.process(cache_key, method, response, revalidated)
+
         # raise exception if we got 4xx/5xx response
         self._raise_for_status(response)
 
         return response
 
+    def _send(self, method, url, params, data, headers, files, stream):
+        transport = getattr(self._local, 'transport', None) or self._session
+
+        def send():
+            return transport.request(
+                method=method,
+                url=url,
+                params=params,
+                data=data,
+                headers=headers,
+                files=files,
+                auth=self._auth,
+                verify=self._options['verify'],
+                stream=stream
+            )
+
+        # uploaded files and streamed bodies couldn't be sent twice
+        if self._retry is None or files or self._is_stream(data):
+            return send()
+
+        self._retry.start()
+        attempt = 0
+        while True:
+            try:
+                response = send()
+            except requests.RequestException as e:
+                delay = self._retry.backoff(method, attempt, error=e)
+                if delay is None:
+                    self._retry.finish(attempt + 1, success=False)
+                    raise
+            else:
+                delay = self._retry.backoff(method, attempt, response=response)
+                if delay is None:
+                    self._retry.finish(attempt + 1, success=response.status_code < 400)
+                    return response
+                # release the connection back to the pool
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _is_stream(data):
+        return hasattr(data, '__iter__') and not isinstance(data, six.string_types + (bytes, dict, list, tuple))
+
     @staticmethod
     def _raise_for_status(response):
         summary = ''
@@ -118,8 +255,8 @@ class Session(object):
         if summary:
             raise RequestError(summary=summary, response=response)
 
-    def get(self, path, params=None, headers=None):
-        return self.request(method='get', path=path, params=params, headers=headers)
+    def get(self, path, params=None, headers=None, stream=False):
+        return self.request(method='get', path=path, params=params, headers=headers, stream=stream)
 
     def post(self, path, params=None, data=None, headers=None, files=None):
         return self.request(method='post', path=path, params=params, data=data, headers=headers, files=files)
@@ -133,8 +270,170 @@ class Session(object):
     def delete(self, path, data=None, headers=None):
         return self.request(method='delete', path=path, data=data, headers=headers)
 
+    def mount(self, prefix, adapter):
+        """
+        Registers a transport adapter for the given url prefix on the
+        underlying `requests` session, e.g. to change connection pooling.
+
+        Custom adapters, e.g. with client certificates, are kept by
+        :meth:`configure_pool`, and operations, which take a pool with
+        :meth:`pooled`, make their requests through the session then.
+
+        :param prefix: url prefix, for example ``http://``.
+        :param adapter: instance of :class:`requests.adapters.HTTPAdapter`.
+        """
+        self._session.mount(prefix, adapter)
+
+    def configure_pool(self, pool_connections=None, pool_maxsize=None, pool_block=None):
+        """
+        Replaces transport adapters of the session with the ones, using
+        given connection pool settings. Omitted settings keep their values.
+
+        Previous adapters are closed, so the pool should be configured
+        before the session is shared between threads. To make more requests
+        at once for a single operation use :meth:`pooled` instead. Adapters
+        of other classes than :class:`requests.adapters.HTTPAdapter`, mounted
+        with :meth:`mount`, are kept as they are.
+
+        :param pool_connections: number of hosts to keep connection pools for.
+        :param pool_maxsize: maximum number of connections kept per host.
+        :param pool_block: if ``True``, wait for a free connection when all
+        of them are in use, instead of opening a new one, which won't be reused.
+        """
+        with self._lock:
+            for name, value in (
+                ('pool_connections', pool_connections),
+                ('pool_maxsize', pool_maxsize),
+                ('pool_block', pool_block)
+            ):
+                if value is not None:
+                    self._pool[name] = value
+
+            for prefix in ('http://', 'https://'):
+                previous = self._session.adapters.get(prefix)
+                if previous is None:
+                    self.mount(prefix, HTTPAdapter(**self._pool))
+                elif self._is_plain(previous):
+                    self.mount(prefix, HTTPAdapter(max_retries=previous.max_retries, **self._pool))
+                    previous.close()
+
+    def pooled(self, maxsize):
+        """
+        Takes connection pool for an operation, which makes up to `maxsize`
+        requests at once from a pool of threads.
+
+        If the pool of the session is smaller, a separate adapter with
+        `maxsize` connections is created for the operation. Callables,
+        wrapped with :meth:`OperationPool.bind`, make their requests through
+        it, while other threads keep using adapters of the session, which
+        are never changed. The adapter is closed by :meth:`OperationPool.close`
+        or, if bound callables are still running, after the last of them.
+
+        Settings of a custom adapter, mounted with :meth:`mount`, couldn't be
+        copied, so then requests are made through the session as they are.
+
+        :param maxsize: number of requests to make at once.
+        :rtype: yagocd.session.OperationPool
+        """
+        adapters = self._session.adapters
+        plain = set(adapters) == {'http://', 'https://'} and all(self._is_plain(a) for a in adapters.values())
+        if maxsize <= self._pool['pool_maxsize'] or not plain:
+            return OperationPool(self._local, None)
+
+        transport = requests.Session()
+        transport.headers = self._session.headers.copy()
+        transport.cookies = self._session.cookies
+        adapter_pool = dict(self._pool, pool_maxsize=maxsize)
+        for prefix, adapter in adapters.items():
+            transport.mount(prefix, HTTPAdapter(max_retries=adapter.max_retries, **adapter_pool))
+        return OperationPool(self._local, transport)
+
+    @staticmethod
+    def _is_plain(adapter):
+        # subclasses could have settings, which are unknown here
+        return type(adapter) is HTTPAdapter
+
+    def close(self):
+        """
+        Closes the underlying `requests` session and all pooled connections.
+        """
+        self._session.close()
+
     def base_api(self, context_path=None, api_path=None):
         return self.urljoin(
             context_path if context_path is not None else self._options['context_path'],
             api_path if api_path is not None else self._options['api_path']
         )
+
+
+class OperationPool(object):
+    """
+    Connection pool of a single operation, taken with :meth:`Session.pooled`.
+    Could be used as a context manager, which closes it on exit.
+    """
+
+    def __init__(self, local, transport):
+        self._local = local
+        self._transport = transport
+        self._lock = threading.Lock()
+        # the operation itself and bound callables, which are running
+        self._users = 1
+        self._closed = False
+
+    def bind(self, func):
+        """
+        Wraps callable, so requests of the session, made by it, go through
+        the pool of the operation. Callables, which start after the pool is
+        closed, use adapters of the session.
+
+        :param func: callable, executed in a pool of threads.
+        :return: wrapped callable.
+        """
+        if self._transport is None:
+            return func
+
+        @functools.wraps(func)
+        def bound(*args, **kwargs):
+            if not self._acquire():
+                return func(*args, **kwargs)
+
+            previous = getattr(self._local, 'transport', None)
+            self._local.transport = self._transport
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._local.transport = previous
+                self._release()
+
+        return bound
+
+    def close(self):
+        """
+        Releases the pool by the operation. Connections are closed, once
+        no bound callable is running.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._release()
+
+    def _acquire(self):
+        with self._lock:
+            if not self._users:
+                return False
+            self._users += 1
+            return True
+
+    def _release(self):
+        with self._lock:
+            self._users -= 1
+            if self._users or self._transport is None:
+                return
+        self._transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
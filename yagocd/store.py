@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+import json
+import sqlite3
+
+from yagocd.resources.pipeline import PipelineInstance
+from yagocd.util import YagocdUtil
+
+
+class PipelineHistoryStore(object):
+    """
+    Local SQLite-backed store of pipeline instances.
+
+    Completed pipeline instances do not change, so once the whole history
+    of a pipeline is downloaded, next synchronisation fetches pages starting
+    from the newest one only until it reaches an already stored completed
+    instance, which is not newer than the last synced one. Instances, which
+    were still running during previous sync, are always refreshed.
+
+    Reading methods (`history`, `full_history` and `get`) are served from
+    the local database.
+
+    :warning: Rerun of a stage in an old pipeline instance is not detected
+    by incremental sync, use ``sync(name, full=True)`` to refresh everything.
+    """
+
+    PAGE_SIZE = 10
+    COMMIT_EVERY = 500
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS instances ('
+        '  pipeline TEXT NOT NULL,'
+        '  counter INTEGER NOT NULL,'
+        '  completed INTEGER NOT NULL,'
+        '  data TEXT NOT NULL,'
+        '  PRIMARY KEY (pipeline, counter)'
+        ')',
+        # `synced` is the counter, up to which the history is stored without gaps
+        'CREATE TABLE IF NOT EXISTS pipelines ('
+        '  pipeline TEXT PRIMARY KEY,'
+        '  synced INTEGER NOT NULL'
+        ')',
+    )
+
+    def __init__(self, manager, path=':memory:'):
+        """
+        :param manager: pipeline manager to fetch instances with, e.g. ``client.pipelines``.
+        :type manager: yagocd.resources.pipeline.PipelineManager
+        :param path: path to the SQLite database file.
+        """
+        self._manager = manager
+        self._session = manager._session
+        self._connection = sqlite3.connect(path)
+
+        with self._connection:
+            for statement in self.SCHEMA:
+                self._connection.execute(statement)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self._connection.close()
+
+    def sync(self, name, full=False, look_ahead=0):
+        """
+        Downloads new and not yet completed instances of the pipeline.
+
+        :param name: name of the pipeline.
+        :param full: re-download the whole history instead of incremental sync.
+        :param look_ahead: number of next pages to fetch in parallel.
+        :return: number of stored or updated instances.
+        """
+        synced = None if full else self._synced_counter(name)
+        running = [row[0] for row in self._connection.execute(
+            'SELECT counter FROM instances WHERE pipeline = ? AND completed = 0', (name,)
+        )]
+        # everything below oldest running instance is known to be final
+        floor = min(running) if running else None
+
+        count = 0
+        newest = None
+        instances = YagocdUtil.paginate(lambda offset: self._manager.history(name, offset), look_ahead=look_ahead)
+        try:
+            for instance in instances:
+                counter = instance.data.counter
+                if newest is None:
+                    newest = counter
+                # instances, fetched by `get` above the synced counter, don't mean older ones are stored
+                known = synced is not None and counter <= synced and (floor is None or counter < floor)
+                if known and self._is_completed(name, counter):
+                    break
+
+                self._put(name, instance)
+                count += 1
+                if count % self.COMMIT_EVERY == 0:
+                    self._connection.commit()
+        finally:
+            instances.close()
+            self._connection.commit()
+
+        if newest is not None and (synced is None or newest > synced):
+            with self._connection:
+                self._connection.execute(
+                    'INSERT OR REPLACE INTO pipelines (pipeline, synced) VALUES (?, ?)', (name, newest)
+                )
+
+        return count
+
+    def history(self, name, offset=0):
+        """
+        Lists stored pipeline instances, newest first, the same way as
+        :meth:`yagocd.resources.pipeline.PipelineManager.history` does.
+
+        :param name: name of the pipeline.
+        :param offset: number of pipeline instances to be skipped.
+        :rtype: list of yagocd.resources.pipeline.PipelineInstance
+        """
+        rows = self._connection.execute(
+            'SELECT data FROM instances WHERE pipeline = ? ORDER BY counter DESC LIMIT ? OFFSET ?',
+            (name, self.PAGE_SIZE, offset)
+        )
+        return [self._instance(data) for data, in rows]
+
+    def full_history(self, name):
+        """
+        Generator over all stored instances of the pipeline, newest first.
+
+        :param name: name of the pipeline.
+        :rtype: list of yagocd.resources.pipeline.PipelineInstance
+        """
+        rows = self._connection.execute(
+            'SELECT data FROM instances WHERE pipeline = ? ORDER BY counter DESC', (name,)
+        )
+        for data, in rows:
+            yield self._instance(data)
+
+    def get(self, name, counter):
+        """
+        Gets pipeline instance from the store. If it's not stored yet,
+        it's requested from the server and saved.
+
+        :param name: name of the pipeline.
+        :param counter: pipeline counter.
+        :rtype: yagocd.resources.pipeline.PipelineInstance
+        """
+        row = self._connection.execute(
+            'SELECT data, completed FROM instances WHERE pipeline = ? AND counter = ?', (name, counter)
+        ).fetchone()
+        if row is not None and row[1]:
+            return self._instance(row[0])
+
+        instance = self._manager.get(name, counter)
+        with self._connection:
+            self._put(name, instance)
+        return instance
+
+    def counters(self, name):
+        """
+        Lists counters of stored instances of the pipeline, newest first.
+
+        :param name: name of the pipeline.
+        :rtype: list of int
+        """
+        rows = self._connection.execute(
+            'SELECT counter FROM instances WHERE pipeline = ? ORDER BY counter DESC', (name,)
+        )
+        return [counter for counter, in rows]
+
+    def _instance(self, data):
+        return PipelineInstance(session=self._session, data=json.loads(data))
+
+    def _put(self, name, instance):
+        self._connection.execute(
+            'INSERT OR REPLACE INTO instances (pipeline, counter, completed, data) VALUES (?, ?, ?, ?)',
+            (name, instance.data.counter, int(instance.completed), json.dumps(instance.data))
+        )
+
+    def _synced_counter(self, name):
+        row = self._connection.execute('SELECT synced FROM pipelines WHERE pipeline = ?', (name,)).fetchone()
+        return row[0] if row else None
+
+    def _is_completed(self, name, counter):
+        row = self._connection.execute(
+            'SELECT completed FROM instances WHERE pipeline = ? AND counter = ?', (name, counter)
+        ).fetchone()
+        return bool(row and row[0])
@@ -0,0 +1,450 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+import os
+import stat
+import struct
+import time
+import uuid
+import zipfile
+import zlib
+
+import six
+
+from yagocd.exception import YagocdException
+
+
+class MultipartStream(object):
+    """
+    Body of ``multipart/form-data`` request with a single file, which is
+    read from the source chunk by chunk, while the request is being sent.
+
+    The source could be bytes-like object, binary file-like object or an
+    iterable of bytes, e.g. a generator. If size of the source is known,
+    the body is sent with ``Content-Length``, otherwise with chunked
+    transfer encoding. On Python 2 ``httplib`` can't send sized iterables,
+    so the body is always sent with chunked transfer encoding.
+    """
+
+    DEFAULT_CHUNK_SIZE = 64 * 1024
+    DEFAULT_CONTENT_TYPE = 'application/octet-stream'
+
+    def __init__(
+        self,
+        source,
+        field='file',
+        filename='file',
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        content_type=DEFAULT_CONTENT_TYPE
+    ):
+        """
+        :param source: content of the file. File objects are not closed,
+        iterators are closed after sending or by :meth:`close`.
+        :param field: name of the form field.
+        :param filename: name of the file, sent to the server.
+        :param chunk_size: size of chunks in bytes to read file objects with.
+        :param content_type: content type of the file.
+        """
+        self._source = source
+        self._chunk_size = chunk_size
+        self._boundary = uuid.uuid4().hex
+        self._iterator = None
+
+        self._head = (
+            '--{boundary}\r\n'
+            'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            'Content-Type: {content_type}\r\n'
+            '\r\n'
+        ).format(
+            boundary=self._boundary,
+            field=self._quote(field),
+            filename=self._quote(filename),
+            content_type=content_type
+        ).encode('utf-8')
+        self._tail = '\r\n--{boundary}--\r\n'.format(boundary=self._boundary).encode('utf-8')
+
+        size = self.source_size(source)
+        # size of the whole body in bytes or `None` if it's unknown
+        self.size = len(self._head) + size + len(self._tail) if size is not None else None
+        if six.PY3:
+            # `requests` reads `len` to send `Content-Length`, zero means unknown
+            self.len = self.size or 0
+
+    @staticmethod
+    def _quote(value):
+        if isinstance(value, six.binary_type):
+            value = value.decode('utf-8')
+        return value.replace('\\', '\\\\').replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+
+    @property
+    def content_type(self):
+        """
+        Value of ``Content-Type`` header for the body.
+        """
+        return 'multipart/form-data; boundary={}'.format(self._boundary)
+
+    @staticmethod
+    def source_size(source):
+        """
+        Returns number of bytes, left in the source.
+
+        :return: number of bytes or ``None`` if it's unknown.
+        """
+        if isinstance(source, (six.binary_type, bytearray)):
+            return len(source)
+        if isinstance(source, memoryview):
+            return source.nbytes if hasattr(source, 'nbytes') else len(source.tobytes())
+
+        if not hasattr(source, 'read'):
+            return None
+
+        try:
+            position = source.tell()
+        except (AttributeError, IOError, OSError, ValueError):
+            # pipes, sockets and other streams
+            return None
+
+        try:
+            status = os.fstat(source.fileno())
+        except (AttributeError, IOError, OSError, ValueError):
+            # in-memory buffers have no file descriptor
+            pass
+        else:
+            return status.st_size - position if stat.S_ISREG(status.st_mode) else None
+
+        try:
+            source.seek(0, os.SEEK_END)
+            size = source.tell() - position
+            source.seek(position)
+            return size
+        except (AttributeError, IOError, OSError, ValueError):
+            return None
+
+    def __iter__(self):
+        yield self._head
+
+        if isinstance(self._source, (six.binary_type, bytearray, memoryview)):
+            view = memoryview(self._source)
+            if hasattr(view, 'cast'):
+                view = view.cast('B')
+            for offset in range(0, len(view), self._chunk_size):
+                yield view[offset:offset + self._chunk_size].tobytes()
+        elif hasattr(self._source, 'read'):
+            chunk = self._source.read(self._chunk_size)
+            while chunk:
+                yield chunk
+                chunk = self._source.read(self._chunk_size)
+        else:
+            self._iterator = iter(self._source)
+            try:
+                for chunk in self._iterator:
+                    # empty chunk would finish chunked body prematurely
+                    if chunk:
+                        yield chunk
+            finally:
+                self.close()
+
+        yield self._tail
+
+    def close(self):
+        """
+        Closes the source, if it's an iterator, e.g. a generator, even if
+        it hasn't been sent. File objects are left open.
+        """
+        for candidate in (self._iterator, self._source):
+            if candidate is not None and not hasattr(candidate, 'read') and hasattr(candidate, 'close'):
+                candidate.close()
+        self._iterator = None
+
+
+class ZipStream(object):
+    """
+    Zip archive of a local directory, which is generated chunk by chunk,
+    while it is being iterated, without a temporary file.
+
+    Deflated files are read once: their checksums and sizes are written
+    in data descriptors after the data. Stored files are read twice,
+    because readers like Java's ``ZipInputStream`` need checksums of
+    stored entries before their data. Large archives use ZIP64 extensions.
+    """
+
+    DEFAULT_CHUNK_SIZE = MultipartStream.DEFAULT_CHUNK_SIZE
+    DEFAULT_COMPRESS_LEVEL = 6
+
+    # sizes and offsets from this value on are stored in ZIP64 fields
+    ZIP64_LIMIT = 0xFFFFFFFF
+    ZIP64_COUNT_LIMIT = 0xFFFF
+
+    LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+    CENTRAL_HEADER = struct.Struct('<4s4B4HL2L5H2L')
+    END_RECORD = struct.Struct('<4s4H2LH')
+    ZIP64_END_RECORD = struct.Struct('<4sQ2H2L4Q')
+    ZIP64_END_LOCATOR = struct.Struct('<4sLQL')
+
+    FLAG_DATA_DESCRIPTOR = 0x08
+    FLAG_UTF8 = 0x800
+
+    def __init__(
+        self,
+        local_dir,
+        compression=zipfile.ZIP_DEFLATED,
+        compress_level=DEFAULT_COMPRESS_LEVEL,
+        chunk_size=DEFAULT_CHUNK_SIZE
+    ):
+        """
+        :param local_dir: directory to archive.
+        :param compression: ``zipfile.ZIP_DEFLATED`` or ``zipfile.ZIP_STORED``.
+        :param compress_level: level of deflate compression from 1 to 9.
+        :param chunk_size: size of chunks in bytes to read files with and
+        to yield the archive in.
+        """
+        if compression not in (zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED):
+            raise ValueError("Unsupported compression: {}".format(compression))
+
+        self._local_dir = local_dir
+        self._compression = compression
+        self._compress_level = compress_level
+        self._chunk_size = chunk_size
+
+    def files(self):
+        """
+        Yields entries of the archive: names, relative to the directory with
+        slashes as separators, and paths to the local files. Names of
+        directories end with a slash.
+        """
+        for top, folders, files in os.walk(self._local_dir):
+            folders.sort()
+            relative = os.path.relpath(top, self._local_dir)
+            prefix = ''
+            if relative != os.curdir:
+                prefix = relative.replace(os.sep, '/') + '/'
+                yield prefix, top
+
+            for name in sorted(files):
+                yield prefix + name, os.path.join(top, name)
+
+    def __iter__(self):
+        buffer = []
+        buffered = 0
+        # small headers and compressor output are joined into larger chunks
+        for piece in self._archive():
+            buffer.append(piece)
+            buffered += len(piece)
+            if buffered >= self._chunk_size:
+                yield b''.join(buffer)
+                buffer = []
+                buffered = 0
+
+        if buffer:
+            yield b''.join(buffer)
+
+    def _archive(self):
+        entries = []
+        position = 0
+        for name, filename in self.files():
+            entry = _ZipEntry(name, filename, os.stat(filename), position)
+            for piece in self._entry(entry):
+                position += len(piece)
+                yield piece
+            entries.append(entry)
+
+        central_offset = position
+        for entry in entries:
+            piece = self._central_header(entry)
+            position += len(piece)
+            yield piece
+
+        yield self._end_record(len(entries), central_offset, position - central_offset)
+
+    def _entry(self, entry):
+        if entry.is_dir:
+            yield self._local_header(entry)
+        elif self._compression == zipfile.ZIP_STORED:
+            for piece in self._stored(entry):
+                yield piece
+        else:
+            for piece in self._deflated(entry):
+                yield piece
+
+    def _stored(self, entry):
+        entry.compression = zipfile.ZIP_STORED
+        entry.zip64 = entry.file_size >= self.ZIP64_LIMIT
+        entry.crc = self._checksum(entry.filename)
+        entry.compress_size = entry.file_size
+
+        yield self._local_header(entry)
+
+        crc = 0
+        size = 0
+        for chunk in self._read(entry.filename):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            yield chunk
+
+        if crc & 0xFFFFFFFF != entry.crc or size != entry.file_size:
+            raise YagocdException("File <{}> has changed while being archived".format(entry.filename))
+
+    def _deflated(self, entry):
+        entry.compression = zipfile.ZIP_DEFLATED
+        entry.flags |= self.FLAG_DATA_DESCRIPTOR
+        # deflate could slightly enlarge incompressible data
+        entry.zip64 = entry.file_size + entry.file_size // 20 >= self.ZIP64_LIMIT
+
+        yield self._local_header(entry)
+
+        compressor = zlib.compressobj(self._compress_level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        crc = 0
+        size = 0
+        compress_size = 0
+        for chunk in self._read(entry.filename):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            data = compressor.compress(chunk)
+            if data:
+                compress_size += len(data)
+                yield data
+
+        data = compressor.flush()
+        compress_size += len(data)
+        yield data
+
+        entry.crc = crc & 0xFFFFFFFF
+        entry.file_size = size
+        entry.compress_size = compress_size
+
+        # 8-byte sizes are expected only when they don't fit 4 bytes
+        if size > self.ZIP64_LIMIT or compress_size > self.ZIP64_LIMIT:
+            yield struct.pack('<4sLQQ', b'PK\x07\x08', entry.crc, compress_size, size)
+        else:
+            yield struct.pack('<4sLLL', b'PK\x07\x08', entry.crc, compress_size, size)
+
+    def _read(self, filename):
+        with open(filename, 'rb') as f:
+            chunk = f.read(self._chunk_size)
+            while chunk:
+                yield chunk
+                chunk = f.read(self._chunk_size)
+
+    def _checksum(self, filename):
+        crc = 0
+        for chunk in self._read(filename):
+            crc = zlib.crc32(chunk, crc)
+        return crc & 0xFFFFFFFF
+
+    def _local_header(self, entry):
+        extra = b''
+        file_size = entry.file_size
+        compress_size = entry.compress_size
+        if entry.flags & self.FLAG_DATA_DESCRIPTOR:
+            file_size = compress_size = 0
+        if entry.zip64:
+            extra = struct.pack('<2H2Q', 1, 16, file_size, compress_size)
+            file_size = compress_size = 0xFFFFFFFF
+
+        return self.LOCAL_HEADER.pack(
+            b'PK\x03\x04', entry.version, 0, entry.flags, entry.compression, entry.dos_time, entry.dos_date,
+            0 if entry.flags & self.FLAG_DATA_DESCRIPTOR else entry.crc, compress_size, file_size,
+            len(entry.name), len(extra)
+        ) + entry.name + extra
+
+    def _central_header(self, entry):
+        values = []
+        fields = []
+        for value in (entry.file_size, entry.compress_size, entry.offset):
+            if value >= self.ZIP64_LIMIT:
+                values.append(value)
+                value = 0xFFFFFFFF
+            fields.append(value)
+        file_size, compress_size, offset = fields
+
+        extra = struct.pack('<2H{}Q'.format(len(values)), 1, 8 * len(values), *values) if values else b''
+        version = _ZipEntry.ZIP64_VERSION if values else entry.version
+
+        return self.CENTRAL_HEADER.pack(
+            b'PK\x01\x02', version, _ZipEntry.CREATE_SYSTEM, version, 0, entry.flags, entry.compression,
+            entry.dos_time, entry.dos_date, entry.crc, compress_size, file_size,
+            len(entry.name), len(extra), 0, 0, 0, entry.external_attr, offset
+        ) + entry.name + extra
+
+    def _end_record(self, count, offset, size):
+        if count < self.ZIP64_COUNT_LIMIT and offset < self.ZIP64_LIMIT and size < self.ZIP64_LIMIT:
+            return self.END_RECORD.pack(b'PK\x05\x06', 0, 0, count, count, size, offset, 0)
+
+        version = _ZipEntry.ZIP64_VERSION
+        return b''.join([
+            self.ZIP64_END_RECORD.pack(
+                b'PK\x06\x06', self.ZIP64_END_RECORD.size - 12, version, version, 0, 0, count, count, size, offset
+            ),
+            self.ZIP64_END_LOCATOR.pack(b'PK\x06\x07', 0, offset + size, 1),
+            self.END_RECORD.pack(
+                b'PK\x05\x06', 0, 0,
+                min(count, 0xFFFF), min(count, 0xFFFF), min(size, 0xFFFFFFFF), min(offset, 0xFFFFFFFF), 0
+            ),
+        ])
+
+
+class _ZipEntry(object):
+    """
+    Metadata of a single file in :class:`ZipStream`.
+    """
+
+    VERSION = 20
+    ZIP64_VERSION = 45
+    # attributes are in unix format
+    CREATE_SYSTEM = 3
+    MIN_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+    MAX_DATE_TIME = (2107, 12, 31, 23, 59, 58)
+
+    def __init__(self, name, filename, status, offset):
+        self.filename = filename
+        self.offset = offset
+        self.is_dir = stat.S_ISDIR(status.st_mode)
+        self.flags = 0
+        self.compression = zipfile.ZIP_STORED
+        self.crc = 0
+        self.file_size = 0 if self.is_dir else status.st_size
+        self.compress_size = 0
+        self.zip64 = False
+        self.external_attr = (status.st_mode & 0xFFFF) << 16 | (0x10 if self.is_dir else 0)
+
+        if isinstance(name, six.text_type):
+            try:
+                name = name.encode('ascii')
+            except UnicodeEncodeError:
+                name = name.encode('utf-8')
+                self.flags |= ZipStream.FLAG_UTF8
+        self.name = name
+
+        date_time = max(self.MIN_DATE_TIME, min(self.MAX_DATE_TIME, time.localtime(status.st_mtime)[:6]))
+        year, month, day, hour, minute, second = date_time
+        self.dos_date = (year - 1980) << 9 | month << 5 | day
+        self.dos_time = hour << 11 | minute << 5 | second // 2
+
+    @property
+    def version(self):
+        return self.ZIP64_VERSION if self.zip64 else self.VERSION
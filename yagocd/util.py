@@ -28,24 +28,50 @@
 import functools
 import inspect
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from distutils.version import LooseVersion
 
 
 class YagocdUtil(object):
     @staticmethod
-    def build_graph(nodes, dependencies, compare):
-        for child in nodes:
-            parents = list()
-
-            for parent in nodes:
-                children = list()
-
-                for child_candidate in dependencies(parent):
-                    if compare(child_candidate, child):
-                        parents.append(parent)
-                        children.append(child)
-                parent.predecessors.extend(children)
+    def build_graph(nodes, dependencies, node_key, dependency_key):
+        """
+        Links given nodes together into a dependency graph.
+
+        Instead of comparing each node with every dependency of every other
+        node, nodes are indexed by the key returned from `node_key`, so each
+        dependency is resolved with a single dictionary lookup and linking
+        takes O(N + E) time.
+
+        :param nodes: list of :class:`yagocd.resources.BaseNode` objects.
+        :param dependencies: function, returning list of dependencies of a node.
+        :param node_key: function, returning hashable key of a node.
+        :param dependency_key: function, returning hashable key of a dependency,
+        which should be equal to the `node_key` of the node it refers to.
+        :return: the same list of nodes, linked together.
+        """
+        index = dict()
+        for position, node in enumerate(nodes):
+            index.setdefault(node_key(node), list()).append((position, node))
+
+        links = list()
+        descendants = [list() for _ in nodes]
+        for parent in nodes:
+            children = list()
+            for dependency in dependencies(parent):
+                for position, child in index.get(dependency_key(dependency), ()):
+                    children.append((position, child))
+                    descendants[position].append(parent)
+            links.append(children)
+
+        for parent, children in zip(nodes, links):
+            # keep predecessors in the order of nodes, the way they were listed
+            children.sort(key=lambda item: item[0])
+            parent.predecessors.extend(child for _, child in children)
+
+        for child, parents in zip(nodes, descendants):
             child.descendants = parents
+
         return nodes
 
     @staticmethod
@@ -62,6 +88,56 @@ class YagocdUtil(object):
             to_crawl.extend(node_children - visited)
         return list(visited)
 
+    @staticmethod
+    def paginate(fetch_page, look_ahead=0):
+        """
+        Generator over all items of offset-based paginated resource.
+
+        Pages are requested one after another, until an empty page is
+        returned. If `look_ahead` is set, size of the first page is used
+        to predict offsets of the next pages and up to `look_ahead` of
+        them are fetched in a pool of threads while the consumer iterates
+        over current one. Closing the generator cancels pages, which are
+        not requested yet.
+
+        :param fetch_page: function, accepting offset and returning list of items.
+        :param look_ahead: number of pages to prefetch in parallel.
+        """
+        offset = 0
+        page = fetch_page(offset)
+
+        if not look_ahead:
+            while page:
+                for item in page:
+                    yield item
+
+                offset += len(page)
+                page = fetch_page(offset)
+            return
+
+        page_size = len(page)
+        next_offset = page_size
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=look_ahead)
+        try:
+            while page:
+                while len(pending) < look_ahead:
+                    pending.append(executor.submit(fetch_page, next_offset))
+                    next_offset += page_size
+
+                for item in page:
+                    yield item
+
+                # the page is not full, so it's the last one
+                if len(page) < page_size:
+                    break
+
+                page = pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
     @classmethod
     def choose_option(cls, version_to_options, default, server_version):
         for version in sorted([LooseVersion(v) for v in version_to_options.keys()]):
@@ -153,3 +229,106 @@ class RequireParamMixin(object):
             return next(item for item in values if item is not None)
         except StopIteration:
             raise ValueError("The value for parameter '{}' is required!".format(name))
+
+
+def _wrap(value):
+    # exact type checks: already wrapped values are returned as is
+    if type(value) is dict:
+        return AttrDict(value)
+    elif type(value) is list:
+        return AttrList(value)
+    return value
+
+
+class AttrDict(dict):
+    """
+    Dictionary with attribute-style access to its keys: ``data.foo.bar``.
+
+    Unlike ``EasyDict``, nested dictionaries and lists are not converted
+    up front. A nested value is wrapped the first time it is accessed and
+    the wrapper replaces the raw value in place, so the parts of a payload
+    that are never touched stay plain JSON objects. Being a ``dict``, the
+    view can be passed to ``json.dumps`` as is. Setting an attribute sets
+    the corresponding key.
+    """
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+    def __delattr__(self, name):
+        try:
+            del self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        wrapped = _wrap(value)
+        if wrapped is not value:
+            dict.__setitem__(self, key, wrapped)
+        return wrapped
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        dict.setdefault(self, key, default)
+        return self[key]
+
+    def pop(self, key, *default):
+        return _wrap(dict.pop(self, key, *default))
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        return key, _wrap(value)
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+
+class AttrList(list):
+    """
+    List, which wraps its dictionary and list items the first time they
+    are accessed. Used by :class:`AttrDict` for nested lists.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return AttrList(self[i] for i in range(*index.indices(len(self))))
+
+        value = list.__getitem__(self, index)
+        wrapped = _wrap(value)
+        if wrapped is not value:
+            list.__setitem__(self, index, wrapped)
+        return wrapped
+
+    def __getslice__(self, start, stop):
+        # Python 2 calls this method instead of `__getitem__` for slices
+        return self[start:stop:]
+
+    def __iter__(self):
+        index = 0
+        while index < len(self):
+            yield self[index]
+            index += 1
+
+    def __reversed__(self):
+        for index in range(len(self) - 1, -1, -1):
+            yield self[index]
+
+    def pop(self, index=-1):
+        return _wrap(list.pop(self, index))